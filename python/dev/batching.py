@@ -0,0 +1,61 @@
+import os
+
+from collections import (
+    deque,
+)
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .logic import determine_file_name
+
+
+def determine_expected_file_name(
+    url:                   str,
+    file_name:             str,
+    freshness_entry:       Optional[Dict[str, Any]],
+    file_suffix:           bool,
+    video_id_only:         bool,
+    reverse_chronological: bool,
+    txt:                   bool,
+    csv:                   bool,
+    markdown:              bool,
+) -> Optional[str]:
+    # returns the name of the channel's output files (without the file extension), or None if it cannot be known before the channel is loaded:
+    # file_name='id' names the files after the url, but file_name='auto' names the files after the channel name,
+    # so the program can only know the files it wrote the last time it scraped the channel (see save_freshness)
+    if file_name == 'id':
+        try:
+            return determine_file_name(url, '', file_name, file_suffix, video_id_only, reverse_chronological, txt, csv, markdown)[1]
+        except IndexError: # not a YouTube url
+            return None
+    if freshness_entry is None:
+        return None
+    return freshness_entry.get('file_name')
+
+def has_existing_files(
+    expected_file_name: Optional[str],
+    txt:                bool,
+    csv:                bool,
+    markdown:           bool,
+) -> bool:
+    # a channel is only updated (instead of scrolling to the bottom of the channel again) if every output file already exists
+    if not expected_file_name:
+        return False
+    file_types = [file_type for file_type, enabled in (('txt', txt), ('csv', csv), ('md', markdown)) if enabled]
+    return bool(file_types) and all(os.path.isfile(f'{expected_file_name}.{file_type}') for file_type in file_types)
+
+def split_new_channels(
+    urls:      deque[str],
+    order:     List[int],
+    is_update: List[bool],
+) -> Tuple[Tuple[deque[str], List[int]], Tuple[deque[str], List[int]]]:
+    # returns the urls (and their positions in the file) of the channels to update, and of the channels to scrape for the first time,
+    # in the same order as `urls`
+    updates    = (deque(url for url, update in zip(urls, is_update) if update),     [position for position, update in zip(order, is_update) if update])
+    new_scrape = (deque(url for url, update in zip(urls, is_update) if not update), [position for position, update in zip(order, is_update) if not update])
+    return updates, new_scrape
@@ -0,0 +1,336 @@
+import re
+import json
+import asyncio
+import concurrent.futures
+
+from xml.etree import ElementTree
+
+from io import (
+    TextIOWrapper,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+import urllib3
+
+from .custom_logger import log
+
+
+BASE_URL          = 'https://www.youtube.com'
+INITIAL_DATA      = re.compile(r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*')
+API_KEY           = re.compile(r'"INNERTUBE_API_KEY"\s*:\s*"([^"]+)"')
+CLIENT_VERSION    = re.compile(r'"INNERTUBE_CLIENT_VERSION"\s*:\s*"([^"]+)"')
+HEADERS           = {
+    'User-Agent':      'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Cookie':          'SOCS=CAI', # skip the consent.youtube.com redirect (only necessary cookies)
+}
+FEED_URL          = f'{BASE_URL}/feeds/videos.xml'
+ATOM_NAMESPACE    = '{http://www.w3.org/2005/Atom}'
+YOUTUBE_NAMESPACE = '{http://www.youtube.com/xml/schemas/2015}'
+
+
+class ChannelPage(NamedTuple):
+    '''
+    The information loaded from the first request to a channel's videos page,
+    which is everything the program needs to request the rest of the channel's videos.
+    '''
+    channel_name:   str
+    videos:         List[List[str]]   # [[title, href, duration], ...] for the first batch of videos
+    continuation:   Optional[str]     # token for the next batch of videos (None if the channel has no more videos)
+    api_key:        str
+    client_version: str
+    base_url:       str
+
+
+class Feed(NamedTuple):
+    '''
+    The information in a channel's RSS feed (the feeds/videos.xml Atom feed), which only lists the channel's newest videos (usually 15).
+    '''
+    channel_name:   str
+    videos:         List[List[str]]   # [[title, href, 'N/A'], ...] newest video first (the feed does not include the video durations)
+    shorts:         Set[str]          # the href of every video in `videos` the feed links to as a short
+
+
+def create_connection_pool(
+    maxsize: int = 4,
+    timeout: Optional[float] = None,
+) -> urllib3.PoolManager:
+    # reuse keep-alive connections for every request made to the same host,
+    # so following the continuation tokens of a channel does not open a new connection for every batch of videos
+    return urllib3.PoolManager(maxsize=maxsize, block=True, headers=HEADERS, retries=urllib3.Retry(total=3, backoff_factor=0.5), timeout=urllib3.Timeout(total=timeout) if timeout is not None else urllib3.Timeout.DEFAULT_TIMEOUT)
+
+
+class AsyncConnectionPool:
+    '''
+    Connection pool used by the asyncio engine (ListCreator.acreate_list_from) to request hundreds of channels from one event loop.
+    The requests are sent by the same urllib3 functions the http backend uses, in a pool of `max_threads` threads,
+    so the event loop keeps running while the requests wait for a response, and at most `connections_per_host` requests are sent to the same host at once
+    (the other requests wait for a free connection).
+    Every request is its own call in the thread pool (a channel does not keep a thread while it follows its continuation tokens),
+    so the requests of every channel take turns instead of the first channels holding every thread until they have no more videos.
+    The thread pool has twice as many threads as connections by default, so the response of one request can be parsed while the connection sends the next request.
+    '''
+    def __init__(
+        self,
+        connections_per_host: int = 10,
+        timeout: float = 30.0,
+        max_threads: Optional[int] = None,
+    ) -> None:
+        self.connections_per_host = max(1, int(connections_per_host))
+        self.max_threads          = max(1, int(max_threads)) if max_threads is not None else 2 * self.connections_per_host
+        self.http                 = create_connection_pool(self.connections_per_host, timeout)
+        self.executor             = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix='http')
+
+    async def __aenter__(
+        self,
+    ) -> 'AsyncConnectionPool':
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Any,
+        exc_value: Any,
+        exc_tb: Any,
+    ) -> None:
+        await self.close()
+
+    async def close(
+        self,
+    ) -> None:
+        self.executor.shutdown(wait=False)
+        self.http.clear()
+
+    async def run(
+        self,
+        function: Callable[..., Any],
+        *arguments: Any,
+    ) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *arguments)
+
+
+
+def fetch_channel_page(
+    url: str,
+    http: urllib3.PoolManager,
+    base_url: str = BASE_URL,
+) -> ChannelPage:
+    response = http.request('GET', url.replace(BASE_URL, base_url, 1))
+    if response.status != 200:
+        raise RuntimeError(f'Unable to load {url} (HTTP status {response.status})')
+    return parse_channel_page(url, response.data.decode('utf-8'), base_url)
+
+
+def fetch_video_data(
+    channel_page: ChannelPage,
+    visited_videos: Set[str],
+    http: urllib3.PoolManager,
+    logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+) -> List[List[str]]:
+    # follow the continuation tokens until the channel has no more videos,
+    # or until the program finds a video that was already written to the pre-existing file(s)
+    videos       = list(channel_page.videos)
+    continuation = channel_page.continuation
+    log(f'Found {len(videos)} videos...', logging_locations)
+    while continuation is not None and not any(video_url in visited_videos for _, video_url, _ in videos):
+        new_videos, continuation = fetch_continuation(channel_page, continuation, http)
+        videos.extend(new_videos)
+        log(f'Found {len(videos)} videos...', logging_locations)
+    return videos
+
+
+def fetch_continuation(
+    channel_page: ChannelPage,
+    continuation: str,
+    http: urllib3.PoolManager,
+) -> Tuple[List[List[str]], Optional[str]]:
+    # returns the next batch of videos and the continuation token for the batch after it (None if the channel has no more videos)
+    request_url, body = format_continuation_request(channel_page, continuation)
+    response          = http.request('POST', request_url, body=body, headers={**HEADERS, 'Content-Type': 'application/json'})
+    if response.status != 200:
+        raise RuntimeError(f'Unable to load more videos (HTTP status {response.status})')
+    return parse_continuation(response.data)
+
+
+async def afetch_channel_page(
+    url: str,
+    http: AsyncConnectionPool,
+    base_url: str = BASE_URL,
+) -> ChannelPage:
+    # same as fetch_channel_page, but waits for the response without blocking the event loop
+    return await http.run(fetch_channel_page, url, http.http, base_url)
+
+
+async def afetch_video_data(
+    channel_page: ChannelPage,
+    visited_videos: Set[str],
+    http: AsyncConnectionPool,
+    logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+) -> List[List[str]]:
+    # same as fetch_video_data, but waits for the responses without blocking the event loop,
+    # and hands every continuation request to the thread pool on its own so the requests of the other channels can run in between
+    videos       = list(channel_page.videos)
+    continuation = channel_page.continuation
+    log(f'Found {len(videos)} videos...', logging_locations)
+    while continuation is not None and not any(video_url in visited_videos for _, video_url, _ in videos):
+        new_videos, continuation = await http.run(fetch_continuation, channel_page, continuation, http.http)
+        videos.extend(new_videos)
+        log(f'Found {len(videos)} videos...', logging_locations)
+    return videos
+
+
+def determine_feed_url(
+    url: str,
+) -> Optional[str]:
+    # YouTube only publishes the feed using the channel ID or the (legacy) user name,
+    # so there is no feed url for urls such as youtube.com/c/ChannelName or youtube.com/@handle
+    channel_type, channel_id, *_ = url.split('youtube.com/')[1].split('/') + ['']
+    if channel_type == 'channel' and channel_id.startswith('UC'): return f'{FEED_URL}?channel_id={channel_id}'
+    if channel_type == 'user'    and channel_id:                  return f'{FEED_URL}?user={channel_id}'
+    return None
+
+
+def fetch_feed(
+    feed_url: str,
+    http: urllib3.PoolManager,
+    base_url: str = BASE_URL,
+) -> Optional[Feed]:
+    # returns None if the feed is not available, so the caller can fall back to loading the channel's videos page
+    try:
+        response = http.request('GET', feed_url.replace(BASE_URL, base_url, 1), retries=False)
+    except urllib3.exceptions.HTTPError:
+        return None
+    if response.status != 200:
+        return None
+    try:
+        return parse_feed(response.data)
+    except ElementTree.ParseError:
+        return None
+
+
+async def afetch_feed(
+    feed_url: str,
+    http: AsyncConnectionPool,
+    base_url: str = BASE_URL,
+) -> Optional[Feed]:
+    # same as fetch_feed, but waits for the response without blocking the event loop
+    return await http.run(fetch_feed, feed_url, http.http, base_url)
+
+
+def parse_feed(
+    data: bytes,
+) -> Feed:
+    feed         = ElementTree.fromstring(data)
+    channel_name = feed.findtext(f'{ATOM_NAMESPACE}author/{ATOM_NAMESPACE}name') or feed.findtext(f'{ATOM_NAMESPACE}title') or ''
+    videos       = []
+    shorts       = set()
+    for entry in feed.iter(f'{ATOM_NAMESPACE}entry'):
+        video_id = entry.findtext(f'{YOUTUBE_NAMESPACE}videoId')
+        if not video_id:
+            continue
+        videos.append([entry.findtext(f'{ATOM_NAMESPACE}title') or '', f'{BASE_URL}/watch?v={video_id}', 'N/A'])
+        link = entry.find(f'{ATOM_NAMESPACE}link')
+        if link is not None and '/shorts/' in link.get('href', ''):
+            shorts.add(videos[-1][1])
+    return Feed(channel_name.strip(), videos, shorts)
+
+
+def parse_channel_page(
+    url: str,
+    page_source: str,
+    base_url: str,
+) -> ChannelPage:
+    initial_data = parse_initial_data(page_source)
+    api_key      = API_KEY.search(page_source)
+    version      = CLIENT_VERSION.search(page_source)
+    if initial_data is None or api_key is None or version is None:
+        raise RuntimeError(f'Unable to find the video information in the page for {url}. Are you sure you entered the url correctly?')
+    grid                 = next(find_values(initial_data.get('contents', {}), 'richGridRenderer'), {})
+    videos, continuation = extract_videos(grid.get('contents', []))
+    return ChannelPage(extract_channel_name(initial_data), videos, continuation, api_key.group(1), version.group(1), base_url)
+
+def format_continuation_request(
+    channel_page: ChannelPage,
+    continuation: str,
+) -> Tuple[str, bytes]:
+    body = {'context': {'client': {'clientName': 'WEB', 'clientVersion': channel_page.client_version, 'hl': 'en'}}, 'continuation': continuation}
+    return f'{channel_page.base_url}/youtubei/v1/browse?key={channel_page.api_key}&prettyPrint=false', json.dumps(body).encode('utf-8')
+
+def parse_continuation(
+    data: bytes,
+) -> Tuple[List[List[str]], Optional[str]]:
+    continuation_items = [item for items in find_values(json.loads(data.decode('utf-8')), 'continuationItems') for item in items]
+    return extract_videos(continuation_items)
+
+def parse_initial_data(
+    page_source: str,
+) -> Optional[Dict[str, Any]]:
+    match = INITIAL_DATA.search(page_source)
+    if match is None:
+        return None
+    initial_data, _ = json.JSONDecoder().raw_decode(page_source, match.end())
+    return initial_data
+
+def extract_channel_name(
+    initial_data: Dict[str, Any],
+) -> str:
+    channel_metadata = initial_data.get('metadata', {}).get('channelMetadataRenderer', {})
+    if 'title' in channel_metadata:
+        return channel_metadata['title']
+    return next((title for title in find_values(initial_data.get('header', {}), 'title') if isinstance(title, str)), '')
+
+def extract_videos(
+    items: List[Dict[str, Any]],
+) -> Tuple[List[List[str]], Optional[str]]:
+    # returns the same [[title, href, duration], ...] arrays that the EXTRACT_VIDEO_DATA_SCRIPT in scroller.py returns,
+    # and the token for the next batch of videos
+    videos       = []
+    continuation = None
+    for item in items:
+        video = item.get('richItemRenderer', {}).get('content', {}).get('videoRenderer') or item.get('gridVideoRenderer')
+        if video is not None:
+            videos.append([format_text(video.get('title', {})), f'{BASE_URL}/watch?v={video["videoId"]}', extract_duration(video)])
+        elif 'continuationItemRenderer' in item:
+            continuation = next(find_values(item['continuationItemRenderer'], 'token'), None)
+    return videos, continuation
+
+def extract_duration(
+    video: Dict[str, Any],
+) -> str:
+    if 'lengthText' in video:
+        return format_text(video['lengthText']).split()[0]
+    for overlay in video.get('thumbnailOverlays', []):
+        if 'thumbnailOverlayTimeStatusRenderer' in overlay:
+            duration = format_text(overlay['thumbnailOverlayTimeStatusRenderer'].get('text', {})).split()
+            if duration: return duration[0]
+    return 'N/A'
+
+def format_text(
+    text: Dict[str, Any],
+) -> str:
+    if 'simpleText' in text:
+        return text['simpleText']
+    return ''.join(run.get('text', '') for run in text.get('runs', []))
+
+def find_values(
+    data: Any,
+    key: str,
+) -> Generator[Any, None, None]:
+    # depth-first search (in document order) for every value stored under the provided key
+    if isinstance(data, dict):
+        for current_key, value in data.items():
+            if current_key == key: yield value
+            else:                  yield from find_values(value, key)
+    elif isinstance(data, list):
+        for value in data:
+            yield from find_values(value, key)
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import contextlib
+
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+)
+
+from .scheduler import ChannelResult
+
+try:
+    import fcntl # locks the freshness file on linux and macOS
+except ImportError:
+    fcntl = None
+    import msvcrt # locks the freshness file on Windows
+
+
+SAVE_EVERY_S = 5 # the freshness file is rewritten at most this often while the channels are scraped (and once more after the last channel)
+
+
+def determine_freshness_file(
+    path_to_channel_urls_file: str,
+) -> str:
+    return path_to_channel_urls_file.split('.')[0] + '.freshness.json'
+
+def load_freshness(
+    path_to_freshness_file: str,
+) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path_to_freshness_file):
+        return {}
+    try:
+        with open(path_to_freshness_file, mode='r', encoding='utf-8') as freshness_file:
+            return {url: dict(entry) for url, entry in json.load(freshness_file).items()}
+    except (ValueError, AttributeError, TypeError): # the file was edited by hand (or the program stopped while writing the file), so start over
+        return {}
+
+def is_fresh(
+    entry: Optional[Dict[str, Any]],
+    min_refresh_interval: Optional[float],
+) -> bool:
+    return entry is not None and min_refresh_interval is not None and time.time() - entry.get('scraped_at', 0) < min_refresh_interval
+
+def newest_video(
+    video_data: Optional[List[List[int | str]]],
+) -> Optional[List[int | str]]:
+    # video_data only has the videos that were not in the files yet, and is in chronological or reverse chronological order
+    # depending on the `reverse_chronological` instance attribute, so look for the video with the highest video number
+    if not video_data:
+        return None
+    return max(video_data, key=lambda video_datum: video_datum[0])
+
+@contextlib.contextmanager
+def locked(
+    path_to_freshness_file: str,
+) -> Generator[None, None, None]:
+    # several processes (for example, cron jobs that overlap) can record their channels in the same freshness file,
+    # so every process holds the lock on the .lock file next to the freshness file while it reads, merges, and replaces the freshness file
+    with open(path_to_freshness_file + '.lock', mode='a+', encoding='utf-8') as lock_file:
+        lock_file.seek(0)
+        if fcntl is not None: fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:                 msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None: fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:                 msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def save_freshness(
+    path_to_freshness_file: str,
+    freshness: Dict[str, Dict[str, Any]],
+    results: List[ChannelResult],
+) -> None:
+    # records when every channel was last scraped successfully, the newest video in the channel's files, and the name of the channel's files
+    # (a channel without new videos keeps the newest video recorded the last time the channel had new videos)
+    # NOTE the file is read again and merged before it is replaced, so the channels recorded by another process since `freshness` was loaded are kept,
+    #      and the new file is written next to the old file first, so a program that stops while writing never leaves a truncated file behind
+    with locked(path_to_freshness_file):
+        freshness.update(load_freshness(path_to_freshness_file))
+        for result in results:
+            if not result.succeeded:
+                continue
+            video           = newest_video(result.video_data)
+            newest_video_id = str(video[3]).split('watch?v=')[-1] if video is not None else freshness.get(result.url, {}).get('newest_video_id')
+            freshness[result.url] = {'scraped_at': round(time.time(), 3), 'newest_video_id': newest_video_id, 'file_name': result.file_name}
+        with open(path_to_freshness_file + '.temp', mode='w', encoding='utf-8') as freshness_file:
+            json.dump(freshness, freshness_file, indent=2, sort_keys=True)
+        os.replace(path_to_freshness_file + '.temp', path_to_freshness_file)
+
+
+class FreshnessRecorder:
+    '''
+    Records every channel in the freshness file as soon as its result arrives (at most once every `save_every_s` seconds, since the whole file is rewritten),
+    so a program that is stopped early, or another process that starts while the channels are scraped, already skips the channels that were finished.
+    '''
+    def __init__(
+        self,
+        path_to_freshness_file: str,
+        freshness: Dict[str, Dict[str, Any]],
+        save_every_s: float = SAVE_EVERY_S,
+    ) -> None:
+        self.path_to_freshness_file         = path_to_freshness_file
+        self.freshness                      = freshness
+        self.save_every_s                   = save_every_s
+        self.unsaved: List[ChannelResult]   = []
+        self.saved_at                       = 0.0
+
+    def add(
+        self,
+        result: ChannelResult,
+    ) -> None:
+        if not result.succeeded:
+            return
+        self.unsaved.append(result)
+        if time.monotonic() - self.saved_at >= self.save_every_s:
+            self.save()
+
+    def save(
+        self,
+    ) -> None:
+        if not self.unsaved:
+            return
+        save_freshness(self.path_to_freshness_file, self.freshness, self.unsaved)
+        self.unsaved  = []
+        self.saved_at = time.monotonic()
@@ -0,0 +1,75 @@
+import os
+import json
+
+from collections import (
+    deque,
+)
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .scheduler import ChannelResult
+
+
+# orders the channels so the channels that take the longest are scraped first:
+# a long channel scraped last can keep the program running long after every other channel finished
+# (channels without a recorded duration are usually channels that were never scraped, which are the slowest channels to scrape)
+def longest_first(
+    url: str,                           # pylint: disable=unused-argument
+    estimated_seconds: Optional[float],
+) -> float:
+    return -estimated_seconds if estimated_seconds is not None else float('-inf')
+
+def file_order(
+    url: str,                           # pylint: disable=unused-argument
+    estimated_seconds: Optional[float], # pylint: disable=unused-argument
+) -> float:
+    return 0 # sorted() is stable, so every channel keeps its position in the file
+
+
+JOB_ORDERS: Dict[str, Callable[[str, Optional[float]], float]] = {
+    'longest_first': longest_first,
+    'file':          file_order,
+}
+
+
+def determine_durations_file(
+    path_to_channel_urls_file: str,
+) -> str:
+    return path_to_channel_urls_file.split('.')[0] + '.durations.json'
+
+def load_durations(
+    path_to_durations_file: str,
+) -> Dict[str, float]:
+    if not os.path.exists(path_to_durations_file):
+        return {}
+    try:
+        with open(path_to_durations_file, mode='r', encoding='utf-8') as durations_file:
+            return {url: float(seconds) for url, seconds in json.load(durations_file).items()}
+    except (ValueError, AttributeError): # the file was edited by hand (or the program stopped while writing the file), so start over
+        return {}
+
+def save_durations(
+    path_to_durations_file: str,
+    durations: Dict[str, float],
+    results: List[ChannelResult],
+) -> None:
+    # only successful channels are recorded, since a channel that failed early says nothing about how long the channel takes to scrape
+    durations.update({result.url: round(result.seconds, 3) for result in results if result.succeeded and result.seconds is not None})
+    with open(path_to_durations_file, mode='w', encoding='utf-8') as durations_file:
+        json.dump(durations, durations_file, indent=2, sort_keys=True)
+
+
+def order_urls(
+    urls: deque[str],
+    durations: Dict[str, float],
+    key: Callable[[str, Optional[float]], float],
+) -> Tuple[deque[str], List[int]]:
+    # returns the urls in the order to scrape them, and the position in `urls` of every url in the new order
+    # (so the results can be put back in the same order as the file)
+    order = sorted(range(len(urls)), key=lambda index: key(urls[index], durations.get(urls[index])))
+    return deque(urls[index] for index in order), order
@@ -0,0 +1,200 @@
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import contextlib
+
+from io import (
+    TextIOWrapper,
+)
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+from .custom_logger import log
+
+
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+
+class JobQueue:
+    '''
+    Durable queue of channel urls stored in a SQLite file, so several create_list_from() calls (in different processes,
+    or on different machines pointing at the same shared directory) can scrape the same list of channels together:
+      * every url is a job that is `pending`, `leased` (being scraped by one process), `done`, or `failed`
+      * a process leases the next pending job for `lease_timeout_s` seconds, and a background thread keeps renewing the leases of the jobs the process
+        is still scraping, so the jobs of a process that crashes (or a machine that goes offline) are leased by another process after the lease times out
+      * a job that failed (or whose lease timed out) `max_attempts` times is marked `failed` instead of being leased again,
+        and a job that failed with `final=True` is marked `failed` right away
+    NOTE SQLite relies on file locks, which some network file systems do not implement properly, so use a file system with working locks for the shared directory.
+    '''
+    def __init__(
+        self,
+        path_to_queue_file: str,
+        lease_timeout_s:    float = 60,
+        max_attempts:       int   = 3,
+        logging_locations:  Optional[Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]] = None,
+    ) -> None:
+        self.path_to_queue_file   = path_to_queue_file
+        self.lease_timeout_s      = lease_timeout_s
+        self.max_attempts         = max(1, int(max_attempts))
+        self.logging_locations    = logging_locations
+        self.owner                = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.held_jobs: Set[str]  = set()
+        self.held_jobs_lock       = threading.Lock()
+        self.stop_heartbeat       = threading.Event()
+        self.heartbeat: Optional[threading.Thread] = None
+        with self.transaction() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS jobs (url TEXT PRIMARY KEY, position INTEGER NOT NULL, state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, lease_owner TEXT, lease_expires REAL, error TEXT, updated REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, position)')
+
+    @contextlib.contextmanager
+    def transaction(
+        self,
+    ) -> Generator[sqlite3.Connection, None, None]:
+        # every transaction uses its own connection, so threads never share a connection,
+        # and BEGIN IMMEDIATE takes the write lock right away, so two processes can never lease the same job
+        connection = sqlite3.connect(self.path_to_queue_file, timeout=30, isolation_level=None)
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    def add(
+        self,
+        urls: Iterable[str],
+    ) -> None:
+        # urls already in the queue (added by another process, or by an earlier run) keep their state,
+        # and new urls are leased after every url already in the queue
+        with self.transaction() as connection:
+            start = connection.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM jobs').fetchone()[0]
+            connection.executemany('INSERT OR IGNORE INTO jobs (url, position, state, updated) VALUES (?, ?, ?, ?)', [(url, start + position, PENDING, time.time()) for position, url in enumerate(urls)])
+
+    def lease(
+        self,
+    ) -> Optional[str]:
+        # returns the next url to scrape, or None if every job is done, failed, or leased by a process that is still running
+        with self.transaction() as connection:
+            while True:
+                now = time.time()
+                job = connection.execute('SELECT url, attempts FROM jobs WHERE state = ? OR (state = ? AND lease_expires < ?) ORDER BY position LIMIT 1', (PENDING, LEASED, now)).fetchone()
+                if job is None:
+                    return None
+                url, attempts = job
+                if attempts >= self.max_attempts: # the lease of every earlier attempt timed out
+                    connection.execute('UPDATE jobs SET state = ?, lease_owner = NULL, error = ?, updated = ? WHERE url = ?', (FAILED, f'The lease timed out {attempts} times', now, url))
+                    continue
+                connection.execute('UPDATE jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated = ? WHERE url = ?', (LEASED, self.owner, now + self.lease_timeout_s, now, url))
+                break
+        with self.held_jobs_lock:
+            self.held_jobs.add(url)
+            if self.heartbeat is None:
+                self.heartbeat = threading.Thread(target=self.renew_leases, daemon=True)
+                self.heartbeat.start()
+        return url
+
+    def has_jobs(
+        self,
+    ) -> bool:
+        with self.transaction() as connection:
+            return connection.execute('SELECT 1 FROM jobs WHERE state = ? OR (state = ? AND lease_expires < ?) LIMIT 1', (PENDING, LEASED, time.time())).fetchone() is not None
+
+    def complete(
+        self,
+        url: str,
+    ) -> None:
+        self.finish(url, DONE, None)
+
+    def fail(
+        self,
+        url: str,
+        error: Exception,
+        final: bool = False,
+    ) -> None:
+        # the job is retried (possibly by another process) until it failed `max_attempts` times,
+        # unless the failure is `final` (for example, the channel was already retried in the process that leased it)
+        self.finish(url, FAILED if final else None, repr(error))
+
+    def finish(
+        self,
+        url: str,
+        state: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        with self.held_jobs_lock:
+            self.held_jobs.discard(url)
+        with self.transaction() as connection:
+            # only the process holding the lease can finish the job (another process leased the job if this process held it past the lease timeout)
+            connection.execute('UPDATE jobs SET state = COALESCE(?, CASE WHEN attempts >= ? THEN ? ELSE ? END), lease_owner = NULL, lease_expires = NULL, error = ?, updated = ? WHERE url = ? AND lease_owner = ?', (state, self.max_attempts, FAILED, PENDING, error, time.time(), url, self.owner))
+
+    def renew_leases(
+        self,
+    ) -> None:
+        while not self.stop_heartbeat.wait(self.lease_timeout_s / 3):
+            with self.held_jobs_lock:
+                held_jobs = list(self.held_jobs)
+            if not held_jobs:
+                continue
+            try:
+                with self.transaction() as connection:
+                    connection.executemany('UPDATE jobs SET lease_expires = ? WHERE url = ? AND lease_owner = ?', [(time.time() + self.lease_timeout_s, url, self.owner) for url in held_jobs])
+            except sqlite3.Error as error:
+                # the queue file can be locked by another process for longer than the connection timeout (or briefly unreachable on a shared directory),
+                # so keep the heartbeat running and renew the leases on the next tick instead of letting every lease time out
+                if self.logging_locations: log(f'Could not renew the leases in the job queue ({error!r}), so trying again in {self.lease_timeout_s / 3:.0f} seconds....', self.logging_locations)
+
+    def counts(
+        self,
+    ) -> Dict[str, int]:
+        with self.transaction() as connection:
+            counts = dict(connection.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+        return {state: counts.get(state, 0) for state in (PENDING, LEASED, DONE, FAILED)}
+
+    def close(
+        self,
+    ) -> None:
+        self.stop_heartbeat.set()
+        if self.heartbeat is not None:
+            self.heartbeat.join()
+
+
+class LeasedUrls:
+    '''
+    Stands in for the `urls` deque shared by the threads scraping channels, but leases every url from a JobQueue instead.
+    NOTE unlike deque.popleft(), popleft() returns None when another process leased the last job first.
+    '''
+    def __init__(
+        self,
+        job_queue: JobQueue,
+    ) -> None:
+        self.job_queue = job_queue
+
+    def __bool__(
+        self,
+    ) -> bool:
+        return self.job_queue.has_jobs()
+
+    def __len__(
+        self,
+    ) -> int:
+        counts = self.job_queue.counts()
+        return counts[PENDING] + counts[LEASED]
+
+    def popleft(
+        self,
+    ) -> Optional[str]:
+        return self.job_queue.lease()
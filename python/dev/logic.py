@@ -1,5 +1,6 @@
 import sys
 import time
+import asyncio
 import threading
 import random
 import contextlib
@@ -12,6 +13,7 @@ from io import (
 )
 from typing import (
     Any,
+    Callable,
     Generator,
     List,
     Optional,
@@ -21,12 +23,19 @@ from typing import (
 )
 
 import selenium
+import urllib3
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support   import expected_conditions as EC
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from . import program
+from . import fetcher, program, scroller, snapshot
+from .driver_pool                              import DriverPool
+from .tab_pool                                 import TabPool
+from .scheduler                                import ChannelResult
+from .memory_guard                             import MemoryGuard
+from .rate_limiter                             import RateLimiter
+from .retry                                    import RetryPolicy, is_fatal
 from .download.selenium_webdriver_dependencies import download_all
 from .download.windows_info                    import get_drive_letter
 from .download.user_os_info                    import determine_user_os
@@ -34,6 +43,44 @@ from .notifications                            import Common, ModuleMessage, Scr
 from .custom_logger                            import log, log_time_taken
 
 
+# the program only needs the titles, urls, and durations of the videos (which are all text in the DOM),
+# so the lean profile stops the browser from downloading and decoding thumbnails, video previews, web fonts, and ad/tracking scripts
+LEAN_FIREFOX_PREFERENCES = {
+    'permissions.default.image':                     2,     # block every image
+    'media.autoplay.default':                        5,     # block autoplay (video previews when hovering over a thumbnail)
+    'media.autoplay.blocking_policy':                2,
+    'browser.display.use_document_fonts':            0,     # use the system fonts instead of downloading web fonts
+    'gfx.downloadable_fonts.enabled':                False,
+    'privacy.trackingprotection.enabled':            True,  # block third party ad and tracking scripts
+    'ui.prefersReducedMotion':                       1,     # disable animations
+    'toolkit.cosmeticAnimations.enabled':            False,
+    'browser.cache.disk.enable':                     False, # the cache is thrown away with the profile anyway
+}
+LEAN_CHROMIUM_ARGUMENTS = (
+    '--blink-settings=imagesEnabled=false',
+    '--autoplay-policy=user-gesture-required',
+    '--disable-remote-fonts',
+    '--force-prefers-reduced-motion',
+    '--disable-smooth-scrolling',
+)
+LEAN_CHROMIUM_PREFERENCES = {
+    'profile.managed_default_content_settings.images': 2,
+}
+# several tabs share one browser when scraping with the TabPool, and only one of those windows can be in the foreground
+MULTIPLEXED_CHROMIUM_ARGUMENTS = (
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+)
+LEAN_BLOCKED_URL_PATTERNS = (
+    # requests matching these patterns are blocked with the DevTools protocol in Chromium based drivers
+    '*i.ytimg.com*', '*yt3.ggpht.com*', '*.jpg', '*.png', '*.webp', '*.gif', # thumbnails and avatars
+    '*.woff', '*.woff2', '*.ttf', '*fonts.gstatic.com*',                     # web fonts
+    '*googlevideo.com*', '*.mp4', '*.webm',                                 # video previews
+    '*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*google-analytics.com*', '*googletagservices.com*', # ad and tracking scripts
+)
+
+
 def execute(
     urls:                             deque[str],
     file_name:                        str,
@@ -51,6 +98,12 @@ def execute(
     cookie_consent:                   bool,
     verify_page_bottom_n_times:       int,
     file_buffering:                   int,
+    prune_loaded_videos:              bool,
+    save_page_source:                 bool,
+    backend:                          str,
+    check_rss_feed:                   bool,
+    lean_profile:                     bool,
+    segment_size:                     Optional[int],
     list_creator_configuration:       Tuple[bool, bool, bool, bool, bool, bool, bool, bool, float, str | None, bool, int, int, str],
     execution_type:                   str,
     lock:                             threading.Lock,
@@ -58,7 +111,15 @@ def execute(
     min_sleep:                        Optional[float] = None,
     max_sleep:                        Optional[float] = None,
     after_n_channels_pause_for_s:     Optional[Tuple[int, int]] = None,
-    aggregate_logging_locations:      Optional[Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]] = None
+    aggregate_logging_locations:      Optional[Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]] = None,
+    page_source:                      Optional[str] = None,
+    driver_pool:                      Optional[DriverPool] = None,
+    tab_pool:                         Optional[TabPool] = None,
+    on_channel_finished:              Optional[Callable[[str, ChannelResult], None]] = None,
+    memory_guard:                     Optional[MemoryGuard] = None,
+    rate_limiter:                     Optional[RateLimiter] = None,
+    retry_policy:                     Optional[RetryPolicy] = None,
+    connection_pool:                  Optional[urllib3.PoolManager] = None,
 ) -> Tuple[
     List[List[int | str]] | None,
     Tuple[
@@ -86,33 +147,6 @@ def execute(
             else:                          raise RuntimeError(script_message.not_writing_to_any_files_hint + script_message.display_current_configuration())
 
 
-    def process_url(
-    ) -> str:
-        try:
-            _, channel_type, channel_id = parse_url()
-        except IndexError as error_message:
-            raise ValueError(common_message.url_error) from error_message
-        base_url = 'https://www.youtube.com'
-        return f'{base_url}/{channel_type}/{channel_id}/videos?view=0&sort=dd&flow=grid&shelf_id=0'
-
-    def parse_url(
-    ) -> Tuple[str, str, str]:
-        channel_info = url.split('youtube.com/')[1]
-        channel_type = channel_info.split('/')[0]
-        try:
-            # handle URLs such as
-            # youtube.com/identifier/                 # NOTE there is a trailing slash here!
-            # youtube.com/identifier/ID
-            # youtube.com/identifier/ID/
-            # youtube.com/identifier/ID/anythingElse
-            channel_id = channel_info.split('/')[1]
-        except IndexError:
-            # handle URLs such as
-            # youtube.com/identifier                  # NOTE there is no trailing slash here!
-            channel_id = ''
-        return channel_info, channel_type, channel_id
-
-
     def open_user_driver(
     ) -> WebDriver:
         nonlocal user_driver
@@ -139,6 +173,9 @@ def execute(
         options = selenium.webdriver.firefox.options.Options()
         if headless is True:
             options.headless = True
+        if lean_profile is True:
+            for preference, value in LEAN_FIREFOX_PREFERENCES.items():
+                options.set_preference(preference, value)
         return webdriver.Firefox(options=options)
 
     def configure_operadriver(
@@ -153,7 +190,8 @@ def execute(
         if headless is True:
             options.add_argument('headless')
             print(common_message.unsupported_opera_headless)
-        return webdriver.Opera(options=options)
+        configure_chromium_profile(options)
+        return block_lean_profile_requests(webdriver.Opera(options=options))
 
     def configure_safaridriver(
     ) -> webdriver.Safari:
@@ -162,6 +200,8 @@ def execute(
             raise RuntimeError(common_message.selenium_launch_error)
         if headless is True:
             print(common_message.unsupported_safari_headless)
+        if lean_profile is True:
+            print(common_message.unsupported_safari_lean_profile)
         return webdriver.Safari()
 
     def configure_chromedriver(
@@ -170,7 +210,8 @@ def execute(
         options = webdriver.ChromeOptions()
         if headless is True:
             options.add_argument('headless')
-        return webdriver.Chrome(chrome_options=options)
+        configure_chromium_profile(options)
+        return block_lean_profile_requests(webdriver.Chrome(chrome_options=options))
 
     def configure_bravedriver(
     ) -> webdriver.Chrome:
@@ -185,7 +226,8 @@ def execute(
         if headless is True:
             print(common_message.unsupported_brave_headless)
             # options.headless = True
-        return webdriver.Chrome(options=options, executable_path=executable_path)
+        configure_chromium_profile(options)
+        return block_lean_profile_requests(webdriver.Chrome(options=options, executable_path=executable_path))
 
     def configure_edgedriver(
     ) -> webdriver.Edge:
@@ -203,8 +245,34 @@ def execute(
         if headless is True:
             print(common_message.unsupported_edge_headless)
             # options.headless = True
+        if lean_profile is True:
+            print(common_message.unsupported_edge_lean_profile)
         return webdriver.Edge(executable_path=executable_path)
 
+    def configure_chromium_profile(
+        options: webdriver.ChromeOptions,
+    ) -> None:
+        if tab_pool is not None:
+            for argument in MULTIPLEXED_CHROMIUM_ARGUMENTS:
+                options.add_argument(argument)
+        if lean_profile is True:
+            for argument in LEAN_CHROMIUM_ARGUMENTS:
+                options.add_argument(argument)
+            options.add_experimental_option('prefs', LEAN_CHROMIUM_PREFERENCES)
+
+    def block_lean_profile_requests(
+        driver: webdriver.Chrome,
+    ) -> webdriver.Chrome:
+        # browser preferences cannot block fonts or third party scripts in Chromium based browsers,
+        # so intercept those requests with the DevTools protocol instead
+        if lean_profile is True:
+            try:
+                driver.execute_cdp_cmd('Network.enable',         {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(LEAN_BLOCKED_URL_PATTERNS)})
+            except selenium.common.exceptions.WebDriverException: # older drivers (such as some operadriver versions) do not support DevTools commands, so only the browser preferences apply
+                pass
+        return driver
+
 
     def show_user_how_to_set_up_selenium(
     ) -> None:
@@ -229,12 +297,75 @@ def execute(
             raise RuntimeError(common_message.selenium_launch_error) from same_error_message_again
 
 
+    def open_driver(
+    ) -> None:
+        # the driver is only opened once a channel actually needs to be scrolled through
+        # (updates found in the channel's RSS feed do not need a driver)
+        nonlocal driver
+        if tab_pool is not None: driver = tab_pool.acquire(driver_key, open_browser) # scrape the channel in a new tab of a shared browser
+        else:                    driver = open_browser()
+
+    def open_browser(
+    ) -> WebDriver:
+        if driver_pool is not None: return driver_pool.acquire(driver_key, launch_driver)
+        return launch_driver()
+
+    def close_browser(
+        browser: WebDriver,
+    ) -> None:
+        if driver_pool is not None: driver_pool.release(driver_key, browser) # keep the driver open for the next channel
+        else:                       browser.quit()
+
+    def recycle_driver_if_too_large(
+    ) -> None:
+        # the browser keeps some of the memory it used for the last channel, so replace a driver that grew too large with a new driver
+        # (a tab shares its browser with other tabs, so only drivers that are not shared are replaced)
+        nonlocal driver
+        if driver is None or memory_guard is None or tab_pool is not None or not memory_guard.should_recycle(driver):
+            return
+        if aggregate_logging_locations: log(f'The {user_driver}driver is using more than the maximum memory for a driver, so closing it and opening a new driver for the next channel...', aggregate_logging_locations)
+        if driver_pool is not None: driver_pool.quit(driver)
+        else:                       driver.quit()
+        driver = None
+
+    def discard_driver_if_unresponsive(
+    ) -> None:
+        # a channel that failed is retried with the same driver, unless its browser crashed (or stopped responding)
+        nonlocal driver
+        if driver is None:
+            return
+        try:
+            driver.current_url # pylint: disable=pointless-statement
+            return
+        except selenium.common.exceptions.WebDriverException:
+            pass
+        if aggregate_logging_locations: log(f'The {user_driver}driver stopped responding, so opening a new driver for the next attempt...', aggregate_logging_locations)
+        with contextlib.suppress(selenium.common.exceptions.WebDriverException):
+            if   tab_pool    is not None: tab_pool.release(driver_key, driver, close_browser)
+            elif driver_pool is not None: driver_pool.quit(driver)
+            else:                         driver.quit()
+        driver = None
+
+    def launch_driver(
+    ) -> WebDriver:
+        nonlocal driver
+        try:
+            driver = open_user_driver()
+        except selenium.common.exceptions.WebDriverException as error_message:
+            handle_opening_webdriver_exception(error_message)
+        driver.set_window_size(780, 800)
+        driver.set_window_position(0, 0)
+        return driver
+
+
     def run_scraper(
     ) -> Tuple[
         Optional[List[List[int | str]]],
         str,
         str,
     ]:
+        if driver is None:
+            open_driver()
         driver.get(url)
         manage_cookie_consent_form()
         wait                        = selenium.webdriver.support.ui.WebDriverWait(driver, 9)
@@ -254,26 +385,95 @@ def execute(
             load_page(channel_heading_xpath, topic_channel_heading_xpath)
         except selenium.common.exceptions.TimeoutException as error_message:
             raise RuntimeError(common_message.selenium_unable_to_load_elements_error) from error_message
-        channel_name, file_name = determine_file_name(channel_heading_xpath, topic_channel_heading_xpath)
+        channel_name                   = driver.find_element_by_xpath(channel_heading_xpath).text or driver.find_element_by_xpath(topic_channel_heading_xpath).text
+        channel_name, output_file_name = determine_file_name(url, channel_name, file_name, file_suffix, video_id_only, reverse_chronological, txt, csv, markdown)
         # the program actually "starts" right after `urls.popleft()`
         # but `yield_logger` cannot be called earlier and must be
-        # called here inside `run_scraper` since `file_name`
+        # called here inside `run_scraper` since `output_file_name`
         # is potentially dependent on the channel name, which is not loaded until
         # the `load_page` call in the try/except block above
-        with yield_logger(file_name) as logging_locations:
+        with yield_logger(output_file_name, file_buffering, log_silently) as logging_locations:
             log( '>' * 50 + 'STARTING  PROGRAM' + '<' * 50,             logging_locations)
             log(f'Now scraping {url} using the {user_driver}driver...', logging_locations)
             log(f'Current configuration: {list_creator_configuration}', logging_locations)
-            video_data            = program.determine_action(url, driver, video_id_only, scroll_pause_time, verify_page_bottom_n_times, reverse_chronological, file_name, file_buffering, txt, csv, markdown, all_video_data_in_memory, logging_locations)
-            log_time_taken(program_cpu_start_time, program_real_start_time, 'This program took ', f' to complete writing information for the "{channel_name}" channel to the {file_name} file', logging_locations)
+            video_data            = program.determine_action(url, driver, video_id_only, scroll_pause_time, verify_page_bottom_n_times, reverse_chronological, output_file_name, file_buffering, txt, csv, markdown, all_video_data_in_memory, prune_loaded_videos, save_page_source, logging_locations, segment_size=segment_size)
+            log_time_taken(program_cpu_start_time, program_real_start_time, 'This program took ', f' to complete writing information for the "{channel_name}" channel to the {output_file_name} file', logging_locations)
+            log( '>' * 50 + 'COMPLETED PROGRAM' + '<' * 50,                                                                                          logging_locations)
+        return (video_data, channel_name, output_file_name)
+
+
+    def run_fetcher(
+    ) -> Tuple[
+        Optional[List[List[int | str]]],
+        str,
+        str,
+    ]:
+        channel_page                   = fetcher.fetch_channel_page(url, http)
+        channel_name, output_file_name = determine_file_name(url, channel_page.channel_name, file_name, file_suffix, video_id_only, reverse_chronological, txt, csv, markdown)
+        with yield_logger(output_file_name, file_buffering, log_silently) as logging_locations:
+            log( '>' * 50 + 'STARTING  PROGRAM' + '<' * 50,             logging_locations)
+            log(f'Now scraping {url} using the http backend...',       logging_locations)
+            log(f'Current configuration: {list_creator_configuration}', logging_locations)
+            video_data = program.determine_action(url, None, video_id_only, scroll_pause_time, verify_page_bottom_n_times, reverse_chronological, output_file_name, file_buffering, txt, csv, markdown, all_video_data_in_memory, prune_loaded_videos, False, logging_locations, None, channel_page, http, segment_size=segment_size)
+            log_time_taken(program_cpu_start_time, program_real_start_time, 'This program took ', f' to complete writing information for the "{channel_name}" channel to the {output_file_name} file', logging_locations)
+            log( '>' * 50 + 'COMPLETED PROGRAM' + '<' * 50,                                                                                          logging_locations)
+        return (video_data, channel_name, output_file_name)
+
+
+    def check_feed(
+    ) -> Optional[
+        Tuple[
+            Optional[List[List[int | str]]],
+            str,
+            str,
+        ]
+    ]:
+        # the new videos for most updates are all in the channel's RSS feed (which lists the channel's newest videos),
+        # so check the feed before loading the channel's videos page (and before opening a driver)
+        # returns None if the program needs to load the channel's videos page instead
+        feed_url = fetcher.determine_feed_url(url)
+        if feed_url is None:
+            return None
+        feed = fetcher.fetch_feed(feed_url, http)
+        if feed is None:
+            return None
+        channel_name, output_file_name = determine_file_name(url, feed.channel_name, file_name, file_suffix, video_id_only, reverse_chronological, txt, csv, markdown)
+        feed_videos                    = select_feed_videos(feed, output_file_name, txt, csv, markdown, all_video_data_in_memory)
+        if feed_videos is None:
+            return None
+        with yield_logger(output_file_name, file_buffering, log_silently) as logging_locations:
+            log( '>' * 50 + 'STARTING  PROGRAM' + '<' * 50,                       logging_locations)
+            log(f'Now updating {url} using the RSS feed for the channel ({feed_url})...', logging_locations)
+            log(f'Current configuration: {list_creator_configuration}',           logging_locations)
+            video_data = program.determine_action(url, None, video_id_only, scroll_pause_time, verify_page_bottom_n_times, reverse_chronological, output_file_name, file_buffering, txt, csv, markdown, all_video_data_in_memory, prune_loaded_videos, False, logging_locations, None, None, None, feed_videos, segment_size=segment_size)
+            log_time_taken(program_cpu_start_time, program_real_start_time, 'This program took ', f' to complete writing information for the "{channel_name}" channel to the {output_file_name} file', logging_locations)
             log( '>' * 50 + 'COMPLETED PROGRAM' + '<' * 50,                                                                                          logging_locations)
-        return (video_data, channel_name, file_name)
+        return (video_data, channel_name, output_file_name)
+
+
+    def replay_snapshot(
+    ) -> Tuple[
+        Optional[List[List[int | str]]],
+        str,
+        str,
+    ]:
+        channel_name, _                = snapshot.extract_channel_information(page_source)
+        channel_name, output_file_name = determine_file_name(url, channel_name, file_name, file_suffix, video_id_only, reverse_chronological, txt, csv, markdown)
+        with yield_logger(output_file_name, file_buffering, log_silently) as logging_locations:
+            log( '>' * 50 + 'STARTING  PROGRAM' + '<' * 50,             logging_locations)
+            log(f'Now replaying the page snapshot for {url} without a driver...', logging_locations)
+            log(f'Current configuration: {list_creator_configuration}',         logging_locations)
+            video_data = program.determine_action(url, None, video_id_only, scroll_pause_time, verify_page_bottom_n_times, reverse_chronological, output_file_name, file_buffering, txt, csv, markdown, all_video_data_in_memory, prune_loaded_videos, False, logging_locations, page_source, segment_size=segment_size)
+            log_time_taken(program_cpu_start_time, program_real_start_time, 'This program took ', f' to complete writing information for the "{channel_name}" channel to the {output_file_name} file', logging_locations)
+            log( '>' * 50 + 'COMPLETED PROGRAM' + '<' * 50,                                                                                          logging_locations)
+        return (video_data, channel_name, output_file_name)
 
 
     def manage_cookie_consent_form(
     ) -> None:
         if 'consent.youtube.com' in driver.current_url:
             common_message.display_cookie_redirection()
+            if rate_limiter is not None: rate_limiter.penalize('Redirected to the cookie consent page', aggregate_logging_locations)
             accept_button_relative_path = '//button[@aria-label="Agree to the use of cookies and other data for the purposes described"]'
             accept_button               = driver.find_element_by_xpath(accept_button_relative_path)
             if cookie_consent is False:
@@ -308,97 +508,277 @@ def execute(
                 common_message.display_invalid_cookie_consent_option(cookie_consent)
 
 
-    def determine_file_name(
-        channel_heading_xpath: str,
-        topic_channel_heading_xpath: str,
-    ) -> Tuple[str, str]:
-        channel_name = driver.find_element_by_xpath(channel_heading_xpath).text or driver.find_element_by_xpath(topic_channel_heading_xpath).text
-        is_id = '_id' if video_id_only is True else ''
-        if file_suffix is True: suffix = f'_reverse_chronological_video{is_id}s_list' if reverse_chronological else f'_chronological_video{is_id}s_list'
-        else:                   suffix = ''
-        if txt is False and csv is False and markdown is False:
-            # program will not write to any output files
-            # program will store video data in memory and return the list of lists containing the video data
-            # only runs when all_video_data_in_memory=True
-            formatted_file_name = ''
-        elif file_name == 'auto':
-            formatted_channel_name = channel_name.replace(' ', '')
-            formatted_file_name    = f'{formatted_channel_name}{suffix}'
-        elif file_name == 'id':
-            _, channel_type, channel_id = parse_url()
-            if channel_id in ('videos', ''):
-                # handle URLs such as
-                # youtube.com/teded                                    # id will be teded
-                # youtube.com/teded/                                   # id will be teded
-                # youtube.com/teded/videos                             # id will be teded
-                # youtube.com/originals                                # id will be originals
-                # youtube.com/originals/                               # id will be originals
-                # youtube.com/originals/videos                         # id will be originals
-                formatted_file_name = f'{channel_type}{suffix}'
-            else:
-                # handle URLs such as
-                # youtube.com/channel/UC-Some24CharacterString         # id will be UC-Some24CharacterString
-                # youtube.com/channel/UC-Some24CharacterString/        # id will be UC-Some24CharacterString
-                # youtube.com/channel/UC-Some24CharacterString/videos  # id will be UC-Some24CharacterString
-                # youtube.com/user/UserNameForChannel                  # id will be UserNameForChannel
-                # youtube.com/user/UserNameForChannel/                 # id will be UserNameForChannel
-                # youtube.com/user/UserNameForChannel/videos           # id will be UserNameForChannel
-                # youtube.com/c/ChannelName                            # id will be ChannelName
-                # youtube.com/c/ChannelName/                           # id will be ChannelName
-                # youtube.com/c/ChannelName/videos                     # id will be ChannelName
-                formatted_file_name = f'{channel_id}{suffix}'
-        else:
-            if   file_name.endswith('.txt') or file_name.endswith('.csv'): formatted_file_name = file_name[:-4]
-            elif file_name.endswith('.md'):                                formatted_file_name = file_name[:-3]
-            else:                                                          formatted_file_name = file_name
-        return (channel_name, formatted_file_name)
-
-
-    @contextlib.contextmanager
-    def yield_logger(
-        file_name: str
-    ) -> Generator[
-        Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
-        Any,
-        None
-    ]:
-        log_file = f'{file_name}.log'
-        with open(log_file, mode='a', encoding='utf-8',  buffering=file_buffering) as output_location:
-            if log_silently is True: yield (output_location,)
-            else:                    yield (output_location, sys.stdout)
-
-
     verify_writing_to_at_least_one_location()
+    if page_source is not None:
+        # replaying a saved page snapshot does not need a driver at all
+        program_cpu_start_time  = time.perf_counter()
+        program_real_start_time = time.time()
+        url                     = urls.popleft()
+        url                     = process_url(url, common_message)
+        video_data, channel_name, output_file_name = replay_snapshot()
+        return (video_data, (channel_name, output_file_name))
+    if backend not in ('selenium', 'http'):
+        raise ValueError(common_message.invalid_backend + common_message.display_current_configuration())
     user_os       = determine_user_os()
-    if aggregate_logging_locations:
+    if aggregate_logging_locations and min_sleep is not None:
         multiplier      = max(0, max_sleep - min_sleep)
         modulo, seconds = after_n_channels_pause_for_s
-    try:
-        driver = open_user_driver()
-    except selenium.common.exceptions.WebDriverException as error_message:
-        handle_opening_webdriver_exception(error_message)
-    with driver:
-        driver.set_window_size(780, 800)
-        driver.set_window_position(0, 0)
-        while urls:
-            if aggregate_logging_locations:
-                with lock:
-                    counts[0] += 1
-                    count      = counts[0]
-                if count % modulo == 0 and count > 0:
-                    log(f'Scraped {count} channels, so sleeping for {seconds} seconds to seem less bot-like....', aggregate_logging_locations)
-                    time.sleep(seconds)
-                sleep_time = min_sleep + (random.random() * multiplier)
-                log(f'Sleeping for {sleep_time} seconds before scraping next URL....', aggregate_logging_locations)
-                time.sleep(sleep_time)
-            program_cpu_start_time  = time.perf_counter()
-            program_real_start_time = time.time()
-            if urls:
+    driver     = None
+    video_data, channel_name, output_file_name = None, '', '' # returned as is if another thread scraped every url before this thread scraped a channel
+    driver_key = ((user_driver or 'firefox').lower(), headless, lean_profile) # drivers in the driver pool are only reused for the same configuration
+    # only the http backend and the RSS feed check make requests without the driver, and one connection pool is shared by every channel of a worker so keep-alive connections are reused
+    if connection_pool is not None:           http, owns_http = connection_pool,                   False # owned (and closed) by the caller
+    elif backend == 'http' or check_rss_feed: http, owns_http = fetcher.create_connection_pool(), True
+    else:                                     http, owns_http = None,                              False
+    scrape = run_fetcher if backend == 'http' else run_scraper
+    with http if owns_http else contextlib.nullcontext():
+        try:
+            while urls:
+                if aggregate_logging_locations:
+                    with lock:
+                        counts[0] += 1
+                        count      = counts[0]
+                    if rate_limiter is not None:
+                        rate_limiter.acquire(aggregate_logging_locations) # replaces the random sleeps, so the threads together stay under the rate without sleeping longer than needed
+                    elif min_sleep is not None: # the main process sleeps for the worker processes when a rate limiter is used with execution_mode='processes'
+                        if count % modulo == 0 and count > 0:
+                            log(f'Scraped {count} channels, so sleeping for {seconds} seconds to seem less bot-like....', aggregate_logging_locations)
+                            time.sleep(seconds)
+                        sleep_time = min_sleep + (random.random() * multiplier)
+                        log(f'Sleeping for {sleep_time} seconds before scraping next URL....', aggregate_logging_locations)
+                        time.sleep(sleep_time)
+                program_cpu_start_time  = time.perf_counter()
+                program_real_start_time = time.time()
                 with lock: # uses a dummy lock (that does not actually block) when not using multithreading
-                    url = urls.popleft()
-            else:    continue
-            if aggregate_logging_locations: log(f'{" "*8} Scraping {count:>7}: {url}', aggregate_logging_locations)
-            url                                                                = process_url()
-            video_data, channel_name, output_file_name = run_scraper()
-            if aggregate_logging_locations: log_time_taken(program_cpu_start_time, program_real_start_time, f'Finished scraping {count:>7}: "{channel_name}" and wrote to the {output_file_name} file in ', '', aggregate_logging_locations)
-        return (video_data, (channel_name, output_file_name))
+                    job_url = urls.popleft() if urls else None # another thread can take the last url while this thread sleeps
+                if job_url is None:
+                    continue
+                if aggregate_logging_locations: log(f'{" "*8} Scraping {count:>7}: {job_url}', aggregate_logging_locations)
+                attempt, error = 1, None
+                while True:
+                    try:
+                        with memory_guard.admit(aggregate_logging_locations) if memory_guard is not None else contextlib.nullcontext():
+                            url                                                    = process_url(job_url, common_message)
+                            scrape_result                                          = check_feed() if check_rss_feed else None
+                            if scrape_result is None:
+                                scrape_result                                      = scrape()
+                        error = None
+                        break
+                    except Exception as error_message: # pylint: disable=broad-except
+                        error = error_message
+                        if rate_limiter is not None: rate_limiter.penalize(f'Failed to scrape {job_url}', aggregate_logging_locations)
+                        if retry_policy is None or not retry_policy.should_retry(attempt, error_message):
+                            break
+                        delay = retry_policy.delay(attempt)
+                        if aggregate_logging_locations: log(f'Failed to scrape {job_url} ({error_message!r}), so retrying in {delay:.1f} seconds (attempt {attempt + 1} of {retry_policy.max_attempts})....', aggregate_logging_locations)
+                        discard_driver_if_unresponsive()
+                        time.sleep(delay)
+                        attempt += 1
+                if error is not None:
+                    if on_channel_finished is not None: on_channel_finished(job_url, ChannelResult(job_url, None, None, None, error, time.time() - program_real_start_time, attempt))
+                    if retry_policy is None or is_fatal(error):
+                        raise error # stops the thread, since the next channel would fail the same way
+                    # the channel failed every attempt, so give up on it but keep the thread (and its driver) for the next channel
+                    if aggregate_logging_locations: log(f'Giving up on {job_url} after {attempt} attempts: {error!r}', aggregate_logging_locations)
+                    discard_driver_if_unresponsive()
+                    continue
+                if rate_limiter is not None: rate_limiter.reward()
+                recycle_driver_if_too_large()
+                video_data, channel_name, output_file_name                         = scrape_result
+                if on_channel_finished is not None: on_channel_finished(job_url, ChannelResult(job_url, channel_name, output_file_name, video_data, None, time.time() - program_real_start_time, attempt, len(video_data) if video_data is not None else 0))
+                if aggregate_logging_locations: log_time_taken(program_cpu_start_time, program_real_start_time, f'Finished scraping {count:>7}: "{channel_name}" and wrote to the {output_file_name} file in ', '', aggregate_logging_locations)
+            return (video_data, (channel_name, output_file_name))
+        finally:
+            if   driver is not None and tab_pool is not None: tab_pool.release(driver_key, driver, close_browser) # the browser is only closed after its last tab is released
+            elif driver is not None:                           close_browser(driver)
+
+
+async def aexecute(
+    url:                              str,
+    file_name:                        str,
+    log_silently:                     bool,
+    txt:                              bool,
+    csv:                              bool,
+    markdown:                         bool,
+    file_suffix:                      bool,
+    all_video_data_in_memory:         bool,
+    video_id_only:                    bool,
+    reverse_chronological:            bool,
+    headless:                         bool,
+    scroll_pause_time:                float,
+    user_driver:                      Optional[str],
+    cookie_consent:                   bool,
+    verify_page_bottom_n_times:       int,
+    file_buffering:                   int,
+    prune_loaded_videos:              bool,
+    save_page_source:                 bool,
+    backend:                          str,
+    check_rss_feed:                   bool,
+    lean_profile:                     bool,
+    segment_size:                     Optional[int],
+    list_creator_configuration:       Tuple[bool, bool, bool, bool, bool, bool, bool, bool, float, str | None, bool, int, int, str],
+    execution_type:                   str,
+    http:                             fetcher.AsyncConnectionPool,
+) -> Tuple[
+    List[List[int | str]] | None,
+    Tuple[
+        str,
+        str,
+    ]
+]:
+    # asyncio version of `execute` for the http backend:
+    # the requests for the channel are awaited on the event loop (so other channels can be requested while this channel waits for a response),
+    # and the blocking work (reading the pre-existing files and writing the output files) is handed off to the event loop's default executor
+    common_message          = Common(list_creator_configuration)
+    program_cpu_start_time  = time.perf_counter()
+    program_real_start_time = time.time()
+    loop                    = asyncio.get_running_loop()
+    url                     = process_url(url, common_message)
+    feed_url                = fetcher.determine_feed_url(url) if check_rss_feed else None
+    feed                    = await fetcher.afetch_feed(feed_url, http) if feed_url is not None else None
+    if feed is not None:
+        channel_name, output_file_name = determine_file_name(url, feed.channel_name, file_name, file_suffix, video_id_only, reverse_chronological, txt, csv, markdown)
+        feed_videos                    = await loop.run_in_executor(None, select_feed_videos, feed, output_file_name, txt, csv, markdown, all_video_data_in_memory)
+        if feed_videos is not None:
+            with yield_logger(output_file_name, file_buffering, log_silently) as logging_locations:
+                log( '>' * 50 + 'STARTING  PROGRAM' + '<' * 50,                       logging_locations)
+                log(f'Now updating {url} using the RSS feed for the channel ({feed_url})...', logging_locations)
+                log(f'Current configuration: {list_creator_configuration}',           logging_locations)
+                video_data = await loop.run_in_executor(None, program.determine_action, url, None, video_id_only, scroll_pause_time, verify_page_bottom_n_times, reverse_chronological, output_file_name, file_buffering, txt, csv, markdown, all_video_data_in_memory, prune_loaded_videos, False, logging_locations, None, None, None, feed_videos, segment_size)
+                log_time_taken(program_cpu_start_time, program_real_start_time, 'This program took ', f' to complete writing information for the "{channel_name}" channel to the {output_file_name} file', logging_locations)
+                log( '>' * 50 + 'COMPLETED PROGRAM' + '<' * 50,                                                                                          logging_locations)
+            return (video_data, (channel_name, output_file_name))
+    channel_page            = await fetcher.afetch_channel_page(url, http)
+    channel_name, file_name = determine_file_name(url, channel_page.channel_name, file_name, file_suffix, video_id_only, reverse_chronological, txt, csv, markdown)
+    with yield_logger(file_name, file_buffering, log_silently) as logging_locations:
+        log( '>' * 50 + 'STARTING  PROGRAM' + '<' * 50,                   logging_locations)
+        log(f'Now scraping {url} using the http backend on the asyncio engine...', logging_locations)
+        log(f'Current configuration: {list_creator_configuration}',       logging_locations)
+        txt_exists, csv_exists, md_exists, force_to_page_bottom = program.determine_existing_files(file_name, txt, csv, markdown, all_video_data_in_memory)
+        if force_to_page_bottom: visited_videos = set()
+        else:                    visited_videos, *_ = await loop.run_in_executor(None, scroller.determine_common_visited_videos, file_name, txt_exists, csv_exists, md_exists)
+        videos       = await fetcher.afetch_video_data(channel_page, visited_videos, http, logging_locations)
+        channel_page = channel_page._replace(videos=videos, continuation=None) # every video is already loaded, so determine_action does not make any more requests
+        video_data   = await loop.run_in_executor(None, program.determine_action, url, None, video_id_only, scroll_pause_time, verify_page_bottom_n_times, reverse_chronological, file_name, file_buffering, txt, csv, markdown, all_video_data_in_memory, prune_loaded_videos, False, logging_locations, None, channel_page, None, None, segment_size)
+        log_time_taken(program_cpu_start_time, program_real_start_time, 'This program took ', f' to complete writing information for the "{channel_name}" channel to the {file_name} file', logging_locations)
+        log( '>' * 50 + 'COMPLETED PROGRAM' + '<' * 50,                                                                                          logging_locations)
+    return (video_data, (channel_name, file_name))
+
+
+def select_feed_videos(
+    feed: fetcher.Feed,
+    file_name: str,
+    txt: bool,
+    csv: bool,
+    markdown: bool,
+    all_video_data_in_memory: bool,
+) -> Optional[List[List[str]]]:
+    # returns the videos in the feed up to (and including) the newest video already written to the pre-existing file(s),
+    # or None if the files need to be created, the channel uploaded more new videos than the feed lists,
+    # or a new video is a short (the channel's videos page does not always list shorts, so only the videos page knows whether the short belongs in the files)
+    txt_exists, csv_exists, md_exists, force_to_page_bottom = program.determine_existing_files(file_name, txt, csv, markdown, all_video_data_in_memory)
+    if force_to_page_bottom:
+        return None
+    visited_videos, *_ = scroller.determine_common_visited_videos(file_name, txt_exists, csv_exists, md_exists)
+    newest_known_video = next((index for index, (_, video_url, _) in enumerate(feed.videos) if video_url in visited_videos), None)
+    if newest_known_video is None or any(video_url in feed.shorts for _, video_url, _ in feed.videos[:newest_known_video]):
+        return None
+    return feed.videos[:newest_known_video + 1]
+
+
+def process_url(
+    url: str,
+    common_message: Common,
+) -> str:
+    try:
+        _, channel_type, channel_id = parse_url(url)
+    except IndexError as error_message:
+        raise ValueError(common_message.url_error) from error_message
+    base_url = 'https://www.youtube.com'
+    return f'{base_url}/{channel_type}/{channel_id}/videos?view=0&sort=dd&flow=grid&shelf_id=0'
+
+def parse_url(
+    url: str,
+) -> Tuple[str, str, str]:
+    channel_info = url.split('youtube.com/')[1]
+    channel_type = channel_info.split('/')[0]
+    try:
+        # handle URLs such as
+        # youtube.com/identifier/                 # NOTE there is a trailing slash here!
+        # youtube.com/identifier/ID
+        # youtube.com/identifier/ID/
+        # youtube.com/identifier/ID/anythingElse
+        channel_id = channel_info.split('/')[1]
+    except IndexError:
+        # handle URLs such as
+        # youtube.com/identifier                  # NOTE there is no trailing slash here!
+        channel_id = ''
+    return channel_info, channel_type, channel_id
+
+
+def determine_file_name(
+    url: str,
+    channel_name: str,
+    file_name: str,
+    file_suffix: bool,
+    video_id_only: bool,
+    reverse_chronological: bool,
+    txt: bool,
+    csv: bool,
+    markdown: bool,
+) -> Tuple[str, str]:
+    is_id = '_id' if video_id_only is True else ''
+    if file_suffix is True: suffix = f'_reverse_chronological_video{is_id}s_list' if reverse_chronological else f'_chronological_video{is_id}s_list'
+    else:                   suffix = ''
+    if txt is False and csv is False and markdown is False:
+        # program will not write to any output files
+        # program will store video data in memory and return the list of lists containing the video data
+        # only runs when all_video_data_in_memory=True
+        formatted_file_name = ''
+    elif file_name == 'auto':
+        formatted_channel_name = channel_name.replace(' ', '')
+        formatted_file_name    = f'{formatted_channel_name}{suffix}'
+    elif file_name == 'id':
+        _, channel_type, channel_id = parse_url(url)
+        if channel_id in ('videos', ''):
+            # handle URLs such as
+            # youtube.com/teded                                    # id will be teded
+            # youtube.com/teded/                                   # id will be teded
+            # youtube.com/teded/videos                             # id will be teded
+            # youtube.com/originals                                # id will be originals
+            # youtube.com/originals/                               # id will be originals
+            # youtube.com/originals/videos                         # id will be originals
+            formatted_file_name = f'{channel_type}{suffix}'
+        else:
+            # handle URLs such as
+            # youtube.com/channel/UC-Some24CharacterString         # id will be UC-Some24CharacterString
+            # youtube.com/channel/UC-Some24CharacterString/        # id will be UC-Some24CharacterString
+            # youtube.com/channel/UC-Some24CharacterString/videos  # id will be UC-Some24CharacterString
+            # youtube.com/user/UserNameForChannel                  # id will be UserNameForChannel
+            # youtube.com/user/UserNameForChannel/                 # id will be UserNameForChannel
+            # youtube.com/user/UserNameForChannel/videos           # id will be UserNameForChannel
+            # youtube.com/c/ChannelName                            # id will be ChannelName
+            # youtube.com/c/ChannelName/                           # id will be ChannelName
+            # youtube.com/c/ChannelName/videos                     # id will be ChannelName
+            formatted_file_name = f'{channel_id}{suffix}'
+    else:
+        if   file_name.endswith('.txt') or file_name.endswith('.csv'): formatted_file_name = file_name[:-4]
+        elif file_name.endswith('.md'):                                formatted_file_name = file_name[:-3]
+        else:                                                          formatted_file_name = file_name
+    return (channel_name, formatted_file_name)
+
+
+@contextlib.contextmanager
+def yield_logger(
+    file_name: str,
+    file_buffering: int,
+    log_silently: bool,
+) -> Generator[
+    Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+    Any,
+    None
+]:
+    log_file = f'{file_name}.log'
+    with open(log_file, mode='a', encoding='utf-8',  buffering=file_buffering) as output_location:
+        if log_silently is True: yield (output_location,)
+        else:                    yield (output_location, sys.stdout)
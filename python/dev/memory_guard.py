@@ -0,0 +1,146 @@
+import os
+import threading
+import contextlib
+
+from io import (
+    TextIOWrapper,
+)
+from typing import (
+    Dict,
+    Generator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .custom_logger import log
+
+try:
+    import psutil # measures memory on every platform, but is not required (the program reads /proc on linux without psutil)
+except ImportError:
+    psutil = None
+
+
+MEGABYTE = 1024 * 1024
+
+
+def available_memory(
+) -> Optional[int]:
+    # returns the memory (in bytes) the system can give to new processes without swapping, or None if it cannot be measured
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    try:
+        with open('/proc/meminfo', mode='r', encoding='utf-8') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024 # the value is in kB
+    except OSError:
+        pass
+    return None
+
+def driver_memory(
+    driver: WebDriver,
+) -> Optional[int]:
+    # returns the resident memory (in bytes) of the driver process and every process it started (the browser and its content processes),
+    # or None if it cannot be measured (for example, safaridriver is not started by the program)
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            return sum(child.memory_info().rss for child in [process] + process.children(recursive=True))
+        except psutil.Error:
+            return None
+    return process_tree_memory_from_proc(pid)
+
+def process_tree_memory_from_proc(
+    pid: int,
+) -> Optional[int]:
+    # reads every process's parent from /proc once, then adds up the resident memory of `pid` and all its descendants
+    children: Dict[int, List[int]] = {}
+    try:
+        process_ids = [int(entry) for entry in os.listdir('/proc') if entry.isdigit()]
+    except OSError:
+        return None
+    for process_id in process_ids:
+        try:
+            with open(f'/proc/{process_id}/stat', mode='r', encoding='utf-8') as stat:
+                parent_id = int(stat.read().rsplit(')', 1)[1].split()[1]) # the process name in parentheses can contain spaces
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent_id, []).append(process_id)
+    total, process_tree = 0, [pid]
+    while process_tree:
+        process_id = process_tree.pop()
+        process_tree.extend(children.get(process_id, []))
+        try:
+            with open(f'/proc/{process_id}/status', mode='r', encoding='utf-8') as status:
+                total += next((int(line.split()[1]) * 1024 for line in status if line.startswith('VmRSS:')), 0)
+        except OSError:
+            continue
+    return total
+
+
+class MemoryGuard:
+    '''
+    Keeps the program from running the machine out of memory when scraping many channels at once:
+      * a thread only starts scraping a new channel when the system has at least `min_available_mb` of available memory,
+        and otherwise waits until another channel finishes (so the number of channels scraped at once drops while memory is low)
+        -> at least one channel is always allowed to run, so the program never waits forever
+      * a driver whose process tree uses more than `max_driver_mb` after a channel is closed, and a new driver is opened for the next channel
+    Either check is skipped if it is set to None or if the memory cannot be measured.
+    '''
+    def __init__(
+        self,
+        min_available_mb: Optional[int] = None,
+        max_driver_mb:    Optional[int] = None,
+        poll_interval:    float         = 1.0,
+    ) -> None:
+        self.min_available = min_available_mb * MEGABYTE if min_available_mb is not None else None
+        self.max_driver    = max_driver_mb    * MEGABYTE if max_driver_mb    is not None else None
+        self.poll_interval = poll_interval
+        self.condition     = threading.Condition()
+        self.running       = 0
+
+    def has_headroom(
+        self,
+    ) -> bool:
+        if self.min_available is None:
+            return True
+        memory = available_memory()
+        return memory is None or memory >= self.min_available
+
+    @contextlib.contextmanager
+    def admit(
+        self,
+        logging_locations: Optional[Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]],
+    ) -> Generator[None, None, None]:
+        # wait for enough memory (or for the other channels to finish) before scraping the next channel
+        with self.condition:
+            logged = False
+            while self.running > 0 and not self.has_headroom():
+                if not logged and logging_locations:
+                    log(f'Only {available_memory() // MEGABYTE} MB of memory is available, so waiting for another channel to finish before scraping the next channel...', logging_locations)
+                    logged = True
+                self.condition.wait(self.poll_interval) # woken up early when a channel finishes
+            self.running += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.running -= 1
+                self.condition.notify_all()
+
+    def should_recycle(
+        self,
+        driver: WebDriver,
+    ) -> bool:
+        if self.max_driver is None:
+            return False
+        memory = driver_memory(driver)
+        return memory is not None and memory > self.max_driver
@@ -24,6 +24,8 @@ class Common:
     unsupported_safari_headless = '\nHeadless mode is unsupported in SafariDriver. This will be updated when support is added...\n:)\n\n\n'
     unsupported_brave_headless  = '\nHeadless mode is unsupported in BraveDriver. This will be updated when support is added...\n:)\n\n\n'
     unsupported_edge_headless   = '\nHeadless mode is unsupported in EdgeDriver. This will be updated when support is added...\n:)\n\n\n'
+    unsupported_safari_lean_profile = '\nThe lean profile is unsupported in SafariDriver, so the program will load the page with every image, font, and script...\n\n\n'
+    unsupported_edge_lean_profile   = '\nThe lean profile is unsupported in EdgeDriver, so the program will load the page with every image, font, and script...\n\n\n'
     unsupported_edge            = 'ERROR! Selenium automation with msedgedriver (Microsoft Edge) is unsupported on your platform. Please use a different browser!'
     automated_driver_update = '\n=====> Now updating Selenium driver binaries and fixing any version incompatibility problems. <=====\nThis will update all corresponding Selenium drivers for browsers (which are installed in their default locations and) supported by the yt_videos_list package...'
     url_prefix_geckodriver  = 'https://github.com/mozilla/geckodriver/releases/download'
@@ -39,6 +41,7 @@ class Common:
         'brave':   ['bravedriver',  'https://github.com/operasoftware/operachromiumdriver',                  'https://github.com/operasoftware/operachromiumdriver/releases',                              'Brave Browser',   'https://brave.com/'],
         'edge':    ['msedgedriver', 'https://developer.microsoft.com/en-us/microsoft-edge/tools/webdriver/', 'https://msedgewebdriverstorage.blob.core.windows.net/edgewebdriver?comp=list&timeout=60000', 'Microsoft Edge',  'https://www.microsoft.com/en-us/edge']
     }
+    invalid_backend          = f'The backend you specified is invalid. Please try rerunning the last command after specifying a valid backend. Supported backends include:\n{indent}selenium\n{indent}http'
     url_error                                = 'The url you provided could not be parsed properly. Please check the url you provided to make sure there are no typos!'
     selenium_launch_error                    = 'The program was unable to launch a Selenium driver instance! Please follow the suggestions above the stack trace to fix the issue.'
     possible_topic_channel_in_headless_error = 'There was a problem running the selenium webdriver!\n\nTo better debug the problem, try running the program again with headless=False if you are currently running the program with headless=True to see what is happening.'
@@ -15,19 +15,18 @@ from typing import (
     Tuple,
 )
 
-import selenium
+import urllib3
 
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
 
-from .              import scroller, writer
+from .              import fetcher, scroller, snapshot, writer
 from .notifications import Common
 from .custom_logger import log, log_time_taken
 
 
 def determine_action(
     url: str,
-    driver: WebDriver,
+    driver: Optional[WebDriver],
     video_id_only: bool,
     scroll_pause_time: float,
     verify_page_bottom_n_times: int,
@@ -38,32 +37,39 @@ def determine_action(
     csv: bool,
     markdown: bool,
     all_video_data_in_memory: bool,
+    prune_loaded_videos: bool,
+    save_page_source: bool,
     logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+    page_source: Optional[str] = None,
+    channel_page: Optional[fetcher.ChannelPage] = None,
+    http: Optional[urllib3.PoolManager] = None,
+    feed_videos: Optional[List[List[str]]] = None,
+    segment_size: Optional[int] = None,
 ) -> Optional[List[list[int | str]]]: # [int, str, str | Literal['N/A'], str]:
     common_message = Common()
-    txt_exists = os.path.isfile(f'{file_name}.txt') if txt      else False # only check if file exists if program was specified to extract info into txt file, otherwise set to False regardless of whether a txt file already exists or not
-    csv_exists = os.path.isfile(f'{file_name}.csv') if csv      else False # only check if file exists if program was specified to extract info into csv file, otherwise set to False regardless of whether a csv file already exists or not
-    md_exists  = os.path.isfile(f'{file_name}.md')  if markdown else False # only check if file exists if program was specified to extract info into md  file, otherwise set to False regardless of whether a md  file already exists or not
-    force_to_page_bottom = False
+    txt_exists, csv_exists, md_exists, force_to_page_bottom = determine_existing_files(file_name, txt, csv, markdown, all_video_data_in_memory)
     txt_videos:            Set[str] = set()
     csv_videos:            Set[str] = set()
     md_videos:             Set[str] = set()
     common_visited_videos: Set[str] = set()
-    current_condition = (txt, txt_exists, csv, csv_exists, markdown, md_exists)
-    update_conditions = set(
-        (
-            (True,  True,  True,  True,  True,  True),   # update txt,        txt exists,   update csv,        csv exists, update md,        md exists
-            (True,  True,  True,  True,  False, False),  # update txt,        txt exists,   update csv,        csv exists, do not update md, md DNE
-            (True,  True,  False, False, True,  True),   # update txt,        txt exists,   do not update csv, csv DNE,    update md,        md exists
-            (False, False, True,  True,  True,  True),   # do not update txt, txt DNE,      update csv,        csv exists, update md,        md exists
-            (True,  True,  False, False, False, False),  # update txt,        txt exists,   do not update csv, csv DNE,    do not update md, md DNE
-            (False, False, False, False, True,  True),   # do not update txt, txt DNE,      do not update csv, csv DNE,    update md,        md exists
-            (False, False, True,  True,  False, False),  # do not update txt, txt DNE,      update csv,        csv exists, do not update md, md DNE
-        )
-    )
-    if not all_video_data_in_memory and current_condition in update_conditions: log(f'Detected an existing file with the name {file_name} in this directory, checking for new videos to update {file_name}....', logging_locations)
-    else:                                                                       force_to_page_bottom = True
-    videos_list, txt_videos, csv_videos, md_videos, common_visited_videos = scroller.scroll_until_break(url, driver, scroll_pause_time, logging_locations, verify_page_bottom_n_times, force_to_page_bottom, file_name, txt_exists, csv_exists, md_exists)
+    if not force_to_page_bottom: log(f'Detected an existing file with the name {file_name} in this directory, checking for new videos to update {file_name}....', logging_locations)
+    if driver is not None:
+        videos_list, txt_videos, csv_videos, md_videos, common_visited_videos = scroller.scroll_until_break(url, driver, scroll_pause_time, logging_locations, verify_page_bottom_n_times, force_to_page_bottom, file_name, txt_exists, csv_exists, md_exists, prune_loaded_videos, save_page_source)
+    else:
+        common_visited_videos, txt_videos, csv_videos, md_videos = scroller.determine_common_visited_videos(file_name, txt_exists, csv_exists, md_exists)
+        if force_to_page_bottom: common_visited_videos.clear()
+        if feed_videos is not None:
+            # the channel's RSS feed already lists every new video, so there's no need to load the channel's videos page
+            log(f'Found every new video for {url} in the RSS feed for the channel...', logging_locations)
+            videos_list = feed_videos
+        elif page_source is not None:
+            # replay a saved page snapshot instead of scrolling through the page with a driver
+            log(f'Extracting video information from the page snapshot for {url}...', logging_locations)
+            videos_list = snapshot.extract_video_data(page_source)
+        else:
+            # request the videos directly from YouTube instead of scrolling through the page with a driver
+            log(f'Requesting video information for {url}...', logging_locations)
+            videos_list = fetcher.fetch_video_data(channel_page, common_visited_videos, http, logging_locations)
     if len(videos_list) == 0:
         log(common_message.no_videos_found, logging_locations)
         return None
@@ -87,7 +93,7 @@ def determine_action(
             file_visited_videos: Set[str],
         ) -> threading.Thread:
             newline = '' if file_type == 'csv' else None
-            if function == 'update_file': return threading.Thread(target=writer.update_file, args=(file_type, file_name, file_buffering, newline, csv_writer, now(), logging_locations, identifier, reverse_chronological, video_data, file_visited_videos, video_id_only))
+            if function == 'update_file': return threading.Thread(target=writer.update_file, args=(file_type, file_name, file_buffering, newline, csv_writer, now(), logging_locations, identifier, reverse_chronological, video_data, file_visited_videos, video_id_only, segment_size))
             else:                         return threading.Thread(target=writer.create_file, args=(file_type, file_name, file_buffering, newline, csv_writer, now(), logging_locations, identifier, reverse_chronological, video_data))
         if txt:
             if txt_exists: txt_thread = call('update_file', 'txt', txt_videos)
@@ -117,7 +123,7 @@ def determine_action(
             file_visited_videos: Set[str],
         ) -> None:
             newline = '' if file_type == 'csv' else None
-            if function == 'update_file': return writer.update_file(file_type, file_name, file_buffering, newline, csv_writer, now(), logging_locations, identifier, reverse_chronological, video_data, file_visited_videos, video_id_only)
+            if function == 'update_file': return writer.update_file(file_type, file_name, file_buffering, newline, csv_writer, now(), logging_locations, identifier, reverse_chronological, video_data, file_visited_videos, video_id_only, segment_size)
             else:                         return writer.create_file(file_type, file_name, file_buffering, newline, csv_writer, now(), logging_locations, identifier, reverse_chronological, video_data)
         if txt:
             if txt_exists: call('update_file', 'txt', txt_videos)
@@ -130,13 +136,39 @@ def determine_action(
             else:          call('create_file', 'md', set())
     return video_data
 
+def determine_existing_files(
+    file_name: str,
+    txt: bool,
+    csv: bool,
+    markdown: bool,
+    all_video_data_in_memory: bool,
+) -> Tuple[bool, bool, bool, bool]:
+    txt_exists = os.path.isfile(f'{file_name}.txt') if txt      else False # only check if file exists if program was specified to extract info into txt file, otherwise set to False regardless of whether a txt file already exists or not
+    csv_exists = os.path.isfile(f'{file_name}.csv') if csv      else False # only check if file exists if program was specified to extract info into csv file, otherwise set to False regardless of whether a csv file already exists or not
+    md_exists  = os.path.isfile(f'{file_name}.md')  if markdown else False # only check if file exists if program was specified to extract info into md  file, otherwise set to False regardless of whether a md  file already exists or not
+    current_condition = (txt, txt_exists, csv, csv_exists, markdown, md_exists)
+    update_conditions = set(
+        (
+            (True,  True,  True,  True,  True,  True),   # update txt,        txt exists,   update csv,        csv exists, update md,        md exists
+            (True,  True,  True,  True,  False, False),  # update txt,        txt exists,   update csv,        csv exists, do not update md, md DNE
+            (True,  True,  False, False, True,  True),   # update txt,        txt exists,   do not update csv, csv DNE,    update md,        md exists
+            (False, False, True,  True,  True,  True),   # do not update txt, txt DNE,      update csv,        csv exists, update md,        md exists
+            (True,  True,  False, False, False, False),  # update txt,        txt exists,   do not update csv, csv DNE,    do not update md, md DNE
+            (False, False, False, False, True,  True),   # do not update txt, txt DNE,      do not update csv, csv DNE,    update md,        md exists
+            (False, False, True,  True,  False, False),  # do not update txt, txt DNE,      update csv,        csv exists, do not update md, md DNE
+        )
+    )
+    force_to_page_bottom = all_video_data_in_memory or current_condition not in update_conditions
+    return txt_exists, csv_exists, md_exists, force_to_page_bottom
+
+
 def now(
 ) -> str:
     return datetime.datetime.now().isoformat().replace(':', '_').replace('.', '-')
 
 
 def load_video_data(
-    videos_list: List[WebElement],
+    videos_list: List[List[str]],
     common_visited_videos: Set[str],
     video_id_only: bool,
     reverse_chronological: bool,
@@ -148,17 +180,14 @@ def load_video_data(
     video_data: List[List[int | str]] = []
     video_number   = len(videos_list)
     videos_to_load = video_number
-    for videos_loaded, selenium_element in enumerate(videos_list, start=1):
-        video_title    = selenium_element.get_attribute('title')
+    videos_without_duration = 0
+    for videos_loaded, (video_title, video_url, video_duration) in enumerate(videos_list, start=1):
+        # each element of videos_list is the [title, href, duration] array
+        # returned by the EXTRACT_VIDEO_DATA_SCRIPT in scroller.py
         video_title    = normalize_whitespace(video_title)
-        video_url      = selenium_element.get_attribute('href').replace('shorts/', 'watch?v=').split('&pp')[0]
-        try:
-            video_duration = selenium_element.find_element_by_xpath('./../../../../div[@id="thumbnail"]/ytd-thumbnail/a[@id="thumbnail"]/div[@id="overlays"]/ytd-thumbnail-overlay-time-status-renderer/div/span[@class="style-scope ytd-thumbnail-overlay-time-status-renderer"]').get_attribute('innerHTML').split()[0]
-        except selenium.common.exceptions.NoSuchElementException:
-            # example error message:
-            # Message: Unable to locate element: ./../../../../div[@id="thumbnail"]/ytd-thumbnail/a[@id="thumbnail"]/div[@id="overlays"]/ytd-thumbnail-overlay-time-status-renderer/div/span[@class="style-scope ytd-thumbnail-overlay-time-status-renderer"]
-            video_duration = 'N/A'
-            log(f'Video {videos_loaded + 1} did not have a "Video Duration" field, storing as "N/A"...', logging_locations)
+        video_url      = scroller.format_video_url(video_url)
+        if video_duration == 'N/A':
+            videos_without_duration += 1
         if common_visited_videos and video_url in common_visited_videos:
             # file(s) already have the information for this video
             continue
@@ -166,6 +195,8 @@ def load_video_data(
         video_number  -= 1
         if videos_loaded % 250 == 0:
             log(f'Loaded {videos_loaded} videos into memory...', logging_locations)
+    if videos_without_duration:
+        log(f'{videos_without_duration} videos did not have a "Video Duration" field, stored the duration as "N/A" for these videos...', logging_locations)
     if reverse_chronological is False:
         # the video_data list is currently in reverse chronological order, so reverse video_data to place the video data in chronological order
         video_data.reverse()
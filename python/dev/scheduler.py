@@ -0,0 +1,235 @@
+import queue
+import threading
+
+from collections import (
+    deque,
+)
+from concurrent.futures import (
+    Future,
+)
+from io import (
+    TextIOWrapper,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+from save_thread_result import ThreadWithResult
+
+from .custom_logger import log
+
+
+T = TypeVar('T')
+
+
+class ChannelResult(NamedTuple):
+    '''
+    The result of scraping ONE channel with create_list_from().
+    '''
+    url:            str
+    channel_name:   Optional[str]                    # None if the channel could not be scraped
+    file_name:      Optional[str]                    # name of the output file(s) without the file extension(s)
+    video_data:     Optional[List[List[int | str]]]
+    error:          Optional[Exception]              # the exception that stopped the program from scraping the channel (None if the channel was scraped)
+    seconds:        Optional[float] = None           # how long it took to scrape the channel
+    attempts:       int             = 1              # how many times the program tried to scrape the channel (see RetryPolicy)
+    new_videos:     int             = 0              # how many videos the program found that were not in the channel's files yet
+
+    @property
+    def succeeded(
+        self,
+    ) -> bool:
+        return self.error is None
+
+
+class ChannelScheduler:
+    '''
+    Runs `number_of_threads` workers that take channels from the shared `urls` deque until every channel is scraped.
+    Every url has a Future that is resolved with a ChannelResult as soon as the channel is finished,
+    and a worker that stops (because the channel it was scraping failed) is replaced with a new worker right away,
+    so the program does not poll the workers to find out when a channel is finished or when a thread is free.
+    If `urls` is not a deque (for example, urls leased from a JobQueue), the channels are not known ahead of time,
+    so wait() returns the results of the channels the workers finished in the order they finished.
+    Use as_completed() instead of wait() to get every result as soon as its channel is finished.
+    An error raised by a worker (for example, the driver could not be launched) stops that worker, and is raised by as_completed() and wait()
+    in the caller's thread once every worker stopped and every channel that was not scraped has a failed ChannelResult.
+    '''
+    def __init__(
+        self,
+        urls: deque[str],
+        number_of_threads: int,
+        run_worker: Callable[[Callable[[str, ChannelResult], None]], Any],
+    ) -> None:
+        # `run_worker` scrapes channels from `urls` until `urls` is empty,
+        # and calls the function it is given with the url and ChannelResult of every channel it finishes
+        self.urls                                      = urls
+        self.number_of_threads                         = max(1, int(number_of_threads))
+        self.run_worker                                = run_worker
+        self.lock                                      = threading.Lock()
+        self.finished                                  = threading.Event()
+        self.workers:      Set[threading.Thread]       = set()
+        self.futures:      List[Future]                = []
+        self.pending_jobs: Dict[str, deque[int]]       = {}          # the index in self.futures of every channel that is not finished yet
+        self.completed:    queue.Queue[Optional[int]]  = queue.Queue() # the index of every finished channel, and None once every worker stopped
+        self.error:        Optional[Exception]         = None          # the first error raised by a worker
+        for url in urls if isinstance(urls, deque) else ():
+            self.pending_jobs.setdefault(url, deque()).append(len(self.futures)) # the same url can be in the file more than once
+            self.futures.append(Future())
+
+    def start(
+        self,
+    ) -> None:
+        with self.lock:
+            for _ in range(min(self.number_of_threads, len(self.urls))):
+                self.start_worker()
+            if not self.workers:
+                self.finish()
+
+    def start_worker(
+        self,
+    ) -> None:
+        # NOTE only call this while holding self.lock
+        thread = ThreadWithResult(target=self.work)
+        self.workers.add(thread)
+        thread.start()
+
+    def work(
+        self,
+    ) -> Any:
+        finished_channels = [0]
+        stopped_by_error  = True
+        def finish_channel(
+            url: str,
+            result: ChannelResult,
+        ) -> None:
+            finished_channels[0] += 1
+            self.finish_channel(url, result)
+        try:
+            worker_result    = self.run_worker(finish_channel)
+            stopped_by_error = False
+            return worker_result
+        except Exception as error_message: # pylint: disable=broad-except
+            with self.lock:
+                if self.error is None: self.error = error_message # raised by as_completed() in the caller's thread
+            return None
+        finally:
+            # a worker that stops before finishing ANY channel (or that raised an error on the first channel it scraped) failed for a reason
+            # that has nothing to do with the channel (for example, the driver could not be launched), so replacing it would only fail again
+            self.finish_worker(threading.current_thread(), refill=finished_channels[0] > int(stopped_by_error))
+
+    def finish_worker(
+        self,
+        thread: threading.Thread,
+        refill: bool,
+    ) -> None:
+        with self.lock:
+            self.workers.discard(thread)
+            if refill and self.urls and len(self.workers) < self.number_of_threads:
+                self.start_worker() # refill the slot right away
+            elif not self.workers:
+                self.finish()
+
+    def finish(
+        self,
+    ) -> None:
+        # NOTE only call this while holding self.lock
+        self.finished.set()
+        self.completed.put(None) # wakes up as_completed() right away
+
+    def finish_channel(
+        self,
+        url: str,
+        result: ChannelResult,
+    ) -> None:
+        with self.lock:
+            if self.pending_jobs.get(url):
+                index = self.pending_jobs[url].popleft()
+            else: # the url was not known ahead of time
+                index = len(self.futures)
+                self.futures.append(Future())
+        self.futures[index].set_result(result)
+        self.completed.put(index)
+
+    def as_completed(
+        self,
+        logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+        log_every_s: float = 10,
+    ) -> Generator[Tuple[int, ChannelResult], None, None]:
+        # yields the index in self.futures and the ChannelResult of every channel as soon as the channel is finished,
+        # and returns as soon as the last worker stops (the timeout is only used to log which threads are still running)
+        while True:
+            try:
+                index = self.completed.get(timeout=log_every_s)
+            except queue.Empty:
+                with self.lock:
+                    running_threads = [thread.name for thread in self.workers]
+                log(f'Still running {running_threads} ...', logging_locations)
+                continue
+            if index is None:
+                break
+            yield index, self.futures[index].result()
+        # the futures of the channels left in `urls` are never resolved by a worker if every worker stopped before finishing a channel
+        error = self.error if self.error is not None else RuntimeError('every thread stopped before scraping the channel')
+        for url, indexes in self.pending_jobs.items():
+            for index in indexes:
+                self.futures[index].set_result(ChannelResult(url, None, None, None, error, attempts=0))
+                yield index, self.futures[index].result()
+        if self.error is not None:
+            raise self.error
+
+    def wait(
+        self,
+        logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+        log_every_s: float = 10,
+    ) -> List[ChannelResult]:
+        for _ in self.as_completed(logging_locations, log_every_s):
+            pass
+        return [future.result() for future in self.futures]
+
+
+def merge_streams(
+    *streams: Iterator[T],
+) -> Generator[T, None, None]:
+    # consumes every stream in its own thread, and yields every item as soon as any of the streams produces it,
+    # then raises the first error raised by a stream once every stream stopped (so the results of the other streams are not lost)
+    if len(streams) == 1:
+        yield from streams[0]
+        return
+    items: queue.Queue[Optional[Tuple[bool, Any]]] = queue.Queue()
+    def consume(
+        stream: Iterator[T],
+    ) -> None:
+        try:
+            for item in stream:
+                items.put((True, item))
+        except Exception as error_message: # pylint: disable=broad-except
+            items.put((False, error_message))
+        finally:
+            items.put(None)
+    for stream in streams:
+        threading.Thread(target=consume, args=(stream,)).start()
+    running_streams = len(streams)
+    error           = None
+    while running_streams:
+        item = items.get()
+        if item is None:
+            running_streams -= 1
+            continue
+        succeeded, value = item
+        if succeeded:
+            yield value
+        elif error is None:
+            error = value
+    if error is not None:
+        raise error
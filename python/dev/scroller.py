@@ -2,7 +2,6 @@ from io import (
     TextIOWrapper,
 )
 from typing import (
-    Callable,
     List,
     Set,
     TextIO,
@@ -14,9 +13,109 @@ import re
 import time
 
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
 
 from .custom_logger import log, log_time_taken
+from .snapshot      import save_page_source as save_page_source_to_file
+from .segments      import load_segment_index
+
+
+# extract the [title, href, duration] information for every loaded video in ONE WebDriver round trip
+# instead of calling get_attribute() and find_element_by_xpath() for every single video element
+# (each of those calls is its own HTTP request to the driver, so the per-element approach
+# costs ~3 round trips per video, which adds up quickly for channels with thousands of videos)
+# the durations are looked up with ONE query over the entire grid that maps each video to its duration,
+# instead of evaluating a deep relative path from every video (which fails for every video without a duration)
+# NOTE the duration is "N/A" if the video does not have a "Video Duration" field
+EXTRACT_VIDEO_INFORMATION_FUNCTION = '''
+function extract_video_information(videos) {
+    var durations = new Map();
+    document.querySelectorAll("ytd-rich-grid-media ytd-thumbnail-overlay-time-status-renderer span.ytd-thumbnail-overlay-time-status-renderer").forEach(function (duration) {
+        var video = duration.closest("ytd-rich-grid-media");
+        if (!durations.has(video)) durations.set(video, duration.textContent.trim().split(/\\s+/)[0] || "N/A");
+    });
+    return videos.map(function (video) {
+        var link = video.querySelector("a#video-title-link");
+        if (link === null) return null;
+        return [link.getAttribute("title"), link.href, durations.has(video) ? durations.get(video) : "N/A"];
+    }).filter(function (video_information) { return video_information !== null; });
+}
+'''
+EXTRACT_VIDEO_DATA_SCRIPT = EXTRACT_VIDEO_INFORMATION_FUNCTION + '''
+return extract_video_information(Array.from(document.querySelectorAll("ytd-rich-grid-media")));
+'''
+
+
+# extract the videos that loaded since the last harvest, then REMOVE the harvested videos from the page
+# (except for the last few, so YouTube still has an anchor to load the next continuation batch of videos after)
+# so the browser does not need to keep thousands of video elements in memory when scraping large channels
+#   -> arguments[0] is the number of harvested videos to keep at the bottom of the page
+#   -> returns [[[title, href, duration], ...], number_of_videos_still_on_the_page]
+HARVEST_AND_PRUNE_VIDEOS_SCRIPT = EXTRACT_VIDEO_INFORMATION_FUNCTION + '''
+var videos_to_keep = arguments[0];
+var new_videos     = Array.from(document.querySelectorAll("ytd-rich-grid-media:not([yt-videos-list-harvested])"));
+new_videos.forEach(function (video) { video.setAttribute("yt-videos-list-harvested", ""); });
+var harvested      = extract_video_information(new_videos);
+var loaded_items = document.querySelectorAll("ytd-rich-item-renderer");
+for (var index = 0; index < loaded_items.length - videos_to_keep; index++) {
+    loaded_items[index].remove();
+}
+return [harvested, document.getElementsByTagName("ytd-rich-grid-media").length];
+'''
+VIDEOS_TO_KEEP_ON_PAGE = 30 # about one continuation batch of videos
+
+
+# store the videos already written to the pre-existing file(s) inside the page ONCE,
+# so checking for pre-existing videos after every scroll only needs to look at the newly loaded videos
+# (instead of sending every loaded video element back to the program after every scroll)
+STORE_VISITED_VIDEOS_SCRIPT = 'window.yt_videos_list_visited_videos = new Set(arguments[0]);'
+#   -> arguments[0] is the number of videos that were already checked
+#   -> returns true if any video loaded after the already checked videos is a pre-existing video
+FOUND_VISITED_VIDEO_SCRIPT = '''
+var checked_videos = arguments[0];
+var videos         = document.getElementsByTagName("ytd-rich-grid-media");
+for (var index = checked_videos; index < videos.length; index++) {
+    var link = videos[index].querySelector("a#video-title-link");
+    if (link !== null && window.yt_videos_list_visited_videos.has(link.href.replace("shorts/", "watch?v=").split("&pp")[0])) return true;
+}
+return false;
+'''
+
+
+# scroll down and wait INSIDE the page until the continuation batch of videos is rendered,
+# instead of always sleeping for scroll_pause_time seconds after every scroll
+#   -> arguments[0] is the number of videos currently on the page
+#   -> arguments[1] is the upper timeout (in milliseconds) to wait for new videos to load
+#   -> the callback returns [number_of_videos_on_page, page_has_continuation]
+#     -> as soon as the grid grows,
+#     -> OR with the unchanged number of videos if no new videos loaded before the timeout
+#        (only a quarter of the timeout if the grid does not have a ytd-continuation-item-renderer, since YouTube removes the continuation spinner
+#        after loading the last batch of videos - but YouTube also removes and re-inserts the spinner between batches, so a missing spinner
+#        only shortens the wait, and verify_reached_page_bottom() still needs the same number of videos several times in a row)
+# NOTE getElementsByTagName() returns a LIVE HTMLCollection, so reading .length on every
+# mutation does not need to re-query the entire page
+WAIT_FOR_NEW_VIDEOS_SCRIPT = '''
+var current_count = arguments[0];
+var timeout       = arguments[1];
+var callback      = arguments[arguments.length - 1];
+var videos        = document.getElementsByTagName("ytd-rich-grid-media");
+var continuations = (document.querySelector("ytd-rich-grid-renderer") || document).getElementsByTagName("ytd-continuation-item-renderer");
+var observer      = null;
+var timer         = null;
+function finish() {
+    if (observer !== null) observer.disconnect();
+    if (timer    !== null) clearTimeout(timer);
+    callback([videos.length, continuations.length > 0]);
+}
+function finished_loading() { return videos.length > current_count; }
+window.scrollBy(0, 50000);
+if (finished_loading()) {
+    finish();
+} else {
+    observer = new MutationObserver(function () { if (finished_loading()) finish(); });
+    observer.observe(document.querySelector("ytd-app") || document.body, {childList: true, subtree: true});
+    timer    = setTimeout(finish, continuations.length > 0 ? timeout : timeout / 4);
+}
+'''
 
 
 def scroll_until_break(
@@ -30,29 +129,50 @@ def scroll_until_break(
     txt_exists: bool,
     csv_exists: bool,
     md_exists: bool,
-) -> Tuple[List[WebElement], Set[str], Set[str], Set[str], Set[str]]:
+    prune_loaded_videos: bool,
+    save_page_source: bool,
+) -> Tuple[List[List[str]], Set[str], Set[str], Set[str], Set[str]]:
     visited_videos, stored_in_txt, stored_in_csv, stored_in_md = determine_common_visited_videos(file_name, txt_exists, csv_exists, md_exists)
     if force_to_page_bottom: visited_videos.clear()                                  # clear any pre-existing video information if there are pre-existing files (will already be empty if there are no pre-existing files)
     else:                    verify_page_bottom_n_times       *= 3                   # it is VERY unlikely that a pre-existing file exists and the program reaches the end of the page before finding ANY pre-existing vides, so increase value for break condition by 3 to make sure this is actually the case and not a false positive
-    scrolling_cpu_start_time                                   = time.perf_counter() # timer stops in save_elements_to_list() function
-    scrolling_real_start_time                                  = time.time()         # this timer also stops in save_elements_to_list() function
+    scrolling_cpu_start_time                                   = time.perf_counter()
+    scrolling_real_start_time                                  = time.time()
     current_elements_count                                     = None
     new_elements_count                                         = count_videos_on_page(driver)
     num_times_elements_count_same                              = -1
     found_old_videos                                           = False
-    url_of_last_loaded_video_on_page: Callable[[], str]                      = lambda: driver.find_elements_by_xpath('//*[@class="style-scope ytd-rich-grid-media"]/a[@id="video-title-link"]')[-1].get_attribute('href').replace('shorts/', 'watch?v=').split('&pp')[0]
+    harvested_videos: List[List[str]]                   = []                  # only used when prune_loaded_videos is True
+    videos_on_page                                             = new_elements_count
+    checked_videos                                             = 0                   # number of videos already checked for pre-existing videos
+    driver.set_script_timeout(scroll_pause_time + 10)                              # make sure the driver does not time out WAIT_FOR_NEW_VIDEOS_SCRIPT before the script times out by itself
+    if visited_videos and not prune_loaded_videos:
+        driver.execute_script(STORE_VISITED_VIDEOS_SCRIPT, list(visited_videos))
     if new_elements_count != 0:
-        # ensure page has videos, otherwise url_of_last_loaded_video_on_page() breaks because indexing is not possible on an empty array
+        # ensure page has videos
         while found_old_videos is False and num_times_elements_count_same < verify_page_bottom_n_times:
             current_elements_count = new_elements_count
-            scroll_down(driver, scroll_pause_time, logging_locations)
-            new_elements_count            = count_videos_on_page(driver)
-            num_times_elements_count_same = verify_reached_page_bottom(new_elements_count, current_elements_count, num_times_elements_count_same, verify_page_bottom_n_times, logging_locations)
-            if url_of_last_loaded_video_on_page() in visited_videos:
-                # if force_to_page_bottom is True, visited_videos will be an empty set and this conditional will never execute
-                found_old_videos = True
-    found_elements = save_elements_to_list(driver, scrolling_cpu_start_time, scrolling_real_start_time, url, logging_locations)
-    return found_elements, stored_in_txt, stored_in_csv, stored_in_md, visited_videos
+            videos_on_page, has_continuation = scroll_down(driver, scroll_pause_time, logging_locations, videos_on_page)
+            if prune_loaded_videos:
+                # the number of videos on the page stays roughly the same since harvested videos are removed from the page,
+                # so use the number of harvested videos to determine whether or not the program reached the page bottom
+                new_videos, videos_on_page = harvest_and_prune_videos(driver)
+                harvested_videos.extend(new_videos)
+                new_elements_count         = len(harvested_videos)
+                found_old_videos           = any(format_video_url(video_url) in visited_videos for _, video_url, _ in new_videos)
+            else:
+                new_elements_count         = videos_on_page
+                # if force_to_page_bottom is True, visited_videos will be an empty set and this never runs
+                found_old_videos           = bool(visited_videos) and driver.execute_script(FOUND_VISITED_VIDEO_SCRIPT, checked_videos)
+                checked_videos             = new_elements_count
+            num_times_elements_count_same = verify_reached_page_bottom(new_elements_count, current_elements_count, num_times_elements_count_same, verify_page_bottom_n_times, has_continuation, logging_locations)
+    if prune_loaded_videos: found_videos = harvested_videos + harvest_and_prune_videos(driver)[0]
+    else:                   found_videos = save_elements_to_list(driver)
+    log_time_taken(scrolling_cpu_start_time, scrolling_real_start_time, 'It took ', f' to find {len(found_videos)} videos from {url}\n', logging_locations)
+    if save_page_source and file_name:
+        # NOTE the snapshot will not contain the videos removed from the page when prune_loaded_videos is True
+        page_source_file_name = save_page_source_to_file(driver.page_source, file_name)
+        log(f'Saved the page source to {page_source_file_name}', logging_locations)
+    return found_videos, stored_in_txt, stored_in_csv, stored_in_md, visited_videos
 
 
 
@@ -92,13 +212,14 @@ def store_already_written_videos(
                 row[3]                      # 'Video Number', 'Video Title', 'Video Duration', ('Video URL'|'Video ID'), ...
                 for row in file_content
             )
+        seen_videos.update(load_segment_index(file_name, file_type)) # the videos moved to the segments of the file (see segments.py) are only listed in the index
         if seen_videos:
             # the set exists
             # check to see if the entire video URL was stored or just the video ID
             random_video = seen_videos.pop()
             if 'https://www.youtube.com/watch?v=' not in random_video:
                 # this file stored only the video IDs, so add the rest of the URL to
-                # the video ID so url_of_last_loaded_video_on_page() lambda function in
+                # the video ID so the FOUND_VISITED_VIDEO_SCRIPT in
                 # scroll_until_break() can match the 'href' of the videos properly
                 formatted_urls = set()
                 random_video   = 'https://www.youtube.com/watch?v=' + random_video
@@ -116,6 +237,11 @@ def store_already_written_videos(
 
 
 
+def format_video_url(
+    video_url: str,
+) -> str:
+    return video_url.replace('shorts/', 'watch?v=').split('&pp')[0]
+
 def count_videos_on_page(
     driver: WebDriver,
 ) -> int:
@@ -125,23 +251,29 @@ def scroll_down(
     driver: WebDriver,
     scroll_pause_time: float,
     logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
-) -> None:
-    driver.execute_script('window.scrollBy(0, 50000);')
-    time.sleep(scroll_pause_time)
-    new_elements_count = count_videos_on_page(driver)
+    current_elements_count: int,
+) -> Tuple[int, bool]:
+    # scroll_pause_time is the MAXIMUM amount of time to wait for new videos to load,
+    # so this returns as soon as the next batch of videos is rendered on the page
+    new_elements_count, has_continuation = driver.execute_async_script(WAIT_FOR_NEW_VIDEOS_SCRIPT, current_elements_count, int(scroll_pause_time * 1000))
     log(f'Found {new_elements_count} videos...', logging_locations)
+    return new_elements_count, has_continuation
 
 def verify_reached_page_bottom(
     new_elements_count: int,
     current_elements_count: int,
     num_times_elements_count_same: int,
     verify_page_bottom_n_times: int,
+    has_continuation: bool,
     logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]
 ) -> int:
+    # a missing continuation spinner is only a hint that there are no more videos to load (YouTube also removes the spinner for a moment between batches),
+    # so the number of videos needs to stay the same after scrolling `verify_page_bottom_n_times` times in a row either way
     if new_elements_count == current_elements_count:
         num_times_elements_count_same += 1
         times = 'time' if num_times_elements_count_same == 1 else 'times'
-        log(f'Found {new_elements_count} videos. Verified this is the page bottom {num_times_elements_count_same} {times}. Need to verify {verify_page_bottom_n_times} {times} before writing to file...', logging_locations)
+        hint  = ' (no more videos to load)' if has_continuation is False else ''
+        log(f'Found {new_elements_count} videos{hint}. Verified this is the page bottom {num_times_elements_count_same} {times}. Need to verify {verify_page_bottom_n_times} {times} before writing to file...', logging_locations)
         if num_times_elements_count_same == verify_page_bottom_n_times:
             log('Reached end of page!', logging_locations)
     else:
@@ -150,11 +282,11 @@ def verify_reached_page_bottom(
 
 def save_elements_to_list(
     driver: WebDriver,
-    scrolling_cpu_start_time: float,
-    scrolling_real_start_time: float,
-    url: str,
-    logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
-) -> List[WebElement]:
-    elements   = driver.find_elements_by_xpath('//*[@class="style-scope ytd-rich-grid-media"]/a[@id="video-title-link"]')
-    log_time_taken(scrolling_cpu_start_time, scrolling_real_start_time, 'It took ', f' to find {len(elements)} videos from {url}\n', logging_locations)
-    return elements
+) -> List[List[str]]:
+    return driver.execute_script(EXTRACT_VIDEO_DATA_SCRIPT) # [[title, href, duration], ...] for every video on the page
+
+def harvest_and_prune_videos(
+    driver: WebDriver,
+) -> Tuple[List[List[str]], int]:
+    new_videos, videos_on_page = driver.execute_script(HARVEST_AND_PRUNE_VIDEOS_SCRIPT, VIDEOS_TO_KEEP_ON_PAGE)
+    return new_videos, videos_on_page
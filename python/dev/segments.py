@@ -0,0 +1,46 @@
+import os
+
+from typing import (
+    List,
+    Set,
+)
+
+
+# when the `segment_size` attribute is set, the videos of a reverse chronological file are split between
+#     {file_name}.{extension}                            - the newest videos in the channel (between `segment_size` and 2 * `segment_size` videos)
+#     {file_name}.segments/{segment_number}.{extension}  - every older video, where segment 000001 has the oldest videos
+#     {file_name}.segments/index.{extension}.txt         - the Video URL (or Video ID) of every video in the numbered segments, one per line
+# every video is only written to ONE of these files (so the Watched, Watch again later, and Notes of every video can be edited where the video is),
+# and an update only parses and rewrites the newest videos, and reads the index instead of parsing the segments to find the videos already written
+
+def determine_segments_directory(
+    file_name: str,
+) -> str:
+    return f'{file_name}.segments'
+
+def determine_index_file(
+    file_name: str,
+    file_type: str,
+) -> str:
+    return os.path.join(determine_segments_directory(file_name), f'index.{file_type}.txt')
+
+def list_segments(
+    file_name: str,
+    file_type: str,
+) -> List[str]:
+    # returns the path of every numbered segment of the file, from the newest segment to the oldest segment
+    segments_directory = determine_segments_directory(file_name)
+    if not os.path.isdir(segments_directory):
+        return []
+    segments = sorted((segment for segment in os.listdir(segments_directory) if segment.endswith(f'.{file_type}') and segment.split('.')[0].isdigit()), reverse=True)
+    return [os.path.join(segments_directory, segment) for segment in segments]
+
+def load_segment_index(
+    file_name: str,
+    file_type: str,
+) -> Set[str]:
+    index_file_name = determine_index_file(file_name, file_type)
+    if not os.path.exists(index_file_name):
+        return set()
+    with open(index_file_name, mode='r', encoding='utf-8') as index_file:
+        return {line.strip() for line in index_file if line.strip()}
@@ -0,0 +1,41 @@
+import hashlib
+
+from collections import (
+    deque,
+)
+from typing import (
+    Iterable,
+)
+
+from .logic import parse_url
+
+
+def normalize_url(
+    url: str,
+) -> str:
+    # different urls for the same channel (http or https, with or without www., with or without /videos at the end) normalize to the same string
+    try:
+        _, channel_type, channel_id = parse_url(url.strip())
+    except IndexError: # not a YouTube url, so the program fails to scrape it anyway (but it still needs a shard)
+        return url.strip()
+    if channel_type.startswith('@'):
+        return channel_type.lower() # youtube.com/@handle/videos - handles are not case sensitive, and the part after the handle is not an id
+    if channel_id in ('videos', ''):
+        return channel_type         # youtube.com/teded, youtube.com/teded/, and youtube.com/teded/videos (same as determine_file_name() with file_name='id')
+    return f'{channel_type.lower()}/{channel_id}'
+
+def determine_shard(
+    url: str,
+    shard_count: int,
+) -> int:
+    # uses sha256 instead of hash(), since hash() of a string changes every time python starts
+    digest = hashlib.sha256(normalize_url(url).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count
+
+def select_shard(
+    urls: Iterable[str],
+    shard_index: int,
+    shard_count: int,
+) -> deque[str]:
+    # every url stays in the same shard when other urls are added to (or removed from) the file, so no node needs to know what the other nodes scrape
+    return deque(url for url in urls if determine_shard(url, shard_count) == shard_index)
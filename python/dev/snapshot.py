@@ -0,0 +1,160 @@
+from html.parser import HTMLParser
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+
+try:
+    import lxml.html # parses snapshots much faster than html.parser, but is not required
+except ImportError:
+    lxml = None
+
+
+BASE_URL                   = 'https://www.youtube.com'
+DURATION_CLASS             = 'ytd-thumbnail-overlay-time-status-renderer'
+CHANNEL_NAME_CLASSES       = ('style-scope ytd-channel-name', 'style-scope ytd-topic-channel-details-renderer')
+
+
+def read_page_source(
+    path_to_page_source: str,
+) -> str:
+    with open(path_to_page_source, mode='r', encoding='utf-8') as page_source_file:
+        return page_source_file.read()
+
+def save_page_source(
+    page_source: str,
+    file_name: str,
+) -> str:
+    page_source_file_name = f'{file_name}.html'
+    with open(page_source_file_name, mode='w', encoding='utf-8') as page_source_file:
+        page_source_file.write(page_source)
+    return page_source_file_name
+
+
+def extract_video_data(
+    page_source: str,
+) -> List[List[str]]:
+    # returns the same [[title, href, duration], ...] arrays that the EXTRACT_VIDEO_DATA_SCRIPT in scroller.py returns
+    if lxml is not None: return extract_video_data_with_lxml(page_source)
+    else:                return extract_video_data_with_html_parser(page_source)[0]
+
+def extract_channel_information(
+    page_source: str,
+) -> Tuple[str, Optional[str]]:
+    # returns the channel name and the canonical url for the channel (if the snapshot has a canonical url)
+    if lxml is not None:
+        document      = lxml.html.fromstring(page_source)
+        channel_names = [
+            heading.text_content().strip()
+            for channel_name_class in CHANNEL_NAME_CLASSES
+            for heading in document.xpath(f'//yt-formatted-string[@class="{channel_name_class}"]')
+        ]
+        canonical_urls = document.xpath('//link[@rel="canonical"]/@href')
+        channel_name   = next((name for name in channel_names if name), '')
+        canonical_url  = canonical_urls[0] if canonical_urls else None
+        return channel_name, canonical_url
+    _, channel_name, canonical_url = extract_video_data_with_html_parser(page_source)
+    return channel_name, canonical_url
+
+
+def extract_video_data_with_lxml(
+    page_source: str,
+) -> List[List[str]]:
+    document = lxml.html.fromstring(page_source)
+    videos   = []
+    for video in document.iter('ytd-rich-grid-media'):
+        links = video.xpath('.//a[@id="video-title-link"]')
+        if not links:
+            continue
+        durations = video.xpath(f'.//ytd-thumbnail-overlay-time-status-renderer//span[contains(@class, "{DURATION_CLASS}")]')
+        duration  = durations[0].text_content().split() if durations else []
+        videos.append([links[0].get('title', ''), format_href(links[0].get('href', '')), duration[0] if duration else 'N/A'])
+    return videos
+
+def extract_video_data_with_html_parser(
+    page_source: str,
+) -> Tuple[List[List[str]], str, Optional[str]]:
+    parser = SnapshotParser()
+    parser.feed(page_source)
+    parser.close()
+    return parser.videos, parser.channel_name, parser.canonical_url
+
+def format_href(
+    href: str,
+) -> str:
+    # the page source stores relative links (/watch?v=ElevenChars), but the EXTRACT_VIDEO_DATA_SCRIPT returns absolute links
+    return f'{BASE_URL}{href}' if href.startswith('/') else href
+
+
+class SnapshotParser(HTMLParser):
+    '''
+    Fallback parser used to extract the video information from a page snapshot when lxml is not installed.
+    This only keeps track of the elements the program needs (every other element is ignored),
+    so it does not need to build a full document tree.
+    '''
+    def __init__(
+        self,
+    ) -> None:
+        super().__init__(convert_charrefs=True)
+        self.videos: List[List[str]]            = []
+        self.channel_name                       = ''
+        self.canonical_url: Optional[str]       = None
+        self.video_depth                        = 0        # number of open ytd-rich-grid-media elements
+        self.duration_depth                     = 0        # number of open ytd-thumbnail-overlay-time-status-renderer elements
+        self.current_video: Optional[List[str]] = None     # [title, href, duration] of the video currently being parsed
+        self.duration_text: Optional[List[str]] = None     # text inside the duration span currently being parsed
+        self.channel_name_text: Optional[List[str]] = None # text inside the channel name heading currently being parsed
+        self.channel_name_depth                 = 0
+
+    def handle_starttag(
+        self,
+        tag: str,
+        attrs: List[Tuple[str, Optional[str]]],
+    ) -> None:
+        attributes = dict(attrs)
+        if tag == 'ytd-rich-grid-media':
+            self.video_depth += 1
+            if self.video_depth == 1: self.current_video = [None, None, 'N/A']
+        elif tag == 'ytd-thumbnail-overlay-time-status-renderer':
+            self.duration_depth += 1
+        elif tag == 'a' and self.current_video is not None and attributes.get('id') == 'video-title-link' and self.current_video[1] is None:
+            self.current_video[0] = attributes.get('title') or ''
+            self.current_video[1] = format_href(attributes.get('href') or '')
+        elif tag == 'span' and self.duration_depth and self.current_video is not None and DURATION_CLASS in (attributes.get('class') or '') and self.current_video[2] == 'N/A':
+            self.duration_text = []
+        elif tag == 'yt-formatted-string' and not self.channel_name and attributes.get('class') in CHANNEL_NAME_CLASSES:
+            self.channel_name_depth += 1
+            self.channel_name_text   = []
+        elif tag == 'yt-formatted-string' and self.channel_name_text is not None:
+            self.channel_name_depth += 1
+        elif tag == 'link' and attributes.get('rel') == 'canonical' and self.canonical_url is None:
+            self.canonical_url = attributes.get('href')
+
+    def handle_endtag(
+        self,
+        tag: str,
+    ) -> None:
+        if tag == 'ytd-rich-grid-media' and self.video_depth:
+            self.video_depth -= 1
+            if self.video_depth == 0 and self.current_video is not None:
+                if self.current_video[1] is not None: self.videos.append(self.current_video)
+                self.current_video = None
+        elif tag == 'ytd-thumbnail-overlay-time-status-renderer' and self.duration_depth:
+            self.duration_depth -= 1
+        elif tag == 'span' and self.duration_text is not None:
+            duration           = ''.join(self.duration_text).split()
+            self.current_video[2] = duration[0] if duration else 'N/A'
+            self.duration_text = None
+        elif tag == 'yt-formatted-string' and self.channel_name_text is not None:
+            self.channel_name_depth -= 1
+            if self.channel_name_depth == 0:
+                self.channel_name      = ''.join(self.channel_name_text).strip()
+                self.channel_name_text = None
+
+    def handle_data(
+        self,
+        data: str,
+    ) -> None:
+        if self.duration_text     is not None: self.duration_text.append(data)
+        if self.channel_name_text is not None: self.channel_name_text.append(data)
@@ -6,6 +6,7 @@ from io import (
     TextIOWrapper,
 )
 from typing import (
+    Iterator,
     List,
     Optional,
     Set,
@@ -15,9 +16,11 @@ from typing import (
 
 from .custom_logger import log, log_write_information
 from .scroller      import store_already_written_videos
+from .segments      import determine_index_file, determine_segments_directory, list_segments
 
 
-PADDING = 39
+PADDING         = 39
+ENTRY_SEPARATOR = '*' * 75 # the last line of every video in a txt or md file (followed by an empty line in md files)
 
 
 @log_write_information
@@ -42,6 +45,7 @@ def create_file(
         new_videos = total_videos = len(video_data)
         create_entries(file_type, temp_file, csv_writer, logging_locations, identifier, video_data, reverse_chronological, total_videos, number_of_existing_videos=0, file_visited_videos=set())
     log('Closed'.ljust(PADDING) + f'{temp_file_name}', logging_locations)
+    remove_segments(file_name, file_type, logging_locations) # the new file has every video, so older segments of the file would only duplicate videos
     videos = format_video_plurality(new_videos)
     log('Finished writing to'.ljust(PADDING)               + f'{temp_file_name}', logging_locations)
     log(f'{new_videos} {videos} written to'.ljust(PADDING) + f'{temp_file_name}', logging_locations)
@@ -72,19 +76,22 @@ def update_file(
     video_data: List[List[int | str]],
     file_visited_videos: Set[str],
     video_id_only: bool,
+    segment_size: Optional[int] = None,
     ) -> Tuple[str, int, int, bool, Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]]:
     if not file_visited_videos: file_visited_videos = store_already_written_videos(file_name, file_type)
     file_visited_videos                             = format_visited_videos_for_id(file_visited_videos, video_id_only, logging_locations)
-    temp_file_name = f'temp_{file_name}_{timestamp}.{file_type}'
-    original_file_name = f'{file_name}.{file_type}'
+    temp_file_name     = f'temp_{file_name}_{timestamp}.{file_type}'
+    original_file_name = f'{file_name}.{file_type}' # only has the newest videos if older videos were moved to segments, see segments.py
     with open(original_file_name, mode='r+', newline=newline, encoding='utf-8',  buffering=file_buffering) as old_file, open(temp_file_name, mode='w+', newline=newline, encoding='utf-8',  buffering=file_buffering) as temp_file:
         if file_type == 'csv':
-            number_of_existing_videos = int(max(re.findall('^(\d+)?,', old_file.read(), re.M), key=lambda i: int(i)))
+            existing_video_numbers    = re.findall('^(\d+)?,', old_file.read(), re.M)
+            number_of_existing_videos = int(max(existing_video_numbers, key=lambda i: int(i)))
             fieldnames                = ['Video Number', 'Video Title', 'Video Duration', identifier, 'Watched', 'Watch again later', 'Notes']
             csv_writer                = csv.DictWriter(temp_file, fieldnames=fieldnames)
             if reverse_chronological: csv_writer.writeheader() # only write header when reverse_chronological=True since the pre-existing csv file will already contain the header when reverse_chronological=False (and the new videos will be added to the bottom of the pre-existing file)
         else:
-            number_of_existing_videos = int(max(re.findall('^(?:### )?Video Number:\s*(\d+)', old_file.read(), re.M), key=lambda i: int(i)))
+            existing_video_numbers    = re.findall('^(?:### )?Video Number:\s*(\d+)', old_file.read(), re.M)
+            number_of_existing_videos = int(max(existing_video_numbers, key=lambda i: int(i)))
         new_videos   = find_number_of_new_videos(video_data, file_visited_videos)
         total_videos = number_of_existing_videos + new_videos
         videos       = format_video_plurality(new_videos)
@@ -118,11 +125,103 @@ def update_file(
         log('Successfully removed'.ljust(PADDING) + f'{temp_file_name}', logging_locations)
     else:
         # if the reverse_chronological flag was set to True: rename temp_{file_name} to {file_name}.{extension} since program appends old info from the original file to the end of new data in the temp file
+        if segment_size is not None and len(existing_video_numbers) + new_videos > 2 * segment_size:
+            split_segment(temp_file_name, file_name, file_type, file_buffering, newline, segment_size, logging_locations) # keeps the next updates from rewriting the older videos again
         log(f'Successfully completed write, renaming {temp_file_name} to {original_file_name} since {temp_file_name} now has all content', logging_locations)
         os.replace(temp_file_name, original_file_name)
         log('Successfully renamed'.ljust(PADDING) + f'{temp_file_name} to {original_file_name}', logging_locations)
     return file_name, new_videos, total_videos, reverse_chronological, logging_locations
 
+def iterate_entries(
+    lines: Iterator[str],
+    file_type: str,
+) -> Iterator[List[str]]:
+    # yields the lines of every video in a file without a csv header, using the same format create_row() writes:
+    #     csv     - one csv row (the csv module decides where the row ends, so titles with commas, quotes, or line breaks stay in their row)
+    #     txt, md - every line up to and including the ENTRY_SEPARATOR line (and the empty line after it in md files)
+    if file_type == 'csv':
+        consumed_lines: List[str] = []
+        def consume(
+        ) -> Iterator[str]:
+            for line in lines:
+                consumed_lines.append(line)
+                yield line
+        for _ in csv.reader(consume()): # the reader only takes the lines of the next row from consume()
+            yield consumed_lines[:]
+            consumed_lines.clear()
+        return
+    entry: List[str] = []
+    finished         = False
+    for line in lines:
+        if finished and (file_type != 'md' or line.strip()): # the empty line after the separator still belongs to the video in md files
+            yield entry
+            entry, finished = [], False
+        entry.append(line)
+        finished = finished or line.rstrip('\r\n') == ENTRY_SEPARATOR
+    if entry:
+        yield entry
+
+def determine_entry_video(
+    entry: List[str],
+    file_type: str,
+) -> Optional[str]:
+    # returns the Video URL (or Video ID) of one video yielded by iterate_entries()
+    if file_type == 'csv':
+        row = next(csv.reader(entry), [])
+        return row[3] if len(row) > 3 else None
+    for line in entry:
+        match = re.match('^(?:### )?Video (?:URL|ID):\s*(\S+)', line)
+        if match is not None:
+            return match.group(1)
+    return None
+
+def split_segment(
+    head_file_name: str,
+    file_name: str,
+    file_type: str,
+    file_buffering: int,
+    newline: Optional[str],
+    segment_size: int,
+    logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+) -> None:
+    # moves every video after the newest `segment_size` videos in `head_file_name` to a new segment, and adds the moved videos to the index of the segments
+    segments_directory = determine_segments_directory(file_name)
+    os.makedirs(segments_directory, exist_ok=True)
+    newest_segment     = list_segments(file_name, file_type)[:1]
+    segment_number     = int(os.path.basename(newest_segment[0]).split('.')[0]) + 1 if newest_segment else 1
+    segment_file_name  = os.path.join(segments_directory, f'{segment_number:06d}.{file_type}')
+    split_file_name    = f'{head_file_name}.split'
+    moved_videos: List[str] = []
+    with open(head_file_name, mode='r', newline=newline, encoding='utf-8', buffering=file_buffering) as head_file, open(split_file_name, mode='w', newline=newline, encoding='utf-8', buffering=file_buffering) as split_file, open(f'{segment_file_name}.temp', mode='w', newline=newline, encoding='utf-8', buffering=file_buffering) as segment_file:
+        if file_type == 'csv': split_file.write(head_file.readline()) # only the output file keeps the csv header
+        for entry_number, entry in enumerate(iterate_entries(head_file, file_type)):
+            if entry_number < segment_size:
+                split_file.writelines(entry)
+            else:
+                segment_file.writelines(entry)
+                moved_videos.append(determine_entry_video(entry, file_type) or '')
+    # write the segment and the index before replacing the head, so stopping the program in between can only duplicate videos instead of losing them
+    os.replace(f'{segment_file_name}.temp', segment_file_name)
+    with open(determine_index_file(file_name, file_type), mode='a', encoding='utf-8') as index_file:
+        index_file.writelines(f'{video}\n' for video in moved_videos if video)
+    os.replace(split_file_name, head_file_name)
+    log(f'Moved {len(moved_videos)} older videos to'.ljust(PADDING) + f'{segment_file_name}', logging_locations)
+
+def remove_segments(
+    file_name: str,
+    file_type: str,
+    logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+) -> None:
+    # only used when the output file is written from scratch with every video of the channel, since the segments would duplicate the older videos
+    index_file_name = determine_index_file(file_name, file_type)
+    segments        = list_segments(file_name, file_type) + ([index_file_name] if os.path.exists(index_file_name) else [])
+    for segment in segments:
+        os.remove(segment)
+    if segments:
+        log(f'Removed {len(segments)} segments of'.ljust(PADDING) + f'{file_name}.{file_type}', logging_locations)
+        if not os.listdir(determine_segments_directory(file_name)): os.rmdir(determine_segments_directory(file_name))
+
+
 def format_visited_videos_for_id(
     file_visited_videos: Set[str],
     video_id_only: bool,
@@ -228,7 +327,7 @@ def create_row(
         writer.write(f'{ljust("Watched:")}{newline}')
         writer.write(f'{ljust("Watch again later:")}{newline}')
         writer.write(f'{ljust("Notes:")}{newline}')
-        writer.write('*'*75 + newline)
+        writer.write(ENTRY_SEPARATOR + newline)
         if markdown: writer.write('\n')
 
 
@@ -1,8 +1,161 @@
-from yt_videos_list.program import normalize_whitespace
+import io
+import sqlite3
+import os
+import time
+import types
+import json
+import asyncio
+import tempfile
+import subprocess
+import threading
+import contextlib
+import collections
+import multiprocessing
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures.process import BrokenProcessPool
+
+from save_thread_result import ThreadWithResult
+
+from yt_videos_list         import ListCreator, fetcher, snapshot
+from yt_videos_list.driver_pool import DriverPool
+from yt_videos_list.tab_pool    import TabPool
+from yt_videos_list.scheduler   import ChannelResult, ChannelScheduler
+from yt_videos_list.process_pool import ProcessChannelScheduler
+from yt_videos_list.memory_guard import MemoryGuard, available_memory, driver_memory
+from yt_videos_list.rate_limiter import RateLimiter
+from yt_videos_list.job_queue    import JobQueue, LeasedUrls
+from yt_videos_list.sharding     import determine_shard, normalize_url, select_shard
+from yt_videos_list.retry        import RetryPolicy, is_fatal, is_quarantined, load_quarantine, save_quarantine
+from yt_videos_list.freshness    import FreshnessRecorder, is_fresh, load_freshness, newest_video, save_freshness
+from yt_videos_list.batching     import determine_expected_file_name, has_existing_files, split_new_channels
+from yt_videos_list.scheduler    import merge_streams
+from yt_videos_list               import logic, process_pool, scroller
+from yt_videos_list.job_order    import JOB_ORDERS, load_durations, order_urls, save_durations
+from yt_videos_list.logic   import LEAN_BLOCKED_URL_PATTERNS, LEAN_CHROMIUM_ARGUMENTS, LEAN_FIREFOX_PREFERENCES, select_feed_videos
+from yt_videos_list.scroller import verify_reached_page_bottom
+from yt_videos_list.notifications import Common
+from yt_videos_list.program import determine_action, load_video_data, normalize_whitespace
+from yt_videos_list.writer  import ENTRY_SEPARATOR, create_file, iterate_entries, list_segments, update_file
+
+
+SNAPSHOT_PAGE_SOURCE = '''<html><head><link rel="canonical" href="https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g"></head><body>
+<ytd-channel-name><yt-formatted-string class="style-scope ytd-channel-name">Corey Schafer</yt-formatted-string></ytd-channel-name>
+<ytd-rich-grid-renderer><div id="contents">
+<ytd-rich-item-renderer><ytd-rich-grid-media><div id="dismissible">
+  <div id="thumbnail"><ytd-thumbnail><a id="thumbnail"><div id="overlays"><ytd-thumbnail-overlay-time-status-renderer><div><span class="style-scope ytd-thumbnail-overlay-time-status-renderer">
+    12:34
+  </span></div></ytd-thumbnail-overlay-time-status-renderer></div></a></ytd-thumbnail></div>
+  <div id="details"><div id="meta"><h3><a id="video-title-link" class="yt-simple-endpoint" title="Newest video &amp; more" href="/watch?v=AAAAAAAAAAA"></a></h3></div></div>
+</div></ytd-rich-grid-media></ytd-rich-item-renderer>
+<ytd-rich-item-renderer><ytd-rich-grid-media><div id="dismissible">
+  <div id="thumbnail"><ytd-thumbnail><a id="thumbnail"><img src="thumbnail.jpg"><div id="overlays"></div></a></ytd-thumbnail></div>
+  <div id="details"><div id="meta"><h3><a id="video-title-link" title="Oldest video" href="/shorts/BBBBBBBBBBB"></a></h3></div></div>
+</div></ytd-rich-grid-media></ytd-rich-item-renderer>
+</div></ytd-rich-grid-renderer></body></html>'''
+
+def recorded_video(video_id, title, duration):
+    return {'richItemRenderer': {'content': {'videoRenderer': {'videoId': video_id, 'title': {'runs': [{'text': title}]}, 'lengthText': {'simpleText': duration}}}}}
+
+def recorded_continuation(token):
+    return {'continuationItemRenderer': {'continuationEndpoint': {'continuationCommand': {'token': token}}}}
+
+RECORDED_INITIAL_DATA = {
+    'metadata': {'channelMetadataRenderer': {'title': 'Corey Schafer'}},
+    'contents': {'twoColumnBrowseResultsRenderer': {'tabs': [{'tabRenderer': {'selected': True, 'content': {'richGridRenderer': {'contents': [
+        recorded_video('AAAAAAAAAAA', 'Newest video', '12:34'),
+        recorded_video('BBBBBBBBBBB', 'Middle video', '1:02:03'),
+        recorded_continuation('first-token'),
+    ]}}}}]}},
+}
+RECORDED_CONTINUATIONS = {
+    'first-token':  {'onResponseReceivedActions': [{'appendContinuationItemsAction': {'continuationItems': [recorded_video('CCCCCCCCCCC', 'Older video', '0:59'), recorded_continuation('second-token')]}}]},
+    'second-token': {'onResponseReceivedActions': [{'appendContinuationItemsAction': {'continuationItems': [recorded_video('DDDDDDDDDDD', 'Oldest video', '5:00')]}}]},
+}
+RECORDED_PAGE_SOURCE = (
+    '<html><script>ytcfg.set({"INNERTUBE_API_KEY": "recorded-key", "INNERTUBE_CLIENT_VERSION": "2.20240101"});</script>'
+    f'<script>var ytInitialData = {json.dumps(RECORDED_INITIAL_DATA)};</script></html>'
+)
+
+RECORDED_FEED = '''<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <title>Corey Schafer</title>
+ <author><name>Corey Schafer</name><uri>https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g</uri></author>
+ <entry><yt:videoId>EEEEEEEEEEE</yt:videoId><title>Brand new video</title><link rel="alternate" href="https://www.youtube.com/watch?v=EEEEEEEEEEE"/></entry>
+ <entry><yt:videoId>AAAAAAAAAAA</yt:videoId><title>Newest video &amp; more</title><link rel="alternate" href="https://www.youtube.com/watch?v=AAAAAAAAAAA"/></entry>
+ <entry><yt:videoId>BBBBBBBBBBB</yt:videoId><title>Oldest video</title><link rel="alternate" href="https://www.youtube.com/shorts/BBBBBBBBBBB"/></entry>
+</feed>'''
+
+
+@contextlib.contextmanager
+def stub_youtube_server(requests_made, connections_made=None):
+    '''
+    Serves the recorded channel page and continuation responses from a local server,
+    stores the path of every request made to the server in `requests_made`,
+    and stores the client address of every connection made to the server in `connections_made` (if provided).
+    '''
+    class RecordedResponseHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' # keep connections alive like YouTube does
+        def setup(self):
+            super().setup()
+            if connections_made is not None: connections_made.add(self.client_address)
+        def do_GET(self):
+            requests_made.append(self.path)
+            if self.path.startswith('/feeds/videos.xml'): self.respond(200, 'application/atom+xml', RECORDED_FEED.encode('utf-8'))
+            else:                                         self.respond(200, 'text/html',            RECORDED_PAGE_SOURCE.encode('utf-8'))
+        def do_POST(self):
+            requests_made.append(self.path)
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            self.respond(200, 'application/json', json.dumps(RECORDED_CONTINUATIONS[body['continuation']]).encode('utf-8'))
+        def respond(self, status, content_type, content):
+            self.send_response(status)
+            self.send_header('Content-Type',   content_type)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RecordedResponseHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
 
 
 def main():
     test_normalize_whitespace()
+    test_load_video_data()
+    test_snapshot_extraction()
+    test_create_list_from_snapshot()
+    test_http_backend()
+    test_asyncio_engine()
+    test_rss_feed_updates()
+    test_driver_pool()
+    test_lean_profile()
+    test_tab_pool()
+    test_channel_scheduler()
+    test_process_channel_scheduler()
+    test_job_order()
+    test_memory_guard()
+    test_rate_limiter()
+    test_job_queue()
+    test_sharding()
+    test_retry_policy()
+    test_freshness()
+    test_streaming_results()
+    test_new_channel_lane()
+    test_segmented_updates()
+    test_page_bottom_verification()
+    test_scroll_until_break()
+    test_rss_feed_fallback()
+    test_lean_profile_launch()
+    test_tab_pool_slow_launch()
+    test_process_channel_timeout()
+    test_fatal_errors()
+    test_connection_pool_reuse()
 
 def test_normalize_whitespace():
     test_cases =     test_cases = (
@@ -35,6 +188,1029 @@ def test_normalize_whitespace():
         if actual_output_text != normalized_text:
             raise ValueError(error_message.format(index=index, raw_text=raw_text, normalized_text=normalized_text, actual_output_text=actual_output_text))
 
+def test_load_video_data():
+    videos_list = [
+        ['Newest\n video',  'https://www.youtube.com/shorts/AAAAAAAAAAA',             '0:59'],
+        ['Middle video',    'https://www.youtube.com/watch?v=BBBBBBBBBBB&pp=sAQA',    'N/A'],
+        ['Oldest video',    'https://www.youtube.com/watch?v=CCCCCCCCCCC',             '1:02:03'],
+    ]
+    logging_locations = (io.StringIO(),)
+    expected_video_data = (
+        [
+            [1, 'Oldest video', '1:02:03', 'https://www.youtube.com/watch?v=CCCCCCCCCCC'],
+            [2, 'Middle video', 'N/A',     'https://www.youtube.com/watch?v=BBBBBBBBBBB'],
+            [3, 'Newest video', '0:59',    'https://www.youtube.com/watch?v=AAAAAAAAAAA'],
+        ]
+    )
+    actual_video_data = load_video_data(videos_list, set(), False, False, logging_locations)
+    if actual_video_data != expected_video_data:
+        raise ValueError(f'Expected video_data:\n{expected_video_data}\nbut got:\n{actual_video_data}')
+    actual_video_data = load_video_data(videos_list, {'https://www.youtube.com/watch?v=CCCCCCCCCCC'}, True, True, logging_locations)
+    if actual_video_data != [[3, 'Newest video', '0:59', 'AAAAAAAAAAA'], [2, 'Middle video', 'N/A', 'BBBBBBBBBBB']]:
+        raise ValueError(f'Pre-existing videos were not skipped properly or video IDs were not extracted properly:\n{actual_video_data}')
+
+
+def test_snapshot_extraction():
+    expected_videos = [
+        ['Newest video & more', 'https://www.youtube.com/watch?v=AAAAAAAAAAA', '12:34'],
+        ['Oldest video',        'https://www.youtube.com/shorts/BBBBBBBBBBB',  'N/A'],
+    ]
+    actual_videos, channel_name, canonical_url = snapshot.extract_video_data_with_html_parser(SNAPSHOT_PAGE_SOURCE)
+    if (actual_videos, channel_name, canonical_url) != (expected_videos, 'Corey Schafer', 'https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g'):
+        raise ValueError(f'The html.parser fallback did not extract the snapshot properly:\n{actual_videos}\n{channel_name}\n{canonical_url}')
+    if snapshot.lxml is not None and snapshot.extract_video_data_with_lxml(SNAPSHOT_PAGE_SOURCE) != expected_videos:
+        raise ValueError(f'The lxml parser did not extract the snapshot properly:\n{snapshot.extract_video_data_with_lxml(SNAPSHOT_PAGE_SOURCE)}')
+
+
+def test_create_list_from_snapshot():
+    original_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+        try:
+            with open('CoreySchafer.html', mode='w', encoding='utf-8') as page_source_file:
+                page_source_file.write(SNAPSHOT_PAGE_SOURCE)
+            list_creator     = ListCreator(md=False, video_id_only=True)
+            _, (channel_name, file_name) = list_creator.create_list_from_snapshot('CoreySchafer.html', log_silently=True)
+            with open(f'{file_name}.csv', mode='r', encoding='utf-8') as csv_file:
+                csv_content = csv_file.read().splitlines()
+        finally:
+            os.chdir(original_directory)
+    expected_csv_content = [
+        'Video Number,Video Title,Video Duration,Video ID,Watched,Watch again later,Notes',
+        '2,Newest video & more,12:34,AAAAAAAAAAA,,,',
+        '1,Oldest video,N/A,BBBBBBBBBBB,,,',
+    ]
+    if (channel_name, file_name, csv_content) != ('Corey Schafer', 'CoreySchafer_reverse_chronological_video_ids_list', expected_csv_content):
+        raise ValueError(f'The snapshot was not replayed properly:\n{channel_name}\n{file_name}\n{csv_content}')
+
+
+def test_http_backend():
+    requests_made     = []
+    logging_locations = (io.StringIO(),)
+    channel_url       = 'https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g/videos?view=0&sort=dd&flow=grid&shelf_id=0'
+    with stub_youtube_server(requests_made) as base_url, fetcher.create_connection_pool() as http:
+        channel_page = fetcher.fetch_channel_page(channel_url, http, base_url)
+        videos_list  = fetcher.fetch_video_data(channel_page, set(), http, logging_locations)
+        video_data   = load_video_data(videos_list, set(), False, True, logging_locations)
+        expected_video_data = [
+            [4, 'Newest video', '12:34',   'https://www.youtube.com/watch?v=AAAAAAAAAAA'],
+            [3, 'Middle video', '1:02:03', 'https://www.youtube.com/watch?v=BBBBBBBBBBB'],
+            [2, 'Older video',  '0:59',    'https://www.youtube.com/watch?v=CCCCCCCCCCC'],
+            [1, 'Oldest video', '5:00',    'https://www.youtube.com/watch?v=DDDDDDDDDDD'],
+        ]
+        if channel_page.channel_name != 'Corey Schafer' or video_data != expected_video_data or len(requests_made) != 3:
+            raise ValueError(f'The http backend did not load the recorded channel properly:\n{channel_page.channel_name}\n{video_data}\n{requests_made}')
+        # the program should stop requesting more videos once it finds a video that was already written to a file
+        requests_made.clear()
+        videos_list = fetcher.fetch_video_data(channel_page, {'https://www.youtube.com/watch?v=BBBBBBBBBBB'}, http, logging_locations)
+        if len(videos_list) != 2 or requests_made:
+            raise ValueError(f'The http backend requested more videos after finding a pre-existing video:\n{videos_list}\n{requests_made}')
+
+
+def test_asyncio_engine():
+    requests_made     = []
+    connections_made  = set()
+    logging_locations = (io.StringIO(),)
+    channel_url       = 'https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g/videos?view=0&sort=dd&flow=grid&shelf_id=0'
+    async def scrape_channels(base_url):
+        async def scrape_channel(http):
+            channel_page = await fetcher.afetch_channel_page(channel_url, http, base_url)
+            return await fetcher.afetch_video_data(channel_page, set(), http, logging_locations)
+        async with fetcher.AsyncConnectionPool(connections_per_host=2) as http:
+            return await asyncio.gather(*(scrape_channel(http) for _ in range(20)))
+    with stub_youtube_server(requests_made, connections_made) as base_url:
+        videos_lists = asyncio.run(scrape_channels(base_url))
+    expected_video_ids = ['AAAAAAAAAAA', 'BBBBBBBBBBB', 'CCCCCCCCCCC', 'DDDDDDDDDDD']
+    if any([video_url.split('=')[1] for _, video_url, _ in videos_list] != expected_video_ids for videos_list in videos_lists) or len(requests_made) != 60:
+        raise ValueError(f'The asyncio engine did not load the recorded channels properly:\n{videos_lists}\n{requests_made}')
+    # all 60 requests should share (at most) 2 keep-alive connections to the stub server
+    if len(connections_made) > 2:
+        raise ValueError(f'The asyncio engine opened more than connections_per_host=2 connections to the same host: {connections_made}')
+    # every continuation request is its own call in the thread pool, so with ONE thread the channels take turns instead of the first channel loading every batch first
+    continuations_requested = []
+    fetch_continuation      = fetcher.fetch_continuation
+    def record_continuation(channel_page, continuation, http):
+        continuations_requested.append(continuation)
+        return fetch_continuation(channel_page, continuation, http)
+    async def scrape_channels_in_one_thread(base_url):
+        async def scrape_channel(http):
+            channel_page = await fetcher.afetch_channel_page(channel_url, http, base_url)
+            return await fetcher.afetch_video_data(channel_page, set(), http, logging_locations)
+        async with fetcher.AsyncConnectionPool(connections_per_host=1, max_threads=1) as http:
+            return await asyncio.gather(*(scrape_channel(http) for _ in range(2)))
+    fetcher.fetch_continuation = record_continuation
+    try:
+        with stub_youtube_server([]) as base_url:
+            videos_lists = asyncio.run(scrape_channels_in_one_thread(base_url))
+    finally:
+        fetcher.fetch_continuation = fetch_continuation
+    if continuations_requested != ['first-token', 'first-token', 'second-token', 'second-token'] or any(len(videos_list) != 4 for videos_list in videos_lists):
+        raise ValueError(f'The continuation requests of the channels did not take turns in the thread pool: {continuations_requested}')
+    try:
+        asyncio.run(ListCreator().acreate_list_from('channels.txt'))
+    except ValueError:
+        pass
+    else:
+        raise ValueError('The asyncio engine should only run with the http backend')
+
+
+def test_rss_feed_updates():
+    requests_made     = []
+    logging_locations = (io.StringIO(),)
+    channel_url       = 'https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g/videos?view=0&sort=dd&flow=grid&shelf_id=0'
+    feed_url          = fetcher.determine_feed_url(channel_url)
+    if feed_url != 'https://www.youtube.com/feeds/videos.xml?channel_id=UCCezIgC97PvUuR4_gbFUs5g' or fetcher.determine_feed_url('https://www.youtube.com/c/Corey/videos?view=0') is not None:
+        raise ValueError(f'The feed url was not determined properly: {feed_url}')
+    original_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as temporary_directory, stub_youtube_server(requests_made) as base_url, fetcher.create_connection_pool() as http:
+        os.chdir(temporary_directory)
+        try:
+            with open('CoreySchafer.html', mode='w', encoding='utf-8') as page_source_file:
+                page_source_file.write(SNAPSHOT_PAGE_SOURCE)
+            _, (_, file_name) = ListCreator(md=False, video_id_only=True).create_list_from_snapshot('CoreySchafer.html', log_silently=True)
+            feed = fetcher.fetch_feed(feed_url, http, base_url)
+            # the files do not exist yet for a channel that was never scraped, so the program cannot update them from the feed
+            if select_feed_videos(feed, 'NeverScraped', True, True, False, False) is not None:
+                raise ValueError('The feed should not be used to create new files')
+            feed_videos = select_feed_videos(feed, file_name, True, True, False, False)
+            determine_action(channel_url, None, True, 0.8, 3, True, file_name, -1, True, True, False, False, False, False, logging_locations, None, None, None, feed_videos)
+            with open(f'{file_name}.csv', mode='r', encoding='utf-8') as csv_file:
+                csv_content = csv_file.read().splitlines()
+        finally:
+            os.chdir(original_directory)
+    expected_feed_videos = [['Brand new video', 'https://www.youtube.com/watch?v=EEEEEEEEEEE', 'N/A'], ['Newest video & more', 'https://www.youtube.com/watch?v=AAAAAAAAAAA', 'N/A']]
+    expected_csv_content = [
+        'Video Number,Video Title,Video Duration,Video ID,Watched,Watch again later,Notes',
+        '3,Brand new video,N/A,EEEEEEEEEEE,,,',
+        '2,Newest video & more,12:34,AAAAAAAAAAA,,,',
+        '1,Oldest video,N/A,BBBBBBBBBBB,,,',
+    ]
+    if feed.channel_name != 'Corey Schafer' or feed_videos != expected_feed_videos or csv_content != expected_csv_content or requests_made != ['/feeds/videos.xml?channel_id=UCCezIgC97PvUuR4_gbFUs5g']:
+        raise ValueError(f'The RSS feed was not used to update the files properly:\n{feed}\n{feed_videos}\n{csv_content}\n{requests_made}')
+
+
+def test_driver_pool():
+    class FakeDriver:
+        def __init__(self):
+            self.crashed = False
+            self.closed  = False
+        @property
+        def window_handles(self):
+            if self.crashed: raise ConnectionRefusedError('the browser crashed')
+            return ['window']
+        def execute_script(self, script):
+            return 1
+        def quit(self):
+            self.closed = True
+    opened_drivers = []
+    def open_driver():
+        opened_drivers.append(FakeDriver())
+        return opened_drivers[-1]
+    pool          = DriverPool(max_uses=2)
+    key           = ('firefox', True)
+    first_driver  = pool.acquire(key, open_driver)
+    pool.release(key, first_driver)
+    # a warm driver is reused for the same configuration, but never for a different configuration
+    if pool.acquire(key, open_driver) is not first_driver or len(opened_drivers) != 1:
+        raise ValueError('The driver pool did not reuse the warm driver')
+    other_driver = pool.acquire(('chrome', True), open_driver)
+    pool.release(('chrome', True), other_driver)
+    # the first driver reached max_uses=2, so it should be closed instead of kept for the next channel
+    pool.release(key, first_driver)
+    if not first_driver.closed or pool.acquire(key, open_driver) is first_driver:
+        raise ValueError('The driver pool did not recycle the driver after max_uses channels')
+    # a crashed driver fails the health check and is replaced with a new driver
+    other_driver.crashed = True
+    replacement_driver   = pool.acquire(('chrome', True), open_driver)
+    if replacement_driver is other_driver or not other_driver.closed:
+        raise ValueError('The driver pool reused a crashed driver')
+    pool.release(('chrome', True), replacement_driver)
+    pool.close()
+    if not replacement_driver.closed:
+        raise ValueError('The driver pool did not close the idle drivers')
+    with ListCreator(reuse_drivers=True, max_driver_uses=3) as list_creator:
+        if 'reuse_drivers=True, max_driver_uses=3' not in repr(list_creator):
+            raise ValueError(f'The driver pool options are missing from the instance representation: {list_creator!r}')
+
+
+def test_lean_profile():
+    if LEAN_FIREFOX_PREFERENCES['permissions.default.image'] != 2 or '*i.ytimg.com*' not in LEAN_BLOCKED_URL_PATTERNS:
+        raise ValueError('The lean profile does not block thumbnails')
+    list_creator = ListCreator(lean_profile=True)
+    if 'lean_profile=True' not in repr(list_creator) or 'lean_profile               = True' not in str(list_creator):
+        raise ValueError(f'The lean_profile option is missing from the instance representation: {list_creator!r}')
+
+
+def test_tab_pool():
+    class FakeBrowser:
+        def __init__(self):
+            self.window_handles        = ['window-0']
+            self.current_window_handle = 'window-0'
+            self.scripts_run_in        = []
+            self.closed                = False
+            browser                    = self
+            class SwitchTo:
+                def window(self, handle):
+                    browser.current_window_handle = handle
+            self.switch_to = SwitchTo()
+        def execute_script(self, script, *args):
+            if script.startswith('window.open'): self.window_handles.append(f'window-{len(self.window_handles)}')
+            else:                                self.scripts_run_in.append(self.current_window_handle)
+        def close(self):
+            self.window_handles.remove(self.current_window_handle)
+        def quit(self):
+            self.closed = True
+    opened_browsers = []
+    def open_browser():
+        opened_browsers.append(FakeBrowser())
+        return opened_browsers[-1]
+    pool = TabPool(tabs_per_driver=2)
+    key  = ('firefox', True, False)
+    tabs = [pool.acquire(key, open_browser) for _ in range(3)]
+    # 2 tabs share the first browser, and the third tab needs a second browser
+    if len(opened_browsers) != 2 or tabs[0].browser is not tabs[1].browser or tabs[0].handle == tabs[1].handle:
+        raise ValueError(f'The tab pool did not share the browser between tabs: {opened_browsers}')
+    # every command runs in the window of the tab that sent it
+    tabs[1].execute_script('return 1')
+    tabs[0].execute_script('return 1')
+    if opened_browsers[0].scripts_run_in != [tabs[1].handle, tabs[0].handle]:
+        raise ValueError(f'The tabs did not switch to their own window: {opened_browsers[0].scripts_run_in}')
+    closed_browsers = []
+    pool.release(key, tabs[0], closed_browsers.append)
+    if closed_browsers or tabs[0].handle in opened_browsers[0].window_handles:
+        raise ValueError('The tab pool did not close only the window of the released tab')
+    pool.release(key, tabs[1], closed_browsers.append)
+    pool.release(key, tabs[2], closed_browsers.append)
+    if closed_browsers != opened_browsers:
+        raise ValueError('The tab pool did not close the browsers after their last tab was released')
+
+
+def test_channel_scheduler():
+    urls          = collections.deque(['channel-1', 'broken-channel', 'channel-2', 'channel-1'])
+    started       = []
+    def run_worker(on_channel_finished):
+        started.append(threading.current_thread())
+        while urls:
+            url = urls.popleft()
+            if url == 'broken-channel':
+                on_channel_finished(url, ChannelResult(url, None, None, None, RuntimeError('the channel failed')))
+                return None # the worker stops after a failed channel, so the scheduler should start a new worker right away
+            on_channel_finished(url, ChannelResult(url, url.title(), f'{url}_file', None, None))
+        return None
+    scheduler = ChannelScheduler(urls, 1, run_worker)
+    scheduler.start()
+    start_time = time.perf_counter()
+    results    = scheduler.wait((io.StringIO(),))
+    if time.perf_counter() - start_time > 5:
+        raise ValueError('The scheduler did not return as soon as the last channel was finished')
+    if [result.url for result in results] != ['channel-1', 'broken-channel', 'channel-2', 'channel-1'] or [result.succeeded for result in results] != [True, False, True, True]:
+        raise ValueError(f'The scheduler did not return a result for every channel in order: {results}')
+    if len(started) != 2:
+        raise ValueError(f'The scheduler did not replace the stopped worker: {started}')
+
+
+def test_process_channel_scheduler():
+    # the urls cannot be parsed, so every channel fails in its worker process before the program opens a driver or makes a request
+    urls                = collections.deque(['not a youtube url', 'still not a youtube url'])
+    instance_attributes = ListCreator(backend='http', check_rss_feed=False)._ListCreator__determine_instance_attributes()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path_to_log_file = os.path.join(temporary_directory, 'channels.log')
+        results          = ProcessChannelScheduler(2, 1).run(urls, (io.StringIO(),), 'auto', instance_attributes, 0, 0, (20, 0), path_to_log_file, -1, True, False, None)
+    if [result.url for result in results] != list(urls) or any(result.succeeded or 'ValueError' not in str(result.error) for result in results):
+        raise ValueError(f'The worker processes did not send back a result for every channel: {results}')
+
+
+def test_job_order():
+    urls      = collections.deque(['small-channel', 'new-channel', 'large-channel', 'medium-channel'])
+    durations = {'small-channel': 2.0, 'large-channel': 300.0, 'medium-channel': 45.0}
+    ordered_urls, order = order_urls(urls, durations, JOB_ORDERS['longest_first'])
+    # the channel that was never scraped goes first, then the channels that took the longest last time
+    if list(ordered_urls) != ['new-channel', 'large-channel', 'medium-channel', 'small-channel']:
+        raise ValueError(f'The channels were not ordered longest first: {ordered_urls}')
+    if list(order_urls(urls, durations, JOB_ORDERS['file'])[0]) != list(urls):
+        raise ValueError('The channels were not kept in file order')
+    if [urls[index] for index in order] != list(ordered_urls):
+        raise ValueError(f'The position in the file of every channel was not returned: {order}')
+    results = [ChannelResult(url, url, url, None, None, 1.5) for url in ordered_urls]
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path_to_durations_file = os.path.join(temporary_directory, 'channels.durations.json')
+        save_durations(path_to_durations_file, durations, results + [ChannelResult('failed-channel', None, None, None, RuntimeError('failed'), 0.1)])
+        saved_durations = load_durations(path_to_durations_file)
+    if saved_durations != {'small-channel': 1.5, 'new-channel': 1.5, 'large-channel': 1.5, 'medium-channel': 1.5}:
+        raise ValueError(f'The durations were not saved properly: {saved_durations}')
+
+
+def test_memory_guard():
+    class FakeDriver:
+        class service:
+            class process:
+                pid = os.getpid()
+    if available_memory() is None or not driver_memory(FakeDriver()):
+        print('Skipping the memory guard test since memory cannot be measured on this machine (install psutil to measure memory)')
+        return
+    if not MemoryGuard(max_driver_mb=1).should_recycle(FakeDriver()) or MemoryGuard(max_driver_mb=None).should_recycle(FakeDriver()):
+        raise ValueError('The memory guard did not recycle a driver that uses more than max_driver_mb')
+    # no machine has this much available memory, so the second channel should wait until the first channel finishes
+    guard  = MemoryGuard(min_available_mb=1024 ** 3, poll_interval=0.05)
+    events = []
+    def scrape_channel(name):
+        with guard.admit(None):
+            events.append(f'start {name}')
+            time.sleep(0.2)
+            events.append(f'end {name}')
+    first_channel  = threading.Thread(target=scrape_channel, args=('first',))
+    first_channel.start()
+    time.sleep(0.05)
+    second_channel = threading.Thread(target=scrape_channel, args=('second',))
+    second_channel.start()
+    first_channel.join()
+    second_channel.join()
+    if events != ['start first', 'end first', 'start second', 'end second']:
+        raise ValueError(f'The memory guard started a channel without enough available memory: {events}')
+
+
+def test_rate_limiter():
+    # 600 channels per minute is 10 channels per second, so after a burst of 2 channels every channel waits 0.1 seconds
+    limiter    = RateLimiter(600, burst=2)
+    start_time = time.monotonic()
+    threads    = [threading.Thread(target=limiter.acquire) for _ in range(6)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    elapsed_time = time.monotonic() - start_time
+    if not 0.35 <= elapsed_time < 1:
+        raise ValueError(f'The rate limiter let 6 channels start in {elapsed_time} seconds instead of about 0.4 seconds')
+    limiter.penalize('Redirected to the cookie consent page')
+    if limiter.rate != limiter.max_rate / 2:
+        raise ValueError(f'The rate limiter did not slow down after being penalized: {limiter.rate * 60} channels per minute')
+    for _ in range(10): limiter.penalize('Failed to scrape a channel')
+    if limiter.rate != limiter.min_rate:
+        raise ValueError(f'The rate limiter slowed down below the minimum rate: {limiter.rate * 60} channels per minute')
+    for _ in range(20): limiter.reward()
+    if limiter.rate != limiter.max_rate:
+        raise ValueError(f'The rate limiter did not speed back up after channels succeeded: {limiter.rate * 60} channels per minute')
+
+
+def drain_job_queue(path_to_queue_file):
+    # runs in a separate process, like a create_list_from() call on another machine
+    job_queue, scraped_urls = JobQueue(path_to_queue_file), []
+    urls = LeasedUrls(job_queue)
+    while urls:
+        url = urls.popleft()
+        if url is None: continue
+        time.sleep(0.01)
+        scraped_urls.append(url)
+        job_queue.complete(url)
+    job_queue.close()
+    return scraped_urls
+
+def test_job_queue():
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path_to_queue_file = os.path.join(temporary_directory, 'channels.queue.sqlite')
+        urls               = [f'channel-{index}' for index in range(40)]
+        JobQueue(path_to_queue_file).add(urls)
+        JobQueue(path_to_queue_file).add(urls[:10]) # adding the same urls again does not add duplicate jobs
+        with multiprocessing.Pool(4) as pool:
+            scraped_urls = [url for urls_scraped_by_process in pool.map(drain_job_queue, [path_to_queue_file] * 4) for url in urls_scraped_by_process]
+        if sorted(scraped_urls) != sorted(urls):
+            raise ValueError(f'The processes did not scrape every channel in the job queue exactly once: {sorted(scraped_urls)}')
+        if JobQueue(path_to_queue_file).counts() != {'pending': 0, 'leased': 0, 'done': 40, 'failed': 0}:
+            raise ValueError(f'The job queue did not mark every channel as done: {JobQueue(path_to_queue_file).counts()}')
+        # a channel leased by a process that crashed is leased again after the lease times out, until it runs out of attempts
+        path_to_queue_file = os.path.join(temporary_directory, 'crashes.queue.sqlite')
+        crashed_queue      = JobQueue(path_to_queue_file, lease_timeout_s=0.05, max_attempts=2)
+        crashed_queue.add(['crashing-channel', 'failing-channel'])
+        crashed_queue.stop_heartbeat.set() # simulates the process crashing without renewing its leases
+        if crashed_queue.lease() != 'crashing-channel' or crashed_queue.lease() != 'failing-channel':
+            raise ValueError('The job queue did not lease the channels in order')
+        crashed_queue.fail('failing-channel', RuntimeError('failed'))
+        job_queue = JobQueue(path_to_queue_file, lease_timeout_s=0.05, max_attempts=2)
+        if job_queue.lease() != 'failing-channel':
+            raise ValueError('The job queue did not retry the failed channel')
+        if job_queue.lease() is not None:
+            raise ValueError('The job queue leased a channel before its lease timed out')
+        time.sleep(0.1)
+        if job_queue.lease() != 'crashing-channel':
+            raise ValueError('The job queue did not lease the channel again after its lease timed out')
+        crashed_queue.complete('crashing-channel') # the first process lost its lease, so it cannot finish the job
+        job_queue.fail('failing-channel', RuntimeError('failed again'))
+        job_queue.stop_heartbeat.set()
+        time.sleep(0.1)
+        if job_queue.lease() is not None or job_queue.counts() != {'pending': 0, 'leased': 0, 'done': 0, 'failed': 2}:
+            raise ValueError(f'The job queue did not mark the channels that ran out of attempts as failed: {job_queue.counts()}')
+        crashed_queue.close()
+        job_queue.close()
+        # a channel that already used every retry in the process that leased it is not leased again
+        path_to_queue_file = os.path.join(temporary_directory, 'retried.queue.sqlite')
+        job_queue          = JobQueue(path_to_queue_file, max_attempts=3)
+        job_queue.add(['retried-channel'])
+        job_queue.fail(job_queue.lease(), RuntimeError('failed after every retry'), final=True)
+        if job_queue.lease() is not None or job_queue.counts() != {'pending': 0, 'leased': 0, 'done': 0, 'failed': 1}:
+            raise ValueError(f'The job queue did not mark the channel that failed after every retry as failed: {job_queue.counts()}')
+        job_queue.close()
+        # the heartbeat keeps renewing the leases after the queue file could not be written for a moment
+        path_to_queue_file = os.path.join(temporary_directory, 'locked.queue.sqlite')
+        log_file           = io.StringIO()
+        job_queue          = JobQueue(path_to_queue_file, lease_timeout_s=0.3, logging_locations=(log_file,))
+        job_queue.add(['locked-channel'])
+        leased_url         = job_queue.lease()
+        transaction        = job_queue.transaction
+        def locked_transaction():
+            raise sqlite3.OperationalError('database is locked')
+        job_queue.transaction = locked_transaction # the first renewal (after 0.1 seconds) fails
+        time.sleep(0.15)
+        job_queue.transaction = transaction
+        time.sleep(0.35)
+        if not job_queue.heartbeat.is_alive() or 'Could not renew the leases' not in log_file.getvalue() or leased_url != 'locked-channel' or JobQueue(path_to_queue_file).lease() is not None:
+            raise ValueError(f'The heartbeat stopped renewing the leases after a database error: {log_file.getvalue()!r}')
+        job_queue.close()
+
+
+def test_sharding():
+    same_channel = ['https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g', 'youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g/videos', 'http://m.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g/']
+    if len({normalize_url(url) for url in same_channel}) != 1 or normalize_url('https://www.youtube.com/@CoreySchafer/videos') != normalize_url('youtube.com/@coreyschafer'):
+        raise ValueError(f'Different urls for the same channel were normalized differently: {[normalize_url(url) for url in same_channel]}')
+    same_custom_url = ['youtube.com/teded', 'https://www.youtube.com/teded/', 'youtube.com/teded/videos']
+    if len({normalize_url(url) for url in same_custom_url}) != 1 or len({determine_shard(url, 16) for url in same_custom_url}) != 1:
+        raise ValueError(f'Different urls for the same custom channel url were put in different shards: {[normalize_url(url) for url in same_custom_url]}')
+    urls   = [f'https://www.youtube.com/channel/UC{index:022d}' for index in range(200)]
+    shards = [select_shard(urls, shard_index, 4) for shard_index in range(4)]
+    if sorted(url for shard in shards for url in shard) != sorted(urls) or min(len(shard) for shard in shards) < 20:
+        raise ValueError(f'The urls were not split into 4 shards: {[len(shard) for shard in shards]}')
+    # adding or removing urls does not move any other url to a different shard
+    changed_urls = urls[50:] + [f'https://www.youtube.com/channel/UC{index:022d}' for index in range(200, 300)]
+    for shard_index, shard in enumerate(shards):
+        if any(determine_shard(url, 4) != shard_index for url in shard) or set(shard) & set(urls[50:]) != set(select_shard(changed_urls, shard_index, 4)) & set(urls[50:]):
+            raise ValueError(f'A url moved to a different shard when urls were added and removed: shard {shard_index}')
+
+
+def test_retry_policy():
+    policy = RetryPolicy(max_attempts=3, base_delay_s=1, max_delay_s=3)
+    if not policy.should_retry(2, RuntimeError('timed out')) or policy.should_retry(3, RuntimeError('timed out')) or policy.should_retry(1, ValueError('not a youtube url')):
+        raise ValueError('The retry policy retried a channel it should not retry (or did not retry a channel it should retry)')
+    if not all(0.5 <= policy.delay(1) <= 1 and 1 <= policy.delay(2) <= 2 and 1.5 <= policy.delay(5) <= 3 for _ in range(20)):
+        raise ValueError('The retry policy did not back off exponentially up to max_delay_s')
+    # every attempt fails, so the thread should give up on both channels without raising (and without stopping after the first channel)
+    failed_attempts    = []
+    def fail_to_fetch_channel_page(url, http, base_url=None):
+        failed_attempts.append(url)
+        raise RuntimeError('YouTube did not respond')
+    results            = []
+    instance_attributes = ListCreator(backend='http', check_rss_feed=False)._ListCreator__determine_instance_attributes()
+    urls               = ['https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g', 'https://www.youtube.com/channel/UC8butISFwT-Wl7EV0hUK0BQ']
+    fetch_channel_page = logic.fetcher.fetch_channel_page
+    logic.fetcher.fetch_channel_page = fail_to_fetch_channel_page
+    try:
+        logic.execute(collections.deque(urls), 'auto', True, *instance_attributes, threading.Lock(), retry_policy=RetryPolicy(max_attempts=3, base_delay_s=0.01), on_channel_finished=lambda _, result: results.append(result))
+    finally:
+        logic.fetcher.fetch_channel_page = fetch_channel_page
+    if len(failed_attempts) != 6 or [(result.succeeded, result.attempts) for result in results] != [(False, 3), (False, 3)]:
+        raise ValueError(f'The program did not retry every channel 3 times before giving up: {failed_attempts} {results}')
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path_to_quarantine_file = os.path.join(temporary_directory, 'channels.failures.json')
+        save_quarantine(path_to_quarantine_file, {'fixed-channel': {'error': 'timed out', 'attempts': 3, 'failed_at': 0}}, results + [ChannelResult('fixed-channel', 'Fixed', 'Fixed', None, None)])
+        quarantine = load_quarantine(path_to_quarantine_file)
+    if sorted(quarantine) != sorted(urls) or quarantine[urls[0]]['attempts'] != 3 or 'YouTube did not respond' not in quarantine[urls[0]]['error']:
+        raise ValueError(f'The failures file did not record the channels that failed every attempt: {quarantine}')
+    if not is_quarantined(quarantine[urls[0]], 60) or is_quarantined(quarantine[urls[0]], None) or is_quarantined(None, 60):
+        raise ValueError('A channel was not quarantined properly')
+
+
+def test_freshness():
+    chronological_video_data = [[1, 'Older video', '0:59', 'CCCCCCCCCCC'], [2, 'Newest video', '12:34', 'https://www.youtube.com/watch?v=AAAAAAAAAAA']]
+    if newest_video(chronological_video_data) != chronological_video_data[1] or newest_video(chronological_video_data[::-1]) != chronological_video_data[1] or newest_video([]) is not None:
+        raise ValueError('The newest video was not found')
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path_to_freshness_file = os.path.join(temporary_directory, 'channels.freshness.json')
+        freshness = {'unchanged-channel': {'scraped_at': 0, 'newest_video_id': 'DDDDDDDDDDD'}, 'failed-channel': {'scraped_at': 0, 'newest_video_id': 'EEEEEEEEEEE'}}
+        results   = [
+            ChannelResult('updated-channel',   'Updated',   'Updated',   chronological_video_data, None),
+            ChannelResult('unchanged-channel', 'Unchanged', 'Unchanged', [],                       None),
+            ChannelResult('failed-channel',    None,        None,        None,                     RuntimeError('failed')),
+        ]
+        save_freshness(path_to_freshness_file, freshness, results)
+        # another process that loaded the file before the channels above were recorded keeps them when it records its own channel
+        save_freshness(path_to_freshness_file, {}, [ChannelResult('other-process-channel', 'Other', 'Other', chronological_video_data, None)])
+        other_process_freshness = load_freshness(path_to_freshness_file)
+        # the recorder saves the first channel right away, and the next channels together at most every save_every_s seconds
+        recorder = FreshnessRecorder(path_to_freshness_file, {}, save_every_s=60)
+        recorder.add(ChannelResult('first-channel', 'First', 'First', [], None))
+        recorder.add(ChannelResult('second-channel', 'Second', 'Second', [], None))
+        recorded_before_save = sorted(load_freshness(path_to_freshness_file))
+        recorder.save()
+        freshness = load_freshness(path_to_freshness_file)
+        leftover_files = sorted(file for file in os.listdir(temporary_directory) if file.endswith('.temp'))
+    if sorted(other_process_freshness) != ['failed-channel', 'other-process-channel', 'unchanged-channel', 'updated-channel'] or leftover_files:
+        raise ValueError(f'The channels recorded by another process were lost when the freshness file was saved: {other_process_freshness} {leftover_files}')
+    if 'second-channel' in recorded_before_save or 'first-channel' not in recorded_before_save or not {'first-channel', 'second-channel', 'other-process-channel'} <= set(freshness):
+        raise ValueError(f'The channels were not recorded as their results arrived: {recorded_before_save} {sorted(freshness)}')
+    freshness = {url: entry for url, entry in freshness.items() if url not in ('first-channel', 'second-channel', 'other-process-channel')}
+    if {url: entry['newest_video_id'] for url, entry in freshness.items()} != {'updated-channel': 'AAAAAAAAAAA', 'unchanged-channel': 'DDDDDDDDDDD', 'failed-channel': 'EEEEEEEEEEE'}:
+        raise ValueError(f'The freshness file did not record the newest video of every channel: {freshness}')
+    if not is_fresh(freshness['updated-channel'], 60) or is_fresh(freshness['failed-channel'], 60) or is_fresh(freshness['updated-channel'], None) or is_fresh(None, 60):
+        raise ValueError(f'The channels scraped recently were not skipped properly: {freshness}')
+
+
+def test_streaming_results():
+    # the slow channel is scheduled first, but the fast channels should be yielded before the slow channel finishes
+    urls = collections.deque(['slow-channel', 'fast-channel-1', 'fast-channel-2'])
+    def run_worker(on_channel_finished):
+        while urls:
+            with contextlib.suppress(IndexError):
+                url = urls.popleft()
+                time.sleep(1 if url == 'slow-channel' else 0.05)
+                on_channel_finished(url, ChannelResult(url, url.title(), f'{url}_file', None, None))
+    scheduler = ChannelScheduler(urls, 2, run_worker)
+    scheduler.start()
+    start_time = time.perf_counter()
+    yielded    = [(result.url, time.perf_counter() - start_time) for _, result in scheduler.as_completed((io.StringIO(),))]
+    if [url for url, _ in yielded] != ['fast-channel-1', 'fast-channel-2', 'slow-channel'] or yielded[1][1] > 0.5:
+        raise ValueError(f'The scheduler did not yield every channel as soon as it finished: {yielded}')
+    # the urls cannot be parsed, so every channel fails before the program opens a driver or makes a request
+    with tempfile.TemporaryDirectory() as temporary_directory, contextlib.redirect_stdout(io.StringIO()):
+        path_to_channel_urls_file = os.path.join(temporary_directory, 'channels.txt')
+        with open(path_to_channel_urls_file, mode='w', encoding='utf-8') as channel_urls_file:
+            channel_urls_file.write('not a youtube url\nstill not a youtube url\n')
+        list_creator = ListCreator(backend='http', check_rss_feed=False)
+        arguments    = {'number_of_threads': 1, 'min_sleep': 0, 'max_sleep': 0, 'log_subthread_status_silently': True, 'log_subthread_info_silently': True, 'job_order': 'file', 'quarantine_for_s': None}
+        results      = list_creator.create_list_from(path_to_channel_urls_file, **arguments)
+        files        = sorted(os.listdir(temporary_directory)) # the program only writes the .freshness.json, .failures.json, and .durations.json files when asked to
+        stream       = list_creator.icreate_list_from(path_to_channel_urls_file, **{**arguments, 'quarantine_for_s': 86400}) # records the failed channels
+        first_result = next(stream)
+        stream.close() # the program should still finish (and record) the other channel
+        quarantine   = load_quarantine(os.path.join(temporary_directory, 'channels.failures.json'))
+    if [result.url for result in results] != ['not a youtube url', 'still not a youtube url'] or any(result.succeeded or not isinstance(result.error, ValueError) for result in results):
+        raise ValueError(f'create_list_from() did not return a result for every channel: {results}')
+    if files != ['channels.log', 'channels.txt']:
+        raise ValueError(f'create_list_from() wrote files it was not asked to write: {files}')
+    if first_result.url != 'not a youtube url' or sorted(quarantine) != ['not a youtube url', 'still not a youtube url']:
+        raise ValueError(f'icreate_list_from() did not finish every channel after the caller stopped early: {first_result} {quarantine}')
+
+
+def test_new_channel_lane():
+    urls     = collections.deque(['https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g', 'https://www.youtube.com/channel/UC8butISFwT-Wl7EV0hUK0BQ', 'https://www.youtube.com/c/Corey', 'not a youtube url'])
+    settings = (True, True, True, True, False) # file_suffix, video_id_only, reverse_chronological, txt, csv (no markdown)
+    expected_file_names = [
+        determine_expected_file_name(urls[0], 'id',   None,                                  *settings, False),
+        determine_expected_file_name(urls[1], 'auto', {'file_name': 'freeCodeCamp.org'},     *settings, False),
+        determine_expected_file_name(urls[2], 'auto', None,                                  *settings, False),
+        determine_expected_file_name(urls[3], 'id',   None,                                  *settings, False),
+    ]
+    if expected_file_names != ['UCCezIgC97PvUuR4_gbFUs5g_reverse_chronological_video_ids_list', 'freeCodeCamp.org', None, None]:
+        raise ValueError(f'The expected output files were not determined properly: {expected_file_names}')
+    original_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+        try:
+            for file_name in ('UCCezIgC97PvUuR4_gbFUs5g_reverse_chronological_video_ids_list.txt', 'freeCodeCamp.org.txt'): # freeCodeCamp.org does not have a csv file yet
+                with open(file_name, mode='w', encoding='utf-8') as output_file:
+                    output_file.write('')
+            is_update = [has_existing_files(expected_file_name, True, False, False) for expected_file_name in expected_file_names] + [has_existing_files(expected_file_names[1], True, True, False)]
+        finally:
+            os.chdir(original_directory)
+    if is_update != [True, True, False, False, False]:
+        raise ValueError(f'The channels with existing output files were not found properly: {is_update}')
+    (update_urls, update_order), (new_urls, new_order) = split_new_channels(urls, [3, 0, 2, 1], is_update[:4])
+    if list(update_urls) != list(urls)[:2] or update_order != [3, 0] or list(new_urls) != list(urls)[2:] or new_order != [2, 1]:
+        raise ValueError(f'The channels were not split into updates and new channels properly: {update_urls} {update_order} {new_urls} {new_order}')
+    # the results of both lanes should be yielded as soon as either lane finishes a channel
+    def lane(name, delay):
+        for index in range(3):
+            time.sleep(delay)
+            yield f'{name}-{index}'
+    merged = list(merge_streams(lane('updates', 0.05), lane('new', 0.4)))
+    if sorted(merged) != sorted(['updates-0', 'updates-1', 'updates-2', 'new-0', 'new-1', 'new-2']) or merged[:3] != ['updates-0', 'updates-1', 'updates-2']:
+        raise ValueError(f'The lanes were not merged as the channels finished: {merged}')
+    # a lane that fails does not stop the results of the other lane, and its error is raised after the other lane finished
+    def failing_lane():
+        yield 'failing-0'
+        raise RuntimeError('the driver could not be launched')
+    merged = []
+    try:
+        for item in merge_streams(failing_lane(), lane('updates', 0.05)):
+            merged.append(item)
+    except RuntimeError:
+        pass
+    else:
+        raise ValueError('The error raised by a lane was not raised by merge_streams()')
+    if sorted(merged) != ['failing-0', 'updates-0', 'updates-1', 'updates-2']:
+        raise ValueError(f'The results of the other lane were lost when a lane failed: {merged}')
+
+
+def test_segmented_updates():
+    def reverse_chronological_videos(first, last):
+        # the titles look like the lines the writers use to separate videos, so the videos can only be told apart with the format the writers use
+        return [[number, f'Video Number: {number}, "{ENTRY_SEPARATOR}"\n## Video {number}', '1:00', f'https://www.youtube.com/watch?v=V{number:010d}'] for number in range(last, first - 1, -1)]
+    def read(path, newline):
+        with open(path, mode='r', newline=newline, encoding='utf-8') as file:
+            return file.read()
+    def read_every_video(file_name, file_type, newline):
+        # the output file has the newest videos, and the segments have the older videos from the newest segment to the oldest segment
+        return read(f'{file_name}.{file_type}', newline) + ''.join(read(segment, newline) for segment in list_segments(file_name, file_type))
+    def edit_notes(file_name, file_type, newline, video_id, notes):
+        # edits the file the way a user would, by filling in the Notes of one video
+        path = f'{file_name}.{file_type}'
+        with open(path, mode='r', newline=newline, encoding='utf-8') as file:
+            header  = file.readline() if file_type == 'csv' else ''
+            entries = list(iterate_entries(file, file_type))
+        for entry in entries:
+            if video_id not in ''.join(entry):
+                continue
+            if file_type == 'csv': entry[-1] = entry[-1].replace(f'{video_id},,,', f'{video_id},,,{notes}')
+            else:                  entry[:] = [line.rstrip('\n') + f' {notes}\n' if line.lstrip('# ').startswith('Notes:') else line for line in entry]
+        with open(path, mode='w', newline=newline, encoding='utf-8') as file:
+            file.write(header + ''.join(line for entry in entries for line in entry))
+    logging_locations  = (io.StringIO(),)
+    original_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+        try:
+            for file_type in ('txt', 'csv', 'md'):
+                newline = '' if file_type == 'csv' else None
+                for file_name in ('Segmented', 'Whole'):
+                    create_file(file_type, file_name, -1, newline, None, '0', logging_locations, 'Video URL', True, reverse_chronological_videos(1, 150))
+                with open(f'Whole.{file_type}', mode='r', newline=newline, encoding='utf-8') as whole_file:
+                    if file_type == 'csv': whole_file.readline()
+                    entries = list(iterate_entries(whole_file, file_type))
+                if len(entries) != 150 or 'V0000000150' not in ''.join(entries[0]) or 'V0000000149' in ''.join(entries[0]):
+                    raise ValueError(f'The {file_type} file was not split into one entry for every video: {entries[:2]}')
+                for update, first in enumerate(range(151, 391, 80)):
+                    # 150 + 80 videos moves 130 videos to segment 000001, 100 + 80 videos stays in the output file, and 180 + 80 videos moves 160 videos to segment 000002
+                    if update == 2:
+                        # the Notes a user wrote in the output file between two updates are kept, even when the video is moved to a segment
+                        for file_name in ('Segmented', 'Whole'):
+                            edit_notes(file_name, file_type, newline, 'V0000000200', 'watch the ending again')
+                    update_file(file_type, 'Segmented', -1, newline, None, str(update), logging_locations, 'Video URL', True, reverse_chronological_videos(first, first + 79), set(), False, 100)
+                    update_file(file_type, 'Whole',     -1, newline, None, str(update), logging_locations, 'Video URL', True, reverse_chronological_videos(first, first + 79), set(), False, None)
+                    if read_every_video('Segmented', file_type, newline) != read(f'Whole.{file_type}', newline):
+                        raise ValueError(f'The {file_type} output file and its segments do not have every video of the channel exactly once after update {update}')
+                segments = list_segments('Segmented', file_type)
+                if [os.path.basename(segment) for segment in segments] != [f'000002.{file_type}', f'000001.{file_type}'] or list_segments('Whole', file_type):
+                    raise ValueError(f'The {file_type} file was not split into segments properly: {segments}')
+                output = read(f'Segmented.{file_type}', newline)
+                if 'V0000000390' not in output or 'V0000000290' in output or 'watch the ending again' not in read(segments[0], newline):
+                    raise ValueError(f'The {file_type} output file does not have only the newest videos, or the edited video lost its Notes:\n{output[:1000]}')
+                # the videos in the segments are found in the index of the segments, so they are not written again (even by an update without segments)
+                old_videos = reverse_chronological_videos(391, 400) + reverse_chronological_videos(1, 2)
+                update_file(file_type, 'Segmented', -1, newline, None, 'unsegmented', logging_locations, 'Video URL', True, old_videos, set(), False, None)
+                update_file(file_type, 'Whole',     -1, newline, None, 'unsegmented', logging_locations, 'Video URL', True, old_videos, set(), False, None)
+                if list_segments('Segmented', file_type) != segments or read_every_video('Segmented', file_type, newline) != read(f'Whole.{file_type}', newline):
+                    raise ValueError(f'The {file_type} videos in the segments were written again, or the segments were removed, by an update without segments')
+                # a file written from scratch has every video, so the segments would only duplicate videos
+                create_file(file_type, 'Segmented', -1, newline, None, 'recreated', logging_locations, 'Video URL', True, reverse_chronological_videos(1, 400))
+                if list_segments('Segmented', file_type):
+                    raise ValueError(f'The {file_type} segments were not removed when the file was written from scratch')
+            if os.path.exists('Segmented.segments'):
+                raise ValueError(f'The segments directory was not removed: {os.listdir("Segmented.segments")}')
+        finally:
+            os.chdir(original_directory)
+
+
+def test_page_bottom_verification():
+    logging_locations = (io.StringIO(),)
+    # YouTube removes the continuation spinner for a moment between batches, so a missing spinner does not stop the scrolling by itself
+    num_times_elements_count_same = verify_reached_page_bottom(60, 30, -1, 3, False, logging_locations)
+    if num_times_elements_count_same != -1:
+        raise ValueError(f'A page that loaded new videos was treated as the page bottom: {num_times_elements_count_same}')
+    for expected in (0, 1, 2, 3):
+        num_times_elements_count_same = verify_reached_page_bottom(60, 60, num_times_elements_count_same, 3, False, logging_locations)
+        if num_times_elements_count_same != expected:
+            raise ValueError(f'The page bottom was not verified the expected number of times: {num_times_elements_count_same} != {expected}')
+
+
+class StubChannelPage:
+    '''
+    Stands in for a WebDriver on a channel's videos page: every scroll loads the next `batch_size` videos, and the scripts in scroller.py are answered
+    the way the page answers them. The polls in `spinner_gaps` load nothing and report no continuation spinner (like YouTube between two batches).
+    '''
+    def __init__(self, videos, batch_size=30, spinner_gaps=()):
+        self.videos       = videos
+        self.batch_size   = batch_size
+        self.spinner_gaps = set(spinner_gaps)
+        self.loaded       = min(batch_size, len(videos))
+        self.removed      = 0 # videos removed from the top of the page by HARVEST_AND_PRUNE_VIDEOS_SCRIPT
+        self.harvested    = 0
+        self.polls        = 0
+        self.visited      = set()
+    def page_rows(self):
+        return self.videos[self.removed:self.loaded]
+    def set_script_timeout(self, timeout):
+        pass
+    def execute_async_script(self, script, current_count, timeout):
+        if script != scroller.WAIT_FOR_NEW_VIDEOS_SCRIPT:
+            raise ValueError(f'Unexpected async script: {script[:50]}')
+        self.polls += 1
+        if self.polls not in self.spinner_gaps:
+            self.loaded = min(self.loaded + self.batch_size, len(self.videos))
+        has_continuation = self.polls not in self.spinner_gaps and self.loaded < len(self.videos)
+        return [len(self.page_rows()), has_continuation]
+    def execute_script(self, script, *arguments):
+        if script == scroller.STORE_VISITED_VIDEOS_SCRIPT:
+            self.visited = set(arguments[0])
+        elif script == scroller.FOUND_VISITED_VIDEO_SCRIPT:
+            return any(scroller.format_video_url(video_url) in self.visited for _, video_url, _ in self.page_rows()[arguments[0]:])
+        elif script == scroller.EXTRACT_VIDEO_DATA_SCRIPT:
+            return [list(video) for video in self.page_rows()]
+        elif script == scroller.HARVEST_AND_PRUNE_VIDEOS_SCRIPT:
+            new_videos     = self.videos[self.harvested:self.loaded]
+            self.harvested = self.loaded
+            self.removed   = max(self.removed, self.loaded - arguments[0])
+            return [[list(video) for video in new_videos], len(self.page_rows())]
+        elif script.startswith('return document.querySelectorAll("ytd-rich-grid-media").length'):
+            return len(self.page_rows())
+        else:
+            raise ValueError(f'Unexpected script: {script[:50]}')
+
+def test_scroll_until_break():
+    def channel_videos(count):
+        # newest video first (like the channel's videos page), every 7th video is a short, and every 10th video does not have a duration
+        return [[f'Video {number}', f'https://www.youtube.com/{"shorts/" if number % 7 == 0 else "watch?v="}V{number:010d}', 'N/A' if number % 10 == 0 else '1:00'] for number in range(count, 0, -1)]
+    logging_locations  = (io.StringIO(),)
+    videos             = channel_videos(100)
+    original_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+        try:
+            for prune_loaded_videos in (False, True):
+                # scroll to the bottom of a new channel: 30 -> 60 -> (spinner gap) -> 90 -> 100 videos, then the same 100 videos on 4 polls in a row
+                page         = StubChannelPage(videos, spinner_gaps={2})
+                found_videos = scroller.scroll_until_break('url', page, 0.8, logging_locations, 3, True, 'NewChannel', False, False, False, prune_loaded_videos, False)[0]
+                if found_videos != videos or page.polls != 8:
+                    raise ValueError(f'The program did not scroll to the bottom of the page (prune_loaded_videos={prune_loaded_videos}): {len(found_videos)} videos after {page.polls} polls')
+                if prune_loaded_videos and page.page_rows() != videos[-scroller.VIDEOS_TO_KEEP_ON_PAGE:]:
+                    raise ValueError(f'The last {scroller.VIDEOS_TO_KEEP_ON_PAGE} videos were not kept on the page as an anchor for the next batch: {len(page.page_rows())} videos on the page')
+            # update an existing channel: the oldest 147 of 200 videos are already in the file, and the newest of them (a short) loads with the second batch
+            videos = channel_videos(200)
+            create_file('txt', 'ExistingChannel', -1, None, None, '0', logging_locations, 'Video URL', True, [[number, title, duration, scroller.format_video_url(video_url)] for number, (title, video_url, duration) in zip(range(147, 0, -1), videos[53:])])
+            for prune_loaded_videos in (False, True):
+                page         = StubChannelPage(videos)
+                found_videos = scroller.scroll_until_break('url', page, 0.8, logging_locations, 3, False, 'ExistingChannel', True, False, False, prune_loaded_videos, False)[0]
+                if page.polls != 1 or found_videos != videos[:60]:
+                    raise ValueError(f'The program did not stop scrolling after finding a video already in the file (prune_loaded_videos={prune_loaded_videos}): {len(found_videos)} videos after {page.polls} polls')
+        finally:
+            os.chdir(original_directory)
+
+
+def test_rss_feed_fallback():
+    # the feed lists a new short (and a new video) that the channel's videos page might not list, so the program loads the videos page instead of trusting the feed
+    feed_with_short = RECORDED_FEED.replace(
+        ' <entry><yt:videoId>EEEEEEEEEEE</yt:videoId>',
+        ' <entry><yt:videoId>FFFFFFFFFFF</yt:videoId><title>New short</title><link rel="alternate" href="https://www.youtube.com/shorts/FFFFFFFFFFF"/></entry>\n <entry><yt:videoId>EEEEEEEEEEE</yt:videoId>',
+    )
+    feed = fetcher.parse_feed(feed_with_short.encode('utf-8'))
+    if feed.shorts != {'https://www.youtube.com/watch?v=FFFFFFFFFFF', 'https://www.youtube.com/watch?v=BBBBBBBBBBB'}:
+        raise ValueError(f'The shorts in the feed were not found: {feed.shorts}')
+    if ListCreator().check_rss_feed is not False:
+        raise ValueError('The RSS feed should only be checked when the check_rss_feed argument is set to True')
+    original_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        os.chdir(temporary_directory)
+        try:
+            with open('CoreySchafer.html', mode='w', encoding='utf-8') as page_source_file:
+                page_source_file.write(SNAPSHOT_PAGE_SOURCE)
+            _, (_, file_name) = ListCreator(md=False, video_id_only=True).create_list_from_snapshot('CoreySchafer.html', log_silently=True)
+            new_short_videos  = select_feed_videos(feed, file_name, True, True, False, False)
+            # the short that is already in the files (BBBBBBBBBBB) does not matter, only the new videos do
+            new_video_feed    = feed._replace(videos=feed.videos[1:])
+            new_feed_videos   = select_feed_videos(new_video_feed, file_name, True, True, False, False)
+        finally:
+            os.chdir(original_directory)
+    if new_short_videos is not None or [video_url for _, video_url, _ in new_feed_videos] != ['https://www.youtube.com/watch?v=EEEEEEEEEEE', 'https://www.youtube.com/watch?v=AAAAAAAAAAA']:
+        raise ValueError(f'The program did not fall back to the videos page when the feed had a new short:\n{new_short_videos}\n{new_feed_videos}')
+
+
+class StubBrowserOptions:
+    def __init__(self):
+        self.preferences          = {}
+        self.arguments            = []
+        self.experimental_options = {}
+    def set_preference(self, preference, value):
+        self.preferences[preference] = value
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+    def add_experimental_option(self, name, value):
+        self.experimental_options[name] = value
+
+class StubBrowser:
+    def __init__(self, options=None, chrome_options=None, **_):
+        self.options       = options or chrome_options
+        self.cdp_commands  = []
+    def execute_cdp_cmd(self, command, parameters):
+        self.cdp_commands.append((command, parameters))
+    def set_window_size(self, *_):
+        pass
+    def set_window_position(self, *_):
+        pass
+    def quit(self):
+        pass
+
+class LaunchedBrowser(Exception):
+    pass
+
+class StopAfterLaunchDriverPool:
+    '''Launches the browser the way the program does, then stops execute() before the browser loads the channel.'''
+    def __init__(self):
+        self.browsers = []
+    def acquire(self, driver_key, launch_driver):
+        self.browsers.append(launch_driver())
+        raise LaunchedBrowser()
+    def release(self, driver_key, driver):
+        pass
+
+def launch_stub_browser(user_driver, lean_profile):
+    stub_webdriver = types.SimpleNamespace(Firefox=StubBrowser, Chrome=StubBrowser, Opera=StubBrowser, Safari=StubBrowser, Edge=StubBrowser, ChromeOptions=StubBrowserOptions)
+    stub_selenium  = types.SimpleNamespace(webdriver=types.SimpleNamespace(firefox=types.SimpleNamespace(options=types.SimpleNamespace(Options=StubBrowserOptions))), common=logic.selenium.common)
+    real_webdriver, real_selenium = logic.webdriver, logic.selenium
+    logic.webdriver, logic.selenium = stub_webdriver, stub_selenium
+    driver_pool = StopAfterLaunchDriverPool()
+    try:
+        instance_attributes = ListCreator(driver=user_driver, lean_profile=lean_profile)._ListCreator__determine_instance_attributes()
+        logic.execute(collections.deque(['youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g']), 'auto', True, *instance_attributes, threading.Lock(), driver_pool=driver_pool)
+    except LaunchedBrowser:
+        pass
+    finally:
+        logic.webdriver, logic.selenium = real_webdriver, real_selenium
+    return driver_pool.browsers[0]
+
+def test_lean_profile_launch():
+    firefox = launch_stub_browser('firefox', True)
+    if {preference: firefox.options.preferences.get(preference) for preference in LEAN_FIREFOX_PREFERENCES} != LEAN_FIREFOX_PREFERENCES:
+        raise ValueError(f'The lean profile preferences were not applied to firefox: {firefox.options.preferences}')
+    chrome = launch_stub_browser('chrome', True)
+    if not set(LEAN_CHROMIUM_ARGUMENTS) <= set(chrome.options.arguments) or 'prefs' not in chrome.options.experimental_options:
+        raise ValueError(f'The lean profile arguments were not applied to chrome: {chrome.options.arguments} {chrome.options.experimental_options}')
+    if ('Network.setBlockedURLs', {'urls': list(LEAN_BLOCKED_URL_PATTERNS)}) not in chrome.cdp_commands:
+        raise ValueError(f'The lean profile did not block fonts and third party scripts in chrome: {chrome.cdp_commands}')
+    firefox, chrome = launch_stub_browser('firefox', False), launch_stub_browser('chrome', False)
+    if firefox.options.preferences or set(LEAN_CHROMIUM_ARGUMENTS) & set(chrome.options.arguments) or chrome.cdp_commands:
+        raise ValueError(f'The lean profile was applied without the lean_profile argument: {firefox.options.preferences} {chrome.options.arguments} {chrome.cdp_commands}')
+
+
+def test_tab_pool_slow_launch():
+    class FakeBrowser:
+        def __init__(self):
+            self.window_handles        = ['window-0']
+            self.current_window_handle = 'window-0'
+            self.scripts               = []
+            self.switch_to             = types.SimpleNamespace(window=lambda handle: setattr(self, 'current_window_handle', handle))
+        def execute_script(self, script, *args):
+            if script.startswith('window.open'): self.window_handles.append(f'window-{len(self.window_handles)}')
+            else:                                self.scripts.append(script)
+            return ['result']
+    launch_started, finish_launch = threading.Event(), threading.Event()
+    opened_browsers               = []
+    def open_slow_browser():
+        launch_started.set()
+        finish_launch.wait(10)
+        opened_browsers.append(FakeBrowser())
+        return opened_browsers[-1]
+    def open_fast_browser():
+        opened_browsers.append(FakeBrowser())
+        return opened_browsers[-1]
+    pool       = TabPool(tabs_per_driver=2)
+    slow_tabs  = []
+    slow_key   = ('firefox', True, False)
+    threads    = [threading.Thread(target=lambda: slow_tabs.append(pool.acquire(slow_key, open_slow_browser))) for _ in range(2)]
+    threads[0].start()
+    launch_started.wait(10)
+    threads[1].start()
+    # a thread acquiring a tab for another configuration does not wait for the slow browser to launch
+    start_time = time.monotonic()
+    fast_tab   = pool.acquire(('chrome', True, False), open_fast_browser)
+    if time.monotonic() - start_time > 1 or slow_tabs:
+        raise ValueError('Acquiring a tab waited for another browser to launch')
+    finish_launch.set()
+    for thread in threads:
+        thread.join(10)
+    # the second thread reserved a tab in the browser that was launching instead of launching its own browser
+    if len(opened_browsers) != 2 or len(slow_tabs) != 2 or slow_tabs[0].browser is not slow_tabs[1].browser or slow_tabs[0].handle == slow_tabs[1].handle:
+        raise ValueError(f'The threads did not share the browser that was launching: {opened_browsers} {slow_tabs}')
+    # the async script is sent to the driver as part of the script (instead of being compiled inside the page)
+    fast_tab.execute_async_script('arguments[arguments.length - 1](42);')
+    if 'new Function' in opened_browsers[0].scripts[0] or 'arguments[arguments.length - 1](42);' not in opened_browsers[0].scripts[0]:
+        raise ValueError(f'The async script was not sent to the driver properly: {opened_browsers[0].scripts}')
+
+
+def test_process_channel_timeout():
+    # every worker process sleeps for a minute before the second channel it scrapes, so the second channel runs out of time
+    # and the third channel is scraped by a new worker process (which does not sleep before its first channel)
+    urls                = collections.deque(['not a youtube url', 'hanging channel', 'still not a youtube url'])
+    instance_attributes = ListCreator(backend='http', check_rss_feed=False)._ListCreator__determine_instance_attributes()
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path_to_log_file = os.path.join(temporary_directory, 'channels.log')
+        start_time       = time.perf_counter()
+        results          = ProcessChannelScheduler(1, 1, channel_timeout_s=2).run(urls, (io.StringIO(),), 'auto', instance_attributes, 0, 0, (2, 60), path_to_log_file, -1, True, False, None)
+        seconds          = time.perf_counter() - start_time
+    if [result.url for result in results] != list(urls):
+        raise ValueError(f'The worker processes did not send back a result for every channel: {results}')
+    if not isinstance(results[1].error, TimeoutError) or any('ValueError' not in str(results[index].error) for index in (0, 2)):
+        raise ValueError(f'The channel that ran out of time did not fail with a TimeoutError: {results}')
+    if seconds > 30:
+        raise ValueError(f'The program waited {seconds} seconds for the channel that ran out of time instead of stopping its worker process')
+    # only the worker process that hangs is stopped (together with the driver it started), so the slow channel that is still running in the other worker process
+    # when the hanging channel runs out of time (from 1 to 2.8 seconds) finishes, and is only scraped once
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        def scrape_or_hang_in_process(url, *_):
+            with open(os.path.join(temporary_directory, 'started.txt'), mode='a', encoding='utf-8') as started_file:
+                started_file.write(url + '\n')
+            if url == 'hanging channel':
+                driver = subprocess.Popen(['sleep', '60']) # stands in for the driver started by the worker process
+                with open(os.path.join(temporary_directory, 'driver.pid'), mode='w', encoding='utf-8') as driver_pid_file:
+                    driver_pid_file.write(str(driver.pid))
+                time.sleep(60)
+            time.sleep(1.8 if url == 'slow channel' else 1)
+            return ChannelResult(url, 'Channel', 'Channel', None, None)
+        scrape_channel_in_process        = process_pool.scrape_channel_in_process
+        process_pool.scrape_channel_in_process = scrape_or_hang_in_process # the worker processes are forked, so they use the stand-in
+        try:
+            results = ProcessChannelScheduler(2, 1, channel_timeout_s=2).run(collections.deque(['hanging channel', 'quick channel', 'slow channel']), (io.StringIO(),))
+        finally:
+            process_pool.scrape_channel_in_process = scrape_channel_in_process
+        with open(os.path.join(temporary_directory, 'started.txt'), mode='r', encoding='utf-8') as started_file:
+            started_urls = started_file.read().splitlines()
+        with open(os.path.join(temporary_directory, 'driver.pid'), mode='r', encoding='utf-8') as driver_pid_file:
+            driver_pid = int(driver_pid_file.read())
+    if not isinstance(results[0].error, TimeoutError) or not results[2].succeeded or sorted(started_urls) != ['hanging channel', 'quick channel', 'slow channel']:
+        raise ValueError(f'The channel running next to the channel that ran out of time was stopped or scraped again: {results} {started_urls}')
+    try:
+        with open(f'/proc/{driver_pid}/stat', mode='r', encoding='utf-8') as driver_stat_file:
+            driver_is_running = driver_stat_file.read().split(')')[-1].split()[0] != 'Z' # a stopped process stays a zombie until it is reaped
+    except FileNotFoundError:
+        driver_is_running = False
+    if driver_is_running:
+        raise ValueError('The driver started by the worker process that ran out of time is still running')
+
+
+def test_fatal_errors():
+    launch_error = RuntimeError(Common.selenium_launch_error)
+    if not is_fatal(launch_error) or not is_fatal(BrokenProcessPool('crashed')) or is_fatal(RuntimeError('YouTube did not respond')) or RetryPolicy(max_attempts=3).should_retry(1, launch_error):
+        raise ValueError('The driver launch error was not classified as fatal (or another error was)')
+    # the driver cannot be launched, so the thread should stop after the first attempt at the first channel instead of trying every channel
+    failed_attempts = []
+    def fail_to_launch_driver(url, http, base_url=None):
+        failed_attempts.append(url)
+        raise launch_error
+    results             = []
+    instance_attributes = ListCreator(backend='http', check_rss_feed=False)._ListCreator__determine_instance_attributes()
+    urls                = collections.deque(['https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g', 'https://www.youtube.com/channel/UC8butISFwT-Wl7EV0hUK0BQ'])
+    fetch_channel_page  = logic.fetcher.fetch_channel_page
+    thread_logging      = (ThreadWithResult.log_thread_status, ThreadWithResult.log_files)
+    logic.fetcher.fetch_channel_page   = fail_to_launch_driver
+    ThreadWithResult.log_thread_status, ThreadWithResult.log_files = False, None # the log file of an earlier test is already closed
+    try:
+        scheduler = ChannelScheduler(urls, 1, lambda on_channel_finished: logic.execute(urls, 'auto', True, *instance_attributes, threading.Lock(), retry_policy=RetryPolicy(max_attempts=3, base_delay_s=0.01), on_channel_finished=on_channel_finished))
+        scheduler.start()
+        scheduler.wait((io.StringIO(),))
+    except RuntimeError as error_message:
+        raised_error = error_message
+    else:
+        raised_error = None
+    finally:
+        logic.fetcher.fetch_channel_page   = fetch_channel_page
+        ThreadWithResult.log_thread_status, ThreadWithResult.log_files = thread_logging
+    # the error is raised once in this thread after every channel has a result, and the channel that was not scraped fails with the same error
+    results = [future.result() for future in scheduler.futures]
+    if raised_error is not launch_error:
+        raise ValueError(f'The fatal error was not raised by wait(): {raised_error!r}')
+    if len(failed_attempts) != 1 or [(result.attempts, result.error is launch_error) for result in results] != [(1, True), (0, True)]:
+        raise ValueError(f'The program retried a channel after a fatal error, or started another thread after the first thread stopped: {failed_attempts} {results}')
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        path_to_quarantine_file = os.path.join(temporary_directory, 'channels.failures.json')
+        save_quarantine(path_to_quarantine_file, {}, results)
+        if os.path.exists(path_to_quarantine_file):
+            raise ValueError(f'The channels that failed because of a fatal error were quarantined: {load_quarantine(path_to_quarantine_file)}')
+
+
+def test_connection_pool_reuse():
+    created_pools      = []
+    used_pools         = []
+    def create_connection_pool(*args, **kwargs):
+        created_pools.append(create_pool(*args, **kwargs))
+        return created_pools[-1]
+    def fail_to_fetch_channel_page(url, http, base_url=None):
+        used_pools.append(http)
+        raise RuntimeError('YouTube did not respond')
+    urls               = ['https://www.youtube.com/channel/UCCezIgC97PvUuR4_gbFUs5g', 'https://www.youtube.com/channel/UC8butISFwT-Wl7EV0hUK0BQ']
+    create_pool, fetch_channel_page = logic.fetcher.create_connection_pool, logic.fetcher.fetch_channel_page
+    logic.fetcher.create_connection_pool, logic.fetcher.fetch_channel_page = create_connection_pool, fail_to_fetch_channel_page
+    try:
+        # the selenium backend only needs a connection pool to check the RSS feed
+        launch_stub_browser('firefox', False)
+        if created_pools:
+            raise ValueError('A connection pool was created for the selenium backend without the RSS feed check')
+        # every channel a worker scrapes reuses the same connection pool
+        instance_attributes = ListCreator(backend='http', check_rss_feed=False)._ListCreator__determine_instance_attributes()
+        logic.execute(collections.deque(urls), 'auto', True, *instance_attributes, threading.Lock(), retry_policy=RetryPolicy(max_attempts=1))
+        if len(created_pools) != 1 or used_pools != created_pools * 2:
+            raise ValueError(f'The channels of a worker did not share one connection pool: {created_pools} {used_pools}')
+        # a connection pool passed in by the caller (the worker process) is used instead, and kept open for the next channel
+        with create_pool() as http:
+            used_pools.clear()
+            logic.execute(collections.deque(urls), 'auto', True, *instance_attributes, threading.Lock(), retry_policy=RetryPolicy(max_attempts=1), connection_pool=http)
+            if len(created_pools) != 1 or used_pools != [http, http]:
+                raise ValueError(f'The connection pool passed to execute() was not used: {created_pools} {used_pools}')
+    finally:
+        logic.fetcher.create_connection_pool, logic.fetcher.fetch_channel_page = create_pool, fetch_channel_page
+
 
 if __name__ == '__main__':
     main()
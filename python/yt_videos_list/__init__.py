@@ -5,17 +5,35 @@ URLs uploaded by a channel) with end-to-end web scraping - no API tokens require
 
 import sys
 import time
+import asyncio
+import weakref
 from collections import deque
 from typing import (
     Any,
+    Callable,
+    Generator,
+    Iterator,
     List,
     Optional,
+    TextIO,
     Tuple,
 )
 
 from save_thread_result import ThreadWithResult
 
-from . import logic
+from . import fetcher, logic, snapshot
+from .driver_pool   import DriverPool
+from .tab_pool      import TabPool
+from .scheduler     import ChannelResult, ChannelScheduler, merge_streams
+from .process_pool  import ProcessChannelScheduler
+from .memory_guard  import MemoryGuard
+from .rate_limiter  import RateLimiter
+from .job_queue     import JobQueue, LeasedUrls
+from .sharding      import select_shard
+from .retry         import RetryPolicy, determine_quarantine_file, is_fatal, is_quarantined, load_quarantine, save_quarantine
+from .freshness     import FreshnessRecorder, determine_freshness_file, is_fresh, load_freshness
+from .batching      import determine_expected_file_name, has_existing_files, split_new_channels
+from .job_order     import JOB_ORDERS, determine_durations_file, load_durations, order_urls, save_durations
 from .custom_logger import log, log_time_taken
 
 
@@ -106,8 +124,10 @@ class ListCreator:
     Options for the `scroll_pause_time` argument` are any float values greater than 0 (defaults to 0.8)
       * CAUTION: reducing this value too much will result in the program not capturing all the videos,
         so be careful! Experiment :)
-      * The value you provide will be how long (in seconds) the program waits before
-        trying to scroll the videos list page down for the channel you want to scrape.
+      * The value you provide will be the MAXIMUM amount of time (in seconds) the program waits for
+        new videos to load before trying to scroll the videos list page down for the channel you want to scrape.
+        -> the program continues scrolling as soon as the next batch of videos loads, so it usually
+           waits much less than scroll_pause_time seconds after each scroll.
       * For fast internet connections, you may want to reduce the value,
         and for slow connections you may want to increase the value.
           -> scroll_pause_time=0.8 (default)
@@ -115,6 +135,10 @@ class ListCreator:
     Options for the `verify_page_bottom_n_times` argument are any int values greater than 0 (defaults to 3)
       * NOTE: this argument is only used when CREATING a new file for a
               new channel, and is unused when UPDATING an existing file for an already scraped channel.
+      * NOTE: when YouTube stops showing the loading spinner at the bottom of the videos list, the program only waits a quarter of
+              scroll_pause_time for new videos after each scroll, so verifying the bottom of the page takes less time
+              (the program still needs the same number of videos `verify_page_bottom_n_times` times in a row to stop scrolling,
+              since YouTube also removes the loading spinner for a moment between batches of videos).
       * The value you provide will be how many times the program needs to verify it acually reached the
         bottom of the page before accepting it is the bottom of the page, and starting to write the information
         to the output file(s).
@@ -149,6 +173,73 @@ class ListCreator:
         -> https://medium.com/@bramblexu/three-ways-to-close-buffer-for-stdout-stdin-stderr-in-python-8be694bd2737
         -> https://www.quora.com/In-C-what-does-buffering-I-O-or-buffered-I-O-mean
 
+    Options for the `prune_loaded_videos` argument are
+      * False (default) - keep every loaded video on the page until the program finishes scrolling
+      * True            - save the information for newly loaded videos after every scroll, then remove those videos from the page
+        -> this keeps the browser's memory usage roughly constant regardless of how many videos the channel uploaded,
+           so it is useful when scraping channels with THOUSANDS of videos (especially with create_list_from())
+          -> prune_loaded_videos=False (default) OR prune_loaded_videos=True
+
+    Options for the `save_page_source` argument are
+      * False (default) - does not save the page after scrolling
+      * True            - save the page source to a {file_name}.html file after the program finishes scrolling
+        -> use the create_list_from_snapshot() method to rewrite the output files from the saved page without a driver
+        -> NOTE the saved page will not contain the videos removed from the page if `prune_loaded_videos` is True
+          -> save_page_source=False (default) OR save_page_source=True
+
+    Options for the `backend` argument are
+      * 'selenium' (default) - scrape the channel by scrolling through the channel's videos page with a Selenium driver
+      * 'http'               - request the channel's videos directly from YouTube without opening a browser
+        -> this is much faster and uses much less memory (especially for channels with only a few videos),
+           but the `driver`, `headless`, `cookie_consent`, `scroll_pause_time`, `verify_page_bottom_n_times`,
+           `prune_loaded_videos`, and `save_page_source` arguments do not apply to the http backend
+          -> backend='selenium' (default) OR backend='http'
+
+    Options for the `check_rss_feed` argument are
+      * False (default) - always load the channel's videos page
+      * True            - when updating pre-existing files, check the channel's RSS feed (which lists the channel's ~15 newest videos) first,
+                          and update the files directly from the feed (without opening a driver) if the feed lists every new video
+        -> the feed is only available for urls with the channel ID (youtube.com/channel/UC...) or the user name (youtube.com/user/...),
+           so the program always loads the channel's videos page for every other url
+        -> the feed also lists shorts, which the channel's videos page does not always list, so the program loads the channel's videos page
+           if any new video in the feed is a short
+        -> NOTE the feed does not include the video durations, so the program stores the duration as "N/A" for videos found in the feed
+          -> check_rss_feed=False (default) OR check_rss_feed=True
+
+    Options for the `reuse_drivers` argument are
+      * False (default) - open a new driver for every create_list_for() call (and every create_list_from() thread), and close it when the method finishes
+      * True            - keep the drivers open after every method call and reuse them for the next channel (launching a browser can take longer than scraping the channel)
+        -> every driver is checked before it is reused, and a driver that crashed is replaced with a new driver
+        -> use the ListCreator instance as a context manager (or call the close() method) to close the drivers when you are done:
+             with ListCreator(reuse_drivers=True) as lc:
+                 for url in urls:
+                     lc.create_list_for(url)
+          -> reuse_drivers=False (default) OR reuse_drivers=True
+
+    Options for the `max_driver_uses` argument are
+      * any integer greater than 0 - the maximum number of channels the same driver scrapes before the program closes it and opens a new driver
+        (only applies when `reuse_drivers` is True, since long-lived browser sessions slowly use more and more memory)
+          -> max_driver_uses=25 (default)
+
+    Options for the `lean_profile` argument are
+      * False (default) - load the channel's videos page with every image, font, and script (like a normal browser)
+      * True            - block thumbnails, video previews, web fonts, and third party ad and tracking scripts, and disable animations
+        -> the program only needs the text of the page (video titles, urls, and durations), so the page loads faster,
+           uses less bandwidth, and each browser uses less memory (so you can run more threads with create_list_from())
+        -> supported by firefox, chrome, brave, and opera (safari and edge ignore this argument)
+          -> lean_profile=False (default) OR lean_profile=True
+
+    Options for the `segment_size` argument are
+      * None (default)                 - every update of a reverse chronological file rewrites the whole file, since the new videos go at the top of the file
+      * any integer of at least 100    - once the output file has more than 2 * `segment_size` videos, the program moves every video except the newest `segment_size` videos
+                                         to a numbered segment in a `{file_name}.segments` directory next to the output file (segment 000001 has the oldest videos)
+        -> updating a channel only reads and rewrites the newest videos in the output file instead of every video the channel ever uploaded
+           (only applies when `reverse_chronological` is True, since new videos are appended to a chronological file anyway)
+        -> every video is in exactly one file, so the Watched, Watch again later, and Notes you write for a video are never overwritten
+        -> do NOT delete the `{file_name}.segments` directory, since it has the only copy of the older videos
+           (its index.{extension}.txt file lists the videos in the segments, so updates do not need to read the segments)
+          -> segment_size=None (default) OR segment_size=1000
+
     #####################################################################################################
 
     WORKING EXAMPLES:
@@ -214,6 +305,14 @@ class ListCreator:
         cookie_consent:                  bool            = False,
         verify_page_bottom_n_times:      int             = 3,
         file_buffering:                  int             = -1,
+        prune_loaded_videos:             bool            = False,
+        save_page_source:                bool            = False,
+        backend:                         str             = 'selenium',
+        check_rss_feed:                  bool            = False,
+        reuse_drivers:                   bool            = False,
+        max_driver_uses:                 int             = 25,
+        lean_profile:                    bool            = False,
+        segment_size:                    Optional[int]   = None,
     ) -> None:
         '''
         Initializes an instance of ListCreator by setting the attributes of the instance to the provided arguments,
@@ -233,6 +332,15 @@ class ListCreator:
         self.cookie_consent             = cookie_consent
         self.verify_page_bottom_n_times = max(1, int(verify_page_bottom_n_times))
         self.file_buffering             = file_buffering
+        self.prune_loaded_videos        = prune_loaded_videos
+        self.save_page_source           = save_page_source
+        self.backend                    = backend
+        self.check_rss_feed             = check_rss_feed
+        self.reuse_drivers              = reuse_drivers
+        self.max_driver_uses            = max(1, int(max_driver_uses))
+        self.lean_profile               = lean_profile
+        self.segment_size               = max(100, int(segment_size)) if segment_size is not None else None # smaller segments would only add files without saving much rewriting
+        self._driver_pool: Optional[DriverPool] = None
         all_video_data_in_memory_but_no_video_data_returned  = 'WARNING! You set the all_video_data_in_memory attribute to True but the video_data_returned attribute is False.\nThe program will scrape the ENTIRE channel (even if you have pre-existing files for the channel) BUT will not return the video_data as a return value.\n\nIf you want the video_data returned,                    set the video_data_returned attribute to True.\nIf you do not want to always scrape the entire channel, set the all_video_data_in_memory attribute to False.\n\n\n\n'
         not_all_video_data_in_memory_but_video_data_returned = 'WARNING! The all_video_data_in_memory attribute is False but you set the video_data_returned attribute to True.\nThe program will NOT scrape the ENTIRE channel if pre-existing files for the channel exist, BUT WILL return the video_data as a return value.\nIf pre-existing files for the channel do NOT exist, then the program WILL return video_data for the ENTIRE channel.\n\nIf you want the video_data for the ENTIRE channel ALWAYS returned, set the all_video_data_in_memory attribute to True.\nIf you do not want any video_data returned,                        set the video_data_returned      attribute to False.\n\n\n\n'
         video_data_returned_information                      = 'NOTE! The video_data_returned attribute is set to True, so the program will return the video information for all videos that LOAD when the program runs.\n\nIf you set the all_video_data_in_memory attribute to True: the program will ALWAYS return video_data for ALL videos uploaded to the channel.\nIf you set the all_video_data_in_memory attribute to False:\n  - the program will return video_data for the videos that LOAD for the channel IF pre-existing files for the channel DO exist (will not always include ALL videos uploaded to the channel)\n  - the program will return video_data for ALL videos uploaded to the channel IF pre-existing files for the channel DO NOT exist\n\n\n\n'
@@ -250,7 +358,7 @@ class ListCreator:
         For more information, see: https://docs.python.org/3/reference/datamodel.html#object.__repr__
         '''
         formatted_driver = f"'{self.driver}'" if self.driver else None
-        return f'''{self.__class__.__name__}(txt={self.txt}, csv={self.csv}, md={self.markdown}, file_suffix={self.file_suffix}, all_video_data_in_memory={self.all_video_data_in_memory}, video_data_returned={self.video_data_returned}, video_id_only={self.video_id_only}, reverse_chronological={self.reverse_chronological}, headless={self.headless}, scroll_pause_time={self.scroll_pause_time}, driver={formatted_driver}, cookie_consent={self.cookie_consent}, verify_page_bottom_n_times={self.verify_page_bottom_n_times}, file_buffering={self.file_buffering})'''
+        return f'''{self.__class__.__name__}(txt={self.txt}, csv={self.csv}, md={self.markdown}, file_suffix={self.file_suffix}, all_video_data_in_memory={self.all_video_data_in_memory}, video_data_returned={self.video_data_returned}, video_id_only={self.video_id_only}, reverse_chronological={self.reverse_chronological}, headless={self.headless}, scroll_pause_time={self.scroll_pause_time}, driver={formatted_driver}, cookie_consent={self.cookie_consent}, verify_page_bottom_n_times={self.verify_page_bottom_n_times}, file_buffering={self.file_buffering}, prune_loaded_videos={self.prune_loaded_videos}, save_page_source={self.save_page_source}, backend='{self.backend}', check_rss_feed={self.check_rss_feed}, reuse_drivers={self.reuse_drivers}, max_driver_uses={self.max_driver_uses}, lean_profile={self.lean_profile}, segment_size={self.segment_size})'''
 
 
     def __str__(
@@ -278,6 +386,14 @@ class ListCreator:
           cookie_consent             = {self.cookie_consent}
           verify_page_bottom_n_times = {self.verify_page_bottom_n_times}
           file_buffering             = {self.file_buffering}
+          prune_loaded_videos        = {self.prune_loaded_videos}
+          save_page_source           = {self.save_page_source}
+          backend                    = '{self.backend}'
+          check_rss_feed             = {self.check_rss_feed}
+          reuse_drivers              = {self.reuse_drivers}
+          max_driver_uses            = {self.max_driver_uses}
+          lean_profile               = {self.lean_profile}
+          segment_size               = {self.segment_size}
 
         To recreate instance, use:
         >>> {self.__repr__()}
@@ -361,7 +477,47 @@ class ListCreator:
                     -> and the `reverse_chronological` instance attribute is False, the output file name will be:  CoreySchafer.EXT
         '''
         instance_attributes           = self.__determine_instance_attributes()
-        video_data, write_information = logic.execute(deque([url]), file_name, log_silently, *instance_attributes, _DummyLock())
+        video_data, write_information = logic.execute(deque([url]), file_name, log_silently, *instance_attributes, _DummyLock(), driver_pool=self.__determine_driver_pool())
+        if self.video_data_returned:
+            return (video_data,    write_information)
+        return ([[0, '', '', '']], write_information) # return dummy video_data
+
+
+    def create_list_from_snapshot(
+        self,
+        path_to_page_source: str,
+        url: Optional[str] = None,
+        log_silently: bool = False,
+        file_name: str = 'auto',
+    ) -> Tuple[
+        Optional[
+            List[
+                List[int|str] # [int, str, str, str]
+            ]
+        ],
+        Tuple[
+            str,
+            str,
+        ]
+    ]:
+        '''
+        The create_list_from_snapshot() method creates a list from a saved copy of a channel's videos page
+        (for example, a page saved with the `save_page_source` instance attribute set to True) WITHOUT opening a driver.
+        This is useful to rewrite the output files for a channel, or to create the output files on a machine without a browser.
+        The method uses lxml to read the saved page if lxml is installed, and falls back to the slower html.parser module if it is not.
+
+        The return value and the `log_silently` and `file_name` arguments are the same as the create_list_for() method:
+          >>> help(ListCreator.create_list_for)
+
+        The `url` argument is the url of the channel the saved page belongs to. If you do not provide a url, the program
+        uses the canonical url saved in the page (raises a ValueError if the saved page does not have a canonical url).
+        '''
+        page_source = snapshot.read_page_source(path_to_page_source)
+        url         = url or snapshot.extract_channel_information(page_source)[1]
+        if url is None:
+            raise ValueError(f'The page saved in {path_to_page_source} does not have a canonical url for the channel.\nPlease rerun this method with the url argument set to the url of the channel the saved page belongs to.\n\n\n\n')
+        instance_attributes           = self.__determine_instance_attributes()
+        video_data, write_information = logic.execute(deque([url]), file_name, log_silently, *instance_attributes, _DummyLock(), page_source=page_source)
         if self.video_data_returned:
             return (video_data,    write_information)
         return ([[0, '', '', '']], write_information) # return dummy video_data
@@ -377,12 +533,36 @@ class ListCreator:
         log_subthread_status_silently:     bool               = False,
         log_subthread_info_silently:       bool               = False,
         file_name:                         str                = 'auto',
-    ) -> None:
+        tabs_per_driver:                   int                = 1,
+        execution_mode:                    str                = 'threads',
+        job_order:                         str | Callable[[str, Optional[float]], float] = 'file',
+        min_available_memory_mb:           Optional[int]      = None,
+        max_driver_memory_mb:              Optional[int]      = None,
+        channels_per_minute:               Optional[float]    = None,
+        burst:                             int                = 1,
+        job_queue_file:                    Optional[str]      = None,
+        shard_index:                       int                = 0,
+        shard_count:                       int                = 1,
+        max_attempts:                      int                = 3,
+        quarantine_for_s:                  Optional[float]    = None,
+        min_refresh_interval:              Optional[float]    = None,
+        separate_new_channels:             bool               = False,
+        new_channel_threads:               Optional[int]      = None,
+        new_channel_min_available_memory_mb: Optional[int]    = None,
+        channel_timeout_s:                 Optional[float]    = 3600,
+    ) -> List[ChannelResult]:
         '''
         The create_list_from() method creates a list using the arguments specified during instantiation of the ListCreator instance.
         You need to specify just the path to the text file containing urls of all the channels you want to scrape as the `path_to_channel_urls_file` argument.
         NOTE that each url **should be placed on a new line!**
 
+        Returns a list with a ChannelResult for every url in the file (in the same order as the file), with the attributes
+          -> url, channel_name, file_name, video_data, error, seconds, attempts, new_videos, and succeeded
+            --> `error` is the exception that stopped the program from scraping the channel (None if the channel was scraped)
+            --> `video_data` is the video data for the channel (see the `video_data_returned` instance attribute)
+          -> use the icreate_list_from() method instead to get every result as soon as its channel is finished
+              >>> help(ListCreator.icreate_list_from)
+
         Use the `file_name` argument to set how the program names the output files:
           -> file_name='auto' (default) OR file_name='id'
               >>> help(ListCreator.create_list_for)    # see detailed explanation about differences between 'auto' and 'id'
@@ -404,6 +584,20 @@ class ListCreator:
               * amount of time to sleep after scraping n channels
               * accepts a tuple of `(int, int)` or a tuple of `(int, float)`
                 -> after_n_channels_pause_for_s=(20, 10)
+        OR use the following arguments to limit how fast the program starts scraping new channels instead
+        (so the program only waits when it is about to go over the rate, instead of sleeping before every channel):
+            `channels_per_minute`
+              * the maximum number of channels all threads together start scraping every minute
+                -> `min_sleep`, `max_sleep`, and `after_n_channels_pause_for_s` are ignored when this is set
+              * the program halves the rate every time it is redirected to the cookie consent page or a channel fails
+                (down to an eighth of `channels_per_minute`), and slowly speeds back up as channels are scraped successfully
+              * accepts an `int` or `float` (or None to sleep between `min_sleep` and `max_sleep` seconds before every channel)
+                -> channels_per_minute=None (default) OR channels_per_minute=30
+            `burst`
+              * the number of channels the program can start at once before it slows down to `channels_per_minute`
+                (for example, to start every thread right away)
+              * accepts an `int`
+                -> burst=1 (default) OR burst=4
 
         Use the following arguments to mute terminal logging of subthread status:
             `log_subthread_status_silently`
@@ -415,7 +609,226 @@ class ListCreator:
               * mutes logging which channel each subthread is scraping and which output file the subthread writes to
               * accepts a `boolean`
                 -> log_subthread_info_silently=False (default) OR log_subthread_info_silently=True
+
+        Use the following argument to scrape several channels in the same browser:
+            `tabs_per_driver`
+              * the number of channels that share one driver, each scraped in its own window of the browser
+                (the channels take turns sending commands to the browser, and a channel waiting for YouTube to load more videos
+                does not stop the other channels from scraping), so the program only launches one browser for every `tabs_per_driver` threads
+                -> this uses much less memory than launching a browser for every thread, so you can scrape more channels at once
+              * accepts an `int`
+                -> tabs_per_driver=1 (default, every thread launches its own driver) OR tabs_per_driver=4 (4 threads share each driver)
+
+        Use the following argument to scrape the channels in separate processes instead of threads:
+            `execution_mode`
+              * 'threads'   (default) - scrape `number_of_threads` channels at once in threads of the current process
+              * 'processes'           - scrape `number_of_threads` channels at once in worker processes
+                -> extracting, formatting, and writing the videos for different channels runs on different CPU cores,
+                   and a driver that hangs or uses too much memory only takes down its own worker process
+                   (the program starts a new worker process and retries the channels that did not finish)
+                -> every worker process keeps its driver open for the next channel it scrapes (see the `max_driver_uses` instance attribute),
+                   and the `tabs_per_driver` argument does not apply
+                -> NOTE on Windows and MacOS, call this method inside an `if __name__ == '__main__':` block
+                   (see https://docs.python.org/3/library/multiprocessing.html#the-spawn-and-forkserver-start-methods)
+              * accepts a `str`
+                -> execution_mode='threads' (default) OR execution_mode='processes'
+            `channel_timeout_s`
+              * the number of seconds a worker process can take to scrape one channel before the program stops the worker process
+                (and the driver and browser it started) and records the channel as failed with a TimeoutError
+                -> the other worker processes keep scraping their channels, and a new worker process takes the place of the stopped one
+              * only applies when using execution_mode='processes'
+              * accepts an `int` or `float` (or None to wait for every channel however long it takes)
+                -> channel_timeout_s=3600 (default) OR channel_timeout_s=None
+
+        Use the following argument to change the order the program scrapes the channels in:
+            `job_order`
+              * 'file'          (default) - scrape the channels in the same order as the file
+              * 'longest_first'           - scrape the channels that took the longest to scrape last time first
+                -> the program saves how long every channel took to scrape in a .durations.json file next to the .log file
+                   (for example, channels.durations.json for channels.txt), and channels that are not in that file yet (usually channels that were never scraped,
+                   which take the longest to scrape) are scraped before every other channel
+                -> this stops one large channel at the end of the file from running long after every other channel finished
+              * a function that accepts the url and the number of seconds the channel took to scrape last time (None if unknown) and returns a number
+                -> the program scrapes the channels in ascending order of the returned number (and also saves the .durations.json file)
+              * NOTE the returned list of results is always in the same order as the file
+                -> job_order='file' (default) OR job_order='longest_first' OR job_order=lambda url, estimated_seconds: ...
+
+        Use the following arguments to keep the program from running your machine out of memory
+        (so you can set `number_of_threads` to a large number and let the program scrape fewer channels at once when memory is low):
+            `min_available_memory_mb`
+              * the program only starts scraping the next channel when your machine has at least this much available memory (in megabytes),
+                and otherwise waits for another channel to finish first (at least one channel is always scraped, so the program never waits forever)
+              * accepts an `int` (or None to start the next channel regardless of the available memory)
+                -> min_available_memory_mb=None (default) OR min_available_memory_mb=1024
+            `max_driver_memory_mb`
+              * after scraping a channel, the program closes a driver (including its browser processes) that uses more than this much memory (in megabytes),
+                and opens a new driver for the next channel (does not apply to drivers shared by several tabs with `tabs_per_driver`)
+              * accepts an `int` (or None to never close a driver because of its memory)
+                -> max_driver_memory_mb=None (default) OR max_driver_memory_mb=2048
+            * NOTE the program measures memory with psutil if it is installed, and otherwise reads /proc (only available on linux)
+              -> on MacOS and Windows, install psutil to use these arguments (pip install psutil)
+
+        Use the following argument to scrape the same list of channels with several processes or machines at once:
+            `job_queue_file`
+              * the path to a SQLite file that keeps track of which channels are waiting to be scraped, being scraped, done, or failed
+                -> every create_list_from() call using the same `job_queue_file` (for example, on several machines pointing at a shared directory)
+                   adds the urls in `path_to_channel_urls_file` that are not in the queue yet, and then takes channels from the queue until no channels are left
+                -> a channel is scraped by only one process at a time, and a channel whose process crashed is scraped by another process after 60 seconds
+                -> a channel that still fails after `max_attempts` attempts is marked as failed instead of being scraped again,
+                   and a channel whose process crashed `max_attempts` times is also marked as failed
+                -> the queue remembers finished channels, so delete the file to scrape every channel again
+              * the returned list only has results for the channels this call scraped (in the order they finished)
+              * only works with execution_mode='threads'
+              * accepts a `str` (or None to only scrape the channels in memory)
+                -> job_queue_file=None (default) OR job_queue_file='/shared/channels.queue.sqlite'
+
+        Use the following arguments to split the channels in `path_to_channel_urls_file` between several machines without a shared queue:
+            `shard_index`
+              * the shard of channels this call scrapes (from 0 to `shard_count` - 1)
+              * accepts an `int`
+                -> shard_index=0 (default)
+            `shard_count`
+              * the number of shards (usually the number of machines) the channels are split into
+                -> every channel belongs to the shard picked by the hash of its url (the program ignores differences like http/https, www., or /videos),
+                   so a channel stays in the same shard when urls are added to or removed from the file
+                -> run the program on every machine with the same file and `shard_count`, and a different `shard_index`
+                   (also use file_name='id' so the output files of different machines never have the same name)
+              * accepts an `int`
+                -> shard_count=1 (default, scrape every channel) OR shard_count=4 (scrape a quarter of the channels)
+
+        Use the following arguments to change how the program handles channels that fail:
+            `max_attempts`
+              * the number of times the program tries to scrape a channel before giving up on it
+                -> the program waits 5 seconds before the first retry, and twice as long before every retry after that (up to 2 minutes)
+                -> the thread keeps its driver for the next attempt (and for the next channel after giving up), unless the browser crashed
+                -> a channel is not retried when the driver could not be launched or the worker processes keep crashing,
+                   and the thread stops instead (every other channel would fail the same way)
+                -> the error that stopped a thread is raised once the other threads finished their channels
+              * accepts an `int`
+                -> max_attempts=3 (default) OR max_attempts=1 (never retry a channel)
+            `quarantine_for_s`
+              * the program records every channel that failed every attempt (and why) in a .failures.json file next to the .log file
+                (for example, channels.failures.json for channels.txt), and skips the channels in that file for this many seconds
+                -> a channel is removed from the file as soon as the program scrapes it successfully
+                -> a channel that failed because the driver could not be launched or the worker processes kept crashing is not recorded
+                -> the returned list does not have results for the skipped channels
+              * accepts an `int` or `float` (or None to scrape every channel and not record the failed channels)
+                -> quarantine_for_s=None (default) OR quarantine_for_s=86400 (skip the channel for a day)
+
+        Use the following argument to skip channels that were scraped recently:
+            `min_refresh_interval`
+              * the program records when every channel was last scraped successfully (and the newest video in its files) in a .freshness.json file
+                next to the .log file (for example, channels.freshness.json for channels.txt), and skips every channel scraped less than this many seconds ago
+                before opening a driver or making a request
+                -> every channel is recorded (within a few seconds) as soon as it is finished, and several processes can record their channels in the same file,
+                   so rerunning the program after some channels failed (or after the program was stopped) only scrapes the channels that were not finished,
+                   and a cron job that starts while the previous one is still running skips the channels the previous one already finished
+                -> the returned list does not have results for the skipped channels
+              * accepts an `int` or `float` (or None to scrape every channel and not record when the channels were scraped)
+                -> min_refresh_interval=None (default) OR min_refresh_interval=3600 (skip channels scraped in the last hour)
+
+        Use the following arguments to change how the program scrapes channels it never scraped before:
+            `separate_new_channels`
+              * the program checks which channels already have output files before scraping any channel, and updates those channels
+                with `number_of_threads` threads while it scrapes the channels without output files (which usually take much longer and need much more memory)
+                in a separate group of `new_channel_threads` threads at the same time
+                -> this does the same thing as scraping new channels with the create_list_for() method first (see the NOTE below), without sorting the channels yourself
+                -> with file_name='auto', the program only knows the name of the output files of the channels it scraped successfully before
+                   (recorded in the .freshness.json file when using `min_refresh_interval`), so every other channel is scraped as a new channel
+                -> does not apply when using `job_queue_file`
+              * accepts a `boolean`
+                -> separate_new_channels=False (default, scrape every channel with the same `number_of_threads` threads) OR separate_new_channels=True
+            `new_channel_threads`
+              * the number of threads that scrape new channels (in addition to the `number_of_threads` threads that update channels)
+              * accepts an `int` (or None to use a quarter of `number_of_threads`)
+                -> new_channel_threads=None (default) OR new_channel_threads=1
+            `new_channel_min_available_memory_mb`
+              * same as `min_available_memory_mb`, but for the threads that scrape new channels
+              * accepts an `int` (or None to start the next new channel regardless of the available memory)
+                -> new_channel_min_available_memory_mb=None (default) OR new_channel_min_available_memory_mb=2048
+        '''
+        results = list(self.__create_list_from(path_to_channel_urls_file, number_of_threads, min_sleep, max_sleep, after_n_channels_pause_for_s, log_subthread_status_silently, log_subthread_info_silently, file_name, tabs_per_driver, execution_mode, job_order, min_available_memory_mb, max_driver_memory_mb, channels_per_minute, burst, job_queue_file, shard_index, shard_count, max_attempts, quarantine_for_s, min_refresh_interval, separate_new_channels, new_channel_threads, new_channel_min_available_memory_mb, channel_timeout_s))
+        if job_queue_file is not None:
+            return [result for _, result in results] # in the order the channels finished
+        return [result for _, result in sorted(results, key=lambda position_and_result: position_and_result[0])]
+
+
+    def icreate_list_from(
+        self,
+        path_to_channel_urls_file:         str,
+        number_of_threads:                 int                = 4,
+        min_sleep:                         int                = 1,
+        max_sleep:                         int                = 5,
+        after_n_channels_pause_for_s:      Tuple[int, int]    = (20, 10),
+        log_subthread_status_silently:     bool               = False,
+        log_subthread_info_silently:       bool               = False,
+        file_name:                         str                = 'auto',
+        tabs_per_driver:                   int                = 1,
+        execution_mode:                    str                = 'threads',
+        job_order:                         str | Callable[[str, Optional[float]], float] = 'file',
+        min_available_memory_mb:           Optional[int]      = None,
+        max_driver_memory_mb:              Optional[int]      = None,
+        channels_per_minute:               Optional[float]    = None,
+        burst:                             int                = 1,
+        job_queue_file:                    Optional[str]      = None,
+        shard_index:                       int                = 0,
+        shard_count:                       int                = 1,
+        max_attempts:                      int                = 3,
+        quarantine_for_s:                  Optional[float]    = None,
+        min_refresh_interval:              Optional[float]    = None,
+        separate_new_channels:             bool               = False,
+        new_channel_threads:               Optional[int]      = None,
+        new_channel_min_available_memory_mb: Optional[int]    = None,
+        channel_timeout_s:                 Optional[float]    = 3600,
+    ) -> Iterator[ChannelResult]:
+        '''
+        The icreate_list_from() method accepts the same arguments as the create_list_from() method:
+          >>> help(ListCreator.create_list_from)
+
+        But instead of returning a list after every channel is scraped, it yields the ChannelResult of every channel as soon as the channel is finished
+        (in the order the channels finish), so you can start using the results of the channels that are already finished while the other channels are still being scraped:
+          >>> for result in lc.icreate_list_from('channels.txt'):
+          ...     print(result.channel_name, result.file_name, result.new_videos, result.seconds)
+        Every ChannelResult has the url, channel_name, file_name, video_data, error, seconds (how long the channel took to scrape),
+        attempts, and new_videos (how many videos were not in the channel's files yet) of the channel
+          -> set the `video_data_returned` instance attribute to True to get the video data of every channel in the `video_data` attribute
+
+        NOTE the program only starts scraping the channels once you start iterating, and if you stop iterating early,
+        the program still finishes scraping the channels that are already being scraped before your loop continues.
         '''
+        for _, result in self.__create_list_from(path_to_channel_urls_file, number_of_threads, min_sleep, max_sleep, after_n_channels_pause_for_s, log_subthread_status_silently, log_subthread_info_silently, file_name, tabs_per_driver, execution_mode, job_order, min_available_memory_mb, max_driver_memory_mb, channels_per_minute, burst, job_queue_file, shard_index, shard_count, max_attempts, quarantine_for_s, min_refresh_interval, separate_new_channels, new_channel_threads, new_channel_min_available_memory_mb, channel_timeout_s):
+            yield result
+
+
+    def __create_list_from(
+        self,
+        path_to_channel_urls_file:         str,
+        number_of_threads:                 int,
+        min_sleep:                         int,
+        max_sleep:                         int,
+        after_n_channels_pause_for_s:      Tuple[int, int],
+        log_subthread_status_silently:     bool,
+        log_subthread_info_silently:       bool,
+        file_name:                         str,
+        tabs_per_driver:                   int,
+        execution_mode:                    str,
+        job_order:                         str | Callable[[str, Optional[float]], float],
+        min_available_memory_mb:           Optional[int],
+        max_driver_memory_mb:              Optional[int],
+        channels_per_minute:               Optional[float],
+        burst:                             int,
+        job_queue_file:                    Optional[str],
+        shard_index:                       int,
+        shard_count:                       int,
+        max_attempts:                      int,
+        quarantine_for_s:                  Optional[float],
+        min_refresh_interval:              Optional[float],
+        separate_new_channels:             bool,
+        new_channel_threads:               Optional[int],
+        new_channel_min_available_memory_mb: Optional[int],
+        channel_timeout_s:                 Optional[float],
+    ) -> Generator[Tuple[Optional[int], ChannelResult], None, None]:
+        # yields the position of the channel in the file (None when using a job queue) and the ChannelResult of every channel as soon as the channel is finished
         print(
           '''
           NOTE:
@@ -425,10 +838,14 @@ class ListCreator:
             -> If a channel you're scraping has THOUSANDS of videos, the browser needs to load all the HTML elements
                corresponding to the uploaded videos in memory, so if you have MULTIPLE threads going and all channels
                being concurrently scraped have thousands of videos, your machine might run out of memory!
+              -> Set the `prune_loaded_videos` attribute to True to keep the browser's memory usage roughly constant
+                 regardless of how many videos the channels you're scraping uploaded.
             -> If you know a channel you're scraping for the first time has THOUSANDS of uploaded videos, it would
                be better to first scrape that channel individually using the `create_list_for(url)` method to create
                the file for that channel, and then use this multi-threaded method to update the file for that channel
                along with files for other channels!
+              -> The program does this automatically when the `separate_new_channels` argument is True by
+                 scraping channels without output files in their own group of `new_channel_threads` threads.
               -> ALSO keep in mind that having many applications running while using yt_videos_list might still cause the
                  program to terminate before reaching the end of the page if your machine's overall memory usage gets too high
                  (look up page faults and memory swap for more information).
@@ -444,7 +861,13 @@ class ListCreator:
           '''
         )
         invalid_file_name_exception = f'''The options for the file_name argument are 'auto' or 'id', but you provided: '{file_name}'\nPlease rerun this method using file_name='auto' or file_name='id'\n\nFor more details about the difference between 'auto' and 'id', run:\n    >>> help(ListCreator.create_list_for)\n\n\n\n'''
-        if file_name not in ('auto', 'id'): raise ValueError(invalid_file_name_exception)
+        invalid_execution_mode_exception = f'''The options for the execution_mode argument are 'threads' or 'processes', but you provided: '{execution_mode}'\nPlease rerun this method using execution_mode='threads' or execution_mode='processes'\n\n\n\n'''
+        if file_name not in ('auto', 'id'):                  raise ValueError(invalid_file_name_exception)
+        invalid_job_order_exception      = f'''The options for the job_order argument are {", ".join(repr(order) for order in JOB_ORDERS)}, or a function, but you provided: {job_order!r}\nPlease rerun this method using a valid job_order argument\n\n\n\n'''
+        if execution_mode not in ('threads', 'processes'):   raise ValueError(invalid_execution_mode_exception)
+        if not callable(job_order) and job_order not in JOB_ORDERS: raise ValueError(invalid_job_order_exception)
+        if not 0 <= shard_index < shard_count: raise ValueError(f'''The shard_index argument must be at least 0 and less than shard_count, but you provided: shard_index={shard_index} and shard_count={shard_count}\nPlease rerun this method using 0 <= shard_index < shard_count\n\n\n\n''')
+        if job_queue_file is not None and execution_mode != 'threads': raise ValueError(f'''The job_queue_file argument only works with execution_mode='threads', but you provided: '{execution_mode}'\nPlease rerun this method using execution_mode='threads'\n\n\n\n''')
         from threading import Lock                                                           # pylint: disable=import-outside-toplevel
         lock = Lock()
         with open(path_to_channel_urls_file, mode='r', encoding='utf-8',  buffering=self.file_buffering) as txt_file, open(path_to_channel_urls_file.split('.')[0] + '.log', mode='a', encoding='utf-8',  buffering=self.file_buffering) as log_file:
@@ -457,52 +880,247 @@ class ListCreator:
             log( '>' * 50 + 'STARTING  MULTI-THREADED PROGRAM' + '<' * 50,                                                                                    logging_locations)
             log(f'Iterating through all urls in {path_to_channel_urls_file} and scraping number_of_threads={number_of_threads} channels concurrently...\n\n', logging_locations)
             log(f'Current configuration: {self.__repr__()}',                                                                                                  logging_locations)
-            urls: deque[str]                       = deque()
-            count: List[int]                       = [0]
-            running_threads: set[ThreadWithResult] = set()
-            finished_threads = set()
+            durations_file      = determine_durations_file(path_to_channel_urls_file)
+            durations           = load_durations(durations_file) if job_order != 'file' else {} # the durations are only recorded when the channels are reordered
+            quarantine_file     = determine_quarantine_file(path_to_channel_urls_file)
+            quarantine          = load_quarantine(quarantine_file) if quarantine_for_s is not None else {}
+            urls                = _read_channel_urls(txt_file)
+            quarantined_urls    = [url for url in urls if is_quarantined(quarantine.get(url), quarantine_for_s)]
+            if quarantined_urls:
+                skipped_urls    = set(quarantined_urls)
+                urls            = deque(url for url in urls if url not in skipped_urls)
+                log(f'Skipping {len(quarantined_urls)} channels that failed in the last {quarantine_for_s} seconds (see {quarantine_file}): {quarantined_urls}', logging_locations)
+            freshness_file      = determine_freshness_file(path_to_channel_urls_file)
+            freshness           = load_freshness(freshness_file) if min_refresh_interval is not None or separate_new_channels else {} # separate_new_channels looks up the file names the program recorded before
+            fresh_urls          = [url for url in urls if is_fresh(freshness.get(url), min_refresh_interval)]
+            if fresh_urls:
+                skipped_urls    = set(fresh_urls)
+                urls            = deque(url for url in urls if url not in skipped_urls)
+                log(f'Skipping {len(fresh_urls)} channels that were scraped in the last {min_refresh_interval} seconds (see {freshness_file}): {fresh_urls}', logging_locations)
+            if shard_count > 1:
+                urls            = select_shard(urls, shard_index, shard_count)
+                log(f'Scraping the {len(urls)} channels in shard {shard_index} of {shard_count}', logging_locations)
+            urls, order         = order_urls(urls, durations, job_order if callable(job_order) else JOB_ORDERS[job_order])
+            count: List[int]    = [0]
+            instance_attributes = self.__determine_instance_attributes()
+            driver_pool         = self.__determine_driver_pool()
+            tab_pool            = TabPool(tabs_per_driver) if tabs_per_driver > 1 else None
+            rate_limiter        = RateLimiter(channels_per_minute, burst) if channels_per_minute is not None else None
+            retry_policy        = RetryPolicy(max_attempts)
+            job_queue           = JobQueue(job_queue_file, max_attempts=max_attempts, logging_locations=logging_locations) if job_queue_file is not None else None
+            # every lane is (urls, position in the file of every url, number of threads, memory guard)
+            lanes               = [(urls, order, number_of_threads, MemoryGuard(min_available_memory_mb, max_driver_memory_mb))]
+            if job_queue is not None:
+                job_queue.add(urls)
+                lanes           = [(LeasedUrls(job_queue), order, number_of_threads, lanes[0][3])] # the workers lease every channel from the job queue instead
+                log(f'Using the job queue in {job_queue_file}: {job_queue.counts()}', logging_locations)
+            elif separate_new_channels:
+                txt, csv, markdown, file_suffix, _, video_id_only, reverse_chronological = instance_attributes[:7]
+                is_update       = [has_existing_files(determine_expected_file_name(url, file_name, freshness.get(url), file_suffix, video_id_only, reverse_chronological, txt, csv, markdown), txt, csv, markdown) for url in urls]
+                (update_urls, update_order), (new_urls, new_order) = split_new_channels(urls, order, is_update)
+                if update_urls and new_urls:
+                    new_threads = new_channel_threads if new_channel_threads is not None else max(1, number_of_threads // 4)
+                    lanes       = [(update_urls, update_order, number_of_threads, lanes[0][3]), (new_urls, new_order, new_threads, MemoryGuard(new_channel_min_available_memory_mb, max_driver_memory_mb))]
+                    log(f'Updating {len(update_urls)} channels with {number_of_threads} threads while scraping {len(new_urls)} new channels with {new_threads} threads', logging_locations)
+            def create_worker(
+                lane_urls: deque[str] | LeasedUrls,
+                memory_guard: MemoryGuard,
+            ) -> Callable[[Callable[[str, ChannelResult], None]], Tuple[Optional[List[List[int | str]]], Tuple[str, str]]]:
+                def run_worker(
+                    on_channel_finished: Callable[[str, ChannelResult], None],
+                ) -> Tuple[Optional[List[List[int | str]]], Tuple[str, str]]:
+                    # every worker keeps scraping channels from `lane_urls` until there are no channels left
+                    def finish_channel(
+                        url: str,
+                        result: ChannelResult,
+                    ) -> None:
+                        if job_queue is not None:
+                            if result.succeeded: job_queue.complete(url)
+                            else:                job_queue.fail(url, result.error, final=not is_fatal(result.error)) # the retry policy already retried the channel in this process
+                        on_channel_finished(url, result)
+                    return logic.execute(lane_urls, file_name, True, *instance_attributes, lock, count, min_sleep, max_sleep, after_n_channels_pause_for_s, logging_locations, driver_pool=driver_pool, tab_pool=tab_pool, on_channel_finished=finish_channel, memory_guard=memory_guard, rate_limiter=rate_limiter, retry_policy=retry_policy)
+                return run_worker
+            def scrape_lane(
+                lane_urls: deque[str] | LeasedUrls,
+                lane_order: List[int],
+                lane_threads: int,
+                memory_guard: MemoryGuard,
+            ) -> Generator[Tuple[Optional[int], ChannelResult], None, None]:
+                # yields the position in the file (None when using a job queue) and the ChannelResult of every channel in the lane as soon as the channel is finished
+                if execution_mode == 'processes':
+                    scheduler = ProcessChannelScheduler(lane_threads, self.max_driver_uses, memory_guard, rate_limiter, channel_timeout_s)
+                    sleeps    = (min_sleep, max_sleep, after_n_channels_pause_for_s) if rate_limiter is None else (None, None, None) # the rate limiter runs in the main process
+                    stream    = scheduler.as_completed(lane_urls, logging_locations, file_name, instance_attributes, *sleeps, log_file.name, self.file_buffering, log_subthread_info_silently, self.video_data_returned, retry_policy)
+                else:
+                    scheduler = ChannelScheduler(lane_urls, lane_threads, create_worker(lane_urls, memory_guard))
+                    scheduler.start()
+                    stream    = scheduler.as_completed(logging_locations)
+                for index, result in stream:
+                    yield (lane_order[index] if job_queue is None else None), result
+            if execution_mode == 'processes':
+                log_file.flush() # the worker processes append to the same log file
+            stream = merge_streams(*(scrape_lane(*lane) for lane in lanes))
+            log(f'Started scraping all urls in {path_to_channel_urls_file}!', logging_locations)
+            results: List[ChannelResult] = []
+            recorder                     = FreshnessRecorder(freshness_file, freshness) if min_refresh_interval is not None else None
+            try:
+                for position, result in stream:
+                    results.append(result)
+                    if recorder is not None: recorder.add(result)
+                    if not result.succeeded: log(f'Unable to scrape {result.url}: {result.error!r}', logging_locations)
+                    yield position, (result._replace(video_data=[[0, '', '', '']]) if result.succeeded and not self.video_data_returned else result) # return dummy video_data
+            finally:
+                for _, result in stream: # keep waiting for the channels that are still being scraped if the caller stopped early
+                    results.append(result)
+                    if recorder is not None: recorder.add(result)
+                if job_queue is not None:
+                    job_queue.close()
+                    log(f'Finished taking channels from the job queue in {job_queue_file}: {job_queue.counts()}', logging_locations)
+                if job_order != 'file': save_durations(durations_file, durations, results)
+                if quarantine_for_s is not None: save_quarantine(quarantine_file, quarantine, results)
+                if recorder is not None: recorder.save()
+                log_time_taken(multithreading_cpu_start_time, multithreading_real_start_time, 'Finished executing all threads. It took ', f' to scrape all urls in {path_to_channel_urls_file}', logging_locations)
+                log( '>' * 50 + 'COMPLETED MULTI-THREADED PROGRAM' + '<' * 50, logging_locations)
+
+
+    async def acreate_list_from(
+        self,
+        path_to_channel_urls_file:         str,
+        max_concurrent_channels:           int                = 100,
+        connections_per_host:              int                = 10,
+        log_subthread_info_silently:       bool               = False,
+        file_name:                         str                = 'auto',
+    ) -> List[
+        Tuple[
+            str,
+            str,
+        ]
+    ]:
+        '''
+        The acreate_list_from() coroutine is the asyncio version of the create_list_from() method for the http backend
+        (the `backend` instance attribute must be set to 'http'). Instead of using one thread (and one driver) per channel,
+        every channel is requested concurrently from the same event loop, so hundreds of channels can be scraped at once:
+          >>> import asyncio
+          >>> lc = ListCreator(backend='http')
+          >>> asyncio.run(lc.acreate_list_from('channels.txt'))
+
+        The `path_to_channel_urls_file`, `log_subthread_info_silently`, and `file_name` arguments are the same as the create_list_from() method:
+          >>> help(ListCreator.create_list_from)
+
+        Set `max_concurrent_channels` to the maximum number of channels the program scrapes at the same time.
+          -> max_concurrent_channels=100 (default)
+        Set `connections_per_host` to the maximum number of connections the program opens to YouTube at the same time
+        (the requests for every channel share these connections, so the other requests wait for a free connection).
+          -> every request is sent on its own, so every channel still makes progress when `max_concurrent_channels` is much larger than `connections_per_host`,
+             but at most `connections_per_host` requests are waiting for YouTube at any moment (increase it to scrape more channels per second)
+          -> connections_per_host=10 (default)
+
+        The output files are written in the event loop's default executor, so writing the files for one channel does not stop
+        the program from requesting the videos for the other channels. Channels that fail are logged and do not stop the other channels.
+        Returns the (channel_name, file_name) tuple for every channel that was scraped successfully.
+        '''
+        invalid_file_name_exception = f'''The options for the file_name argument are 'auto' or 'id', but you provided: '{file_name}'\nPlease rerun this method using file_name='auto' or file_name='id'\n\nFor more details about the difference between 'auto' and 'id', run:\n    >>> help(ListCreator.create_list_for)\n\n\n\n'''
+        invalid_backend_exception   = f'''The acreate_list_from() method only supports the http backend, but the backend attribute is '{self.backend}'\nPlease rerun this method using a ListCreator instance created with backend='http'\n\n\n\n'''
+        if file_name not in ('auto', 'id'): raise ValueError(invalid_file_name_exception)
+        if self.backend != 'http':          raise ValueError(invalid_backend_exception)
+        with open(path_to_channel_urls_file, mode='r', encoding='utf-8',  buffering=self.file_buffering) as txt_file, open(path_to_channel_urls_file.split('.')[0] + '.log', mode='a', encoding='utf-8',  buffering=self.file_buffering) as log_file:
+            asyncio_cpu_start_time  = time.perf_counter()
+            asyncio_real_start_time = time.time()
+            if log_subthread_info_silently: logging_locations = (log_file,)
+            else:                           logging_locations = (log_file, sys.stdout)
+            log( '>' * 50 + 'STARTING  ASYNCIO PROGRAM' + '<' * 50,                                                                                                            logging_locations)
+            log(f'Iterating through all urls in {path_to_channel_urls_file} and scraping max_concurrent_channels={max_concurrent_channels} channels concurrently...\n\n', logging_locations)
+            log(f'Current configuration: {self.__repr__()}',                                                                                                                  logging_locations)
+            urls                = _read_channel_urls(txt_file)
             instance_attributes = self.__determine_instance_attributes()
-            def remove_finished_threads(
-            ) -> None:
-                # can't remove dead threads from running_threads set directly because of the following exception:
-                # RuntimeError: Set changed size during iteration
-                for thread in running_threads:
-                    if not thread.is_alive():
-                        finished_threads.add(thread)
-                for thread in finished_threads:
-                    running_threads.remove(thread)
-                finished_threads.clear()
-            for url in txt_file:
-                url           = url.strip()
-                formatted_url = url.split('#')[0].strip()
-                if formatted_url == '':
-                    # this line is either empty or entirely a comment
-                    continue
-                urls.append(formatted_url)
-            while urls:
-                while len(running_threads) >= number_of_threads and all(thread.is_alive() for thread in running_threads):
-                    time.sleep(1) # wait 1 second before checking to see if a previously running thread completed
-                remove_finished_threads()
-                if urls:
-                    # make sure there are still channels left to scrape before making a new thread
-                    # since finished threads may be because the program visited all urls already (instead of some kind of failure)
-                    thread = ThreadWithResult(target=logic.execute, args=(urls, file_name, True, *instance_attributes, lock, count, min_sleep, max_sleep, after_n_channels_pause_for_s, logging_locations))
-                    thread.start()
-                    running_threads.add(thread)
-            log(f'Iterated through all urls in {path_to_channel_urls_file}!', logging_locations)
-            while len(running_threads) > 0:
-                log(f'Still running {[thread.name for thread in running_threads]} ...', logging_locations)
-                time.sleep(10)
-                remove_finished_threads()
-            log_time_taken(multithreading_cpu_start_time, multithreading_real_start_time, 'Finished executing all threads. It took ', f' to scrape all urls in {path_to_channel_urls_file}', logging_locations)
-            log( '>' * 50 + 'COMPLETED MULTI-THREADED PROGRAM' + '<' * 50, logging_locations)
+            channel_limit       = asyncio.Semaphore(max(1, int(max_concurrent_channels)))
+            async def scrape(
+                url: str,
+            ) -> Optional[Tuple[str, str]]:
+                async with channel_limit:
+                    channel_cpu_start_time  = time.perf_counter()
+                    channel_real_start_time = time.time()
+                    try:
+                        _, (channel_name, output_file_name) = await logic.aexecute(url, file_name, True, *instance_attributes, http)
+                    except Exception as error_message: # pylint: disable=broad-except
+                        log(f'Unable to scrape {url}: {error_message!r}', logging_locations)
+                        return None
+                    log_time_taken(channel_cpu_start_time, channel_real_start_time, f'Finished scraping "{channel_name}" and wrote to the {output_file_name} file in ', '', logging_locations)
+                    return (channel_name, output_file_name)
+            async with fetcher.AsyncConnectionPool(connections_per_host) as http:
+                results = await asyncio.gather(*(scrape(url) for url in urls))
+            log_time_taken(asyncio_cpu_start_time, asyncio_real_start_time, 'Finished scraping all channels. It took ', f' to scrape all urls in {path_to_channel_urls_file}', logging_locations)
+            log( '>' * 50 + 'COMPLETED ASYNCIO PROGRAM' + '<' * 50, logging_locations)
+        return [result for result in results if result is not None]
+
+
+    def close(
+        self,
+    ) -> None:
+        '''
+        Closes every driver the instance kept open for the next channel (only applies when the `reuse_drivers` attribute is True).
+        The instance can still be used after calling this method (the program opens new drivers when it needs them).
+        '''
+        if self._driver_pool is not None:
+            self._driver_pool.close()
+            self._driver_pool = None
+
+
+    def __enter__(
+        self,
+    ) -> 'ListCreator':
+        '''
+        Returns the instance itself, so the instance can be created in a `with` statement:
+          >>> with ListCreator(reuse_drivers=True) as lc:
+          ...     lc.create_list_for(url)
+        '''
+        return self
+
+
+    def __exit__(
+        self,
+        exc_type: Any,
+        exc_value: Any,
+        exc_tb: Any,
+    ) -> None:
+        '''
+        Closes every driver the instance kept open (see the close() method).
+        Returns None so any exception raised in the `with` block is NOT swallowed.
+        '''
+        self.close()
+        return None
+
+
+    def __determine_driver_pool(
+        self,
+    ) -> Optional[DriverPool]:
+        if not self.reuse_drivers:
+            return None
+        if self._driver_pool is None:
+            self._driver_pool = DriverPool(self.max_driver_uses)
+            weakref.finalize(self, self._driver_pool.close) # close the drivers when the instance is garbage collected (or the interpreter exits) if close() is never called
+        return self._driver_pool
 
 
     def __determine_instance_attributes(
         self,
-    ) -> Tuple[bool, bool, bool, bool, bool, bool, bool, bool, float, str | None, bool, int, int, str, str]:
+    ) -> Tuple[bool, bool, bool, bool, bool, bool, bool, bool, float, str | None, bool, int, int, bool, bool, str, bool, bool, Optional[int], str, str]:
         _execution_type     = 'module'
-        return (self.txt, self.csv, self.markdown, self.file_suffix, self.all_video_data_in_memory, self.video_id_only, self.reverse_chronological, self.headless, self.scroll_pause_time, self.driver, self.cookie_consent, self.verify_page_bottom_n_times, self.file_buffering, self.__repr__(), _execution_type)
+        return (self.txt, self.csv, self.markdown, self.file_suffix, self.all_video_data_in_memory, self.video_id_only, self.reverse_chronological, self.headless, self.scroll_pause_time, self.driver, self.cookie_consent, self.verify_page_bottom_n_times, self.file_buffering, self.prune_loaded_videos, self.save_page_source, self.backend, self.check_rss_feed, self.lean_profile, self.segment_size, self.__repr__(), _execution_type)
+
+
+def _read_channel_urls(
+    txt_file: TextIO,
+) -> deque[str]:
+    urls: deque[str] = deque()
+    for url in txt_file:
+        url           = url.strip()
+        formatted_url = url.split('#')[0].strip()
+        if formatted_url == '':
+            # this line is either empty or entirely a comment
+            continue
+        urls.append(formatted_url)
+    return urls
 
 
 
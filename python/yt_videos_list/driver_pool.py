@@ -0,0 +1,81 @@
+import threading
+from typing import (
+ Callable,
+ Dict,
+ Hashable,
+ List,
+ Tuple,
+)
+from selenium.webdriver.remote.webdriver import WebDriver
+class DriverPool:
+ '''
+ Keeps warm WebDriver sessions alive between channels (and between ListCreator method calls),
+ so the program does not launch and tear down a new browser for every channel.
+ Every session is checked before it is reused, and a session is closed (and replaced by a new session the next time a driver is needed)
+ once it scraped `max_uses` channels, since long-lived browser sessions slowly use more and more memory.
+ The pool is thread safe, so the threads started by create_list_from() can share the same pool.
+ '''
+ def __init__(
+  self,
+  max_uses: int = 25,
+ ) -> None:
+  self.max_uses = max(1, int(max_uses))
+  self.lock = threading.Lock()
+  self.idle_drivers: List[Tuple[Hashable, WebDriver]] = []
+  self.uses: Dict[WebDriver, int] = {}
+  self.closed = False
+ def acquire(
+  self,
+  key: Hashable,
+  open_driver: Callable[[], WebDriver],
+ ) -> WebDriver:
+  while True:
+   with self.lock:
+    index = next((index for index, (driver_key, _) in enumerate(self.idle_drivers) if driver_key == key), None)
+    if index is None: break
+    _, driver = self.idle_drivers.pop(index)
+   if self.is_healthy(driver):
+    return driver
+   self.quit(driver)
+  driver = open_driver()
+  with self.lock:
+   self.uses[driver] = 0
+  return driver
+ def release(
+  self,
+  key: Hashable,
+  driver: WebDriver,
+ ) -> None:
+  with self.lock:
+   self.uses[driver] = self.uses.get(driver, 0) + 1
+   recycle = self.closed or self.uses[driver] >= self.max_uses
+   if not recycle: self.idle_drivers.append((key, driver))
+  if recycle:
+   self.quit(driver)
+ def close(
+  self,
+ ) -> None:
+  with self.lock:
+   self.closed = True
+   idle_drivers = self.idle_drivers
+   self.idle_drivers = []
+  for _, driver in idle_drivers:
+   self.quit(driver)
+ def quit(
+  self,
+  driver: WebDriver,
+ ) -> None:
+  with self.lock:
+   self.uses.pop(driver, None)
+  try:
+   driver.quit()
+  except Exception:
+   pass
+ @staticmethod
+ def is_healthy(
+  driver: WebDriver,
+ ) -> bool:
+  try:
+   return bool(driver.window_handles) and driver.execute_script('return 1') == 1
+  except Exception:
+   return False
@@ -0,0 +1,251 @@
+import os
+import sys
+import time
+import signal
+import threading
+import traceback
+import contextlib
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.util
+import urllib3
+from collections import (
+ deque,
+)
+from concurrent.futures.process import (
+ BrokenProcessPool,
+)
+from io import (
+ TextIOWrapper,
+)
+from typing import (
+ Any,
+ Generator,
+ List,
+ Optional,
+ TextIO,
+ Tuple,
+)
+from . import fetcher, logic
+from .driver_pool import DriverPool
+from .memory_guard import MEGABYTE, MemoryGuard
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
+from .freshness import newest_video
+from .scheduler import ChannelResult
+from .custom_logger import log
+try:
+ import psutil
+except ImportError:
+ psutil = None
+MAX_CRASHES_PER_CHANNEL = 2
+_process_driver_pool: Optional[DriverPool] = None
+_process_memory_guard: Optional[MemoryGuard] = None
+_process_http: Optional[urllib3.PoolManager] = None
+_process_counts: List[int] = [0]
+_process_lock = threading.Lock()
+def initialize_process(
+ max_driver_uses: int,
+ max_driver_memory_mb: Optional[int],
+) -> None:
+ global _process_driver_pool, _process_memory_guard
+ if hasattr(os, 'setpgid'):
+  os.setpgid(0, 0)
+ _process_driver_pool = DriverPool(max_driver_uses)
+ _process_memory_guard = MemoryGuard(None, max_driver_memory_mb)
+ multiprocessing.util.Finalize(_process_driver_pool, _process_driver_pool.close, exitpriority=10)
+def determine_connection_pool(
+ backend: str,
+ check_rss_feed: bool,
+) -> Optional[urllib3.PoolManager]:
+ global _process_http
+ if backend != 'http' and not check_rss_feed:
+  return None
+ if _process_http is None:
+  _process_http = fetcher.create_connection_pool()
+  multiprocessing.util.Finalize(_process_http, _process_http.clear, exitpriority=10)
+ return _process_http
+def scrape_channel_in_process(
+ url: str,
+ file_name: str,
+ instance_attributes: Tuple[Any, ...],
+ min_sleep: Optional[float],
+ max_sleep: Optional[float],
+ after_n_channels_pause_for_s: Optional[Tuple[int, int]],
+ path_to_log_file: str,
+ file_buffering: int,
+ log_subthread_info_silently: bool,
+ video_data_returned: bool,
+ retry_policy: Optional[RetryPolicy],
+) -> ChannelResult:
+ results: List[ChannelResult] = []
+ with open(path_to_log_file, mode='a', encoding='utf-8', buffering=file_buffering) as log_file:
+  if log_subthread_info_silently: logging_locations = (log_file,)
+  else: logging_locations = (log_file, sys.stdout)
+  try:
+   logic.execute(deque([url]), file_name, True, *instance_attributes, _process_lock, _process_counts, min_sleep, max_sleep, after_n_channels_pause_for_s, logging_locations, driver_pool=_process_driver_pool, memory_guard=_process_memory_guard, retry_policy=retry_policy, connection_pool=determine_connection_pool(*instance_attributes[15:17]), on_channel_finished=lambda _, result: results.append(result))
+  except Exception:
+   return ChannelResult(url, None, None, None, RuntimeError(traceback.format_exc()))
+ result = results[0]
+ if video_data_returned or not result.succeeded:
+  return result
+ video = newest_video(result.video_data)
+ return result._replace(video_data=[video] if video is not None else None)
+def run_worker_process(
+ connection: multiprocessing.connection.Connection,
+ max_driver_uses: int,
+ max_driver_memory_mb: Optional[int],
+) -> None:
+ initialize_process(max_driver_uses, max_driver_memory_mb)
+ while True:
+  job = connection.recv()
+  if job is None:
+   break
+  connection.send(scrape_channel_in_process(*job))
+def kill_process_tree(
+ process: multiprocessing.Process,
+) -> None:
+ children = []
+ if psutil is not None:
+  with contextlib.suppress(psutil.Error):
+   children = psutil.Process(process.pid).children(recursive=True)
+ if hasattr(os, 'killpg'):
+  with contextlib.suppress(OSError):
+   os.killpg(process.pid, signal.SIGKILL)
+ for child in children:
+  with contextlib.suppress(psutil.Error):
+   child.kill()
+ process.kill()
+ process.join()
+class WorkerProcess:
+ '''
+ One worker process with its own pipe, so a worker process that hangs (or crashes) can be replaced without stopping the other worker processes.
+ '''
+ def __init__(
+  self,
+  max_driver_uses: int,
+  max_driver_memory_mb: Optional[int],
+ ) -> None:
+  self.connection, worker_connection = multiprocessing.Pipe()
+  self.process = multiprocessing.Process(target=run_worker_process, args=(worker_connection, max_driver_uses, max_driver_memory_mb), daemon=True)
+  self.process.start()
+  worker_connection.close()
+  self.job: Optional[Tuple[int, str, float]] = None
+ def submit(
+  self,
+  index: int,
+  url: str,
+  job_arguments: Tuple[Any, ...],
+ ) -> None:
+  self.connection.send((url, *job_arguments))
+  self.job = (index, url, time.monotonic())
+ def receive(
+  self,
+ ) -> Optional[ChannelResult]:
+  try:
+   result = self.connection.recv() if self.connection.poll() else None
+  except (EOFError, OSError):
+   result = None
+  if result is not None:
+   self.job = None
+  return result
+ def close(
+  self,
+ ) -> None:
+  if self.job is None and self.process.is_alive():
+   with contextlib.suppress(OSError):
+    self.connection.send(None)
+   self.process.join(timeout=30)
+  if self.job is not None or self.process.is_alive():
+   kill_process_tree(self.process)
+  self.connection.close()
+class ProcessChannelScheduler:
+ '''
+ Scrapes every channel in a pool of worker processes instead of threads, so extracting, formatting, and writing the videos for
+ different channels runs on different CPU cores, and a driver that hangs or uses too much memory only takes down its own process.
+ Every worker process keeps its driver open for the next channel it scrapes. If a worker process crashes, its channel is scraped again
+ in a new worker process (a channel is given up on after its worker process crashed MAX_CRASHES_PER_CHANNEL times).
+ The next channel is only sent to a worker process when the `memory_guard` allows it (see MemoryGuard),
+ and when the `rate_limiter` allows it (see RateLimiter), since the worker processes cannot share one rate limiter
+ -> the rate limiter slows down when a channel fails, but not when a worker process is redirected to the cookie consent page.
+ A channel that is still running after `channel_timeout_s` seconds fails with a TimeoutError, and its worker process is stopped together with
+ the driver and browser processes it started (the other worker processes keep scraping their channels).
+ '''
+ def __init__(
+  self,
+  number_of_processes: int,
+  max_driver_uses: int,
+  memory_guard: Optional[MemoryGuard] = None,
+  rate_limiter: Optional[RateLimiter] = None,
+  channel_timeout_s: Optional[float] = None,
+ ) -> None:
+  self.number_of_processes = max(1, int(number_of_processes))
+  self.max_driver_uses = max_driver_uses
+  self.memory_guard = memory_guard
+  self.rate_limiter = rate_limiter
+  self.channel_timeout_s = channel_timeout_s
+ def run(
+  self,
+  urls: deque[str],
+  logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+  *job_arguments: Any,
+ ) -> List[ChannelResult]:
+  results: List[Optional[ChannelResult]] = [None] * len(urls)
+  for index, result in self.as_completed(urls, logging_locations, *job_arguments):
+   results[index] = result
+  return results
+ def as_completed(
+  self,
+  urls: deque[str],
+  logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+  *job_arguments: Any,
+ ) -> Generator[Tuple[int, ChannelResult], None, None]:
+  crashes: List[int] = [0] * len(urls)
+  waiting_jobs = deque(enumerate(urls))
+  max_driver_memory_mb = self.memory_guard.max_driver // MEGABYTE if self.memory_guard is not None and self.memory_guard.max_driver is not None else None
+  idle_workers: List[WorkerProcess] = []
+  busy_workers: List[WorkerProcess] = []
+  try:
+   while waiting_jobs or busy_workers:
+    while waiting_jobs and len(busy_workers) < self.number_of_processes and (not busy_workers or self.memory_guard is None or self.memory_guard.has_headroom()):
+     index, url = waiting_jobs.popleft()
+     if self.rate_limiter is not None: self.rate_limiter.acquire(logging_locations)
+     worker = idle_workers.pop() if idle_workers else WorkerProcess(self.max_driver_uses, max_driver_memory_mb)
+     worker.submit(index, url, job_arguments)
+     busy_workers.append(worker)
+    memory_is_low = bool(waiting_jobs) and len(busy_workers) < self.number_of_processes
+    timeouts = [self.memory_guard.poll_interval] if memory_is_low else []
+    if self.channel_timeout_s is not None:
+     timeouts.append(max(0, min(worker.job[2] for worker in busy_workers) + self.channel_timeout_s - time.monotonic()))
+    ready = multiprocessing.connection.wait([worker.connection for worker in busy_workers] + [worker.process.sentinel for worker in busy_workers], timeout=min(timeouts) if timeouts else None)
+    now = time.monotonic()
+    for worker in list(busy_workers):
+     index, url, started = worker.job
+     if worker.connection not in ready and worker.process.sentinel not in ready:
+      if self.channel_timeout_s is None or now - started < self.channel_timeout_s:
+       continue
+      busy_workers.remove(worker)
+      worker.close()
+      log(f'The worker process scraping {url} did not finish in {self.channel_timeout_s} seconds, so stopped it and its driver', logging_locations)
+      yield index, ChannelResult(url, None, None, None, TimeoutError(f'The worker process scraping {url} did not finish in {self.channel_timeout_s} seconds'), now - started)
+      continue
+     result = worker.receive()
+     busy_workers.remove(worker)
+     if result is None:
+      worker.close()
+      crashes[index] += 1
+      if crashes[index] < MAX_CRASHES_PER_CHANNEL:
+       log(f'The worker process scraping {url} crashed, so scraping the channel again in a new worker process...', logging_locations)
+       waiting_jobs.appendleft((index, url))
+      else:
+       yield index, ChannelResult(url, None, None, None, BrokenProcessPool(f'The worker process scraping {url} crashed {crashes[index]} times (exit code {worker.process.exitcode})'))
+      continue
+     idle_workers.append(worker)
+     if self.rate_limiter is not None:
+      if result.succeeded: self.rate_limiter.reward()
+      else: self.rate_limiter.penalize(f'Failed to scrape {url}', logging_locations)
+     log(f'Finished scraping {url} in a worker process', logging_locations)
+     yield index, result
+  finally:
+   for worker in idle_workers + busy_workers:
+    worker.close()
@@ -0,0 +1,73 @@
+import time
+import threading
+from io import (
+ TextIOWrapper,
+)
+from typing import (
+ Optional,
+ TextIO,
+ Tuple,
+)
+from .custom_logger import log
+class RateLimiter:
+ '''
+ Token bucket shared by every thread scraping channels, so the program starts at most `channels_per_minute` channels per minute
+ (after an initial burst of up to `burst` channels) no matter how many threads are running, without sleeping when it is far below the rate.
+ The rate is halved every time YouTube pushes back (the program is redirected to the consent page or a channel fails),
+ down to `min_rate_fraction` of the configured rate, and recovers by `recovery_fraction` of the configured rate after every channel that succeeds.
+ '''
+ def __init__(
+  self,
+  channels_per_minute: float,
+  burst: int = 1,
+  min_rate_fraction: float = 0.125,
+  recovery_fraction: float = 0.1,
+ ) -> None:
+  if channels_per_minute <= 0:
+   raise ValueError(f'The rate limiter needs a positive rate, but channels_per_minute={channels_per_minute}')
+  self.max_rate = channels_per_minute / 60
+  self.min_rate = self.max_rate * min_rate_fraction
+  self.recovery = self.max_rate * recovery_fraction
+  self.rate = self.max_rate
+  self.burst = max(1, int(burst))
+  self.tokens = float(self.burst)
+  self.updated = time.monotonic()
+  self.lock = threading.Lock()
+ def refill(
+  self,
+ ) -> None:
+  now = time.monotonic()
+  self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+  self.updated = now
+ def acquire(
+  self,
+  logging_locations: Optional[Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]] = None,
+ ) -> float:
+  waited = 0.0
+  while True:
+   with self.lock:
+    self.refill()
+    if self.tokens >= 1:
+     self.tokens -= 1
+     return waited
+    wait_time = (1 - self.tokens) / self.rate
+   if logging_locations and waited == 0: log(f'Waiting {wait_time:.2f} seconds before scraping the next channel to stay under {self.rate * 60:.1f} channels per minute....', logging_locations)
+   time.sleep(wait_time)
+   waited += wait_time
+ def penalize(
+  self,
+  reason: str,
+  logging_locations: Optional[Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]] = None,
+ ) -> None:
+  with self.lock:
+   self.refill()
+   self.rate = max(self.min_rate, self.rate / 2)
+   self.tokens = min(self.tokens, 0.0)
+   rate = self.rate
+  if logging_locations: log(f'{reason}, so slowing down to {rate * 60:.1f} channels per minute....', logging_locations)
+ def reward(
+  self,
+ ) -> None:
+  with self.lock:
+   self.refill()
+   self.rate = min(self.max_rate, self.rate + self.recovery)
@@ -0,0 +1,77 @@
+import os
+import json
+import time
+import random
+from concurrent.futures.process import (
+ BrokenProcessPool,
+)
+from typing import (
+ Any,
+ Dict,
+ List,
+ Optional,
+)
+from .scheduler import ChannelResult
+from .notifications import Common
+def is_fatal(
+ error: Optional[Exception],
+) -> bool:
+ return isinstance(error, BrokenProcessPool) or (error is not None and Common.selenium_launch_error in str(error))
+class RetryPolicy:
+ '''
+ Retries a channel that failed up to `max_attempts` times in total, sleeping `base_delay_s` seconds before the first retry
+ and twice as long before every retry after that (up to `max_delay_s`, with random jitter so threads that failed together do not retry together).
+ The thread keeps its driver for the retry unless the driver stopped responding.
+ A fatal error (see is_fatal()) is never retried.
+ '''
+ def __init__(
+  self,
+  max_attempts: int = 3,
+  base_delay_s: float = 5,
+  max_delay_s: float = 120,
+ ) -> None:
+  self.max_attempts = max(1, int(max_attempts))
+  self.base_delay_s = base_delay_s
+  self.max_delay_s = max_delay_s
+ def should_retry(
+  self,
+  attempt: int,
+  error: Exception,
+ ) -> bool:
+  return attempt < self.max_attempts and not isinstance(error, ValueError) and not is_fatal(error)
+ def delay(
+  self,
+  attempt: int,
+ ) -> float:
+  return min(self.max_delay_s, self.base_delay_s * 2 ** (attempt - 1)) * (0.5 + random.random() / 2)
+def determine_quarantine_file(
+ path_to_channel_urls_file: str,
+) -> str:
+ return path_to_channel_urls_file.split('.')[0] + '.failures.json'
+def load_quarantine(
+ path_to_quarantine_file: str,
+) -> Dict[str, Dict[str, Any]]:
+ if not os.path.exists(path_to_quarantine_file):
+  return {}
+ try:
+  with open(path_to_quarantine_file, mode='r', encoding='utf-8') as quarantine_file:
+   return {url: dict(failure) for url, failure in json.load(quarantine_file).items()}
+ except (ValueError, AttributeError, TypeError):
+  return {}
+def is_quarantined(
+ failure: Optional[Dict[str, Any]],
+ quarantine_for_s: Optional[float],
+) -> bool:
+ return failure is not None and quarantine_for_s is not None and time.time() - failure.get('failed_at', 0) < quarantine_for_s
+def save_quarantine(
+ path_to_quarantine_file: str,
+ quarantine: Dict[str, Dict[str, Any]],
+ results: List[ChannelResult],
+) -> None:
+ for result in results:
+  if result.succeeded: quarantine.pop(result.url, None)
+  elif not is_fatal(result.error) and result.attempts > 0: quarantine[result.url] = {'error': repr(result.error), 'attempts': result.attempts, 'failed_at': round(time.time(), 3)}
+ if not quarantine and not os.path.exists(path_to_quarantine_file):
+  return
+ with open(path_to_quarantine_file, mode='w', encoding='utf-8') as quarantine_file:
+  json.dump(quarantine, quarantine_file, indent=2, sort_keys=True)
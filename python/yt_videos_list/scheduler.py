@@ -0,0 +1,204 @@
+import queue
+import threading
+from collections import (
+ deque,
+)
+from concurrent.futures import (
+ Future,
+)
+from io import (
+ TextIOWrapper,
+)
+from typing import (
+ Any,
+ Callable,
+ Dict,
+ Generator,
+ Iterator,
+ List,
+ NamedTuple,
+ Optional,
+ Set,
+ TextIO,
+ Tuple,
+ TypeVar,
+)
+from save_thread_result import ThreadWithResult
+from .custom_logger import log
+T = TypeVar('T')
+class ChannelResult(NamedTuple):
+ '''
+ The result of scraping ONE channel with create_list_from().
+ '''
+ url: str
+ channel_name: Optional[str]
+ file_name: Optional[str]
+ video_data: Optional[List[List[int | str]]]
+ error: Optional[Exception]
+ seconds: Optional[float] = None
+ attempts: int = 1
+ new_videos: int = 0
+ @property
+ def succeeded(
+  self,
+ ) -> bool:
+  return self.error is None
+class ChannelScheduler:
+ '''
+ Runs `number_of_threads` workers that take channels from the shared `urls` deque until every channel is scraped.
+ Every url has a Future that is resolved with a ChannelResult as soon as the channel is finished,
+ and a worker that stops (because the channel it was scraping failed) is replaced with a new worker right away,
+ so the program does not poll the workers to find out when a channel is finished or when a thread is free.
+ If `urls` is not a deque (for example, urls leased from a JobQueue), the channels are not known ahead of time,
+ so wait() returns the results of the channels the workers finished in the order they finished.
+ Use as_completed() instead of wait() to get every result as soon as its channel is finished.
+ An error raised by a worker (for example, the driver could not be launched) stops that worker, and is raised by as_completed() and wait()
+ in the caller's thread once every worker stopped and every channel that was not scraped has a failed ChannelResult.
+ '''
+ def __init__(
+  self,
+  urls: deque[str],
+  number_of_threads: int,
+  run_worker: Callable[[Callable[[str, ChannelResult], None]], Any],
+ ) -> None:
+  self.urls = urls
+  self.number_of_threads = max(1, int(number_of_threads))
+  self.run_worker = run_worker
+  self.lock = threading.Lock()
+  self.finished = threading.Event()
+  self.workers: Set[threading.Thread] = set()
+  self.futures: List[Future] = []
+  self.pending_jobs: Dict[str, deque[int]] = {}
+  self.completed: queue.Queue[Optional[int]] = queue.Queue()
+  self.error: Optional[Exception] = None
+  for url in urls if isinstance(urls, deque) else ():
+   self.pending_jobs.setdefault(url, deque()).append(len(self.futures))
+   self.futures.append(Future())
+ def start(
+  self,
+ ) -> None:
+  with self.lock:
+   for _ in range(min(self.number_of_threads, len(self.urls))):
+    self.start_worker()
+   if not self.workers:
+    self.finish()
+ def start_worker(
+  self,
+ ) -> None:
+  thread = ThreadWithResult(target=self.work)
+  self.workers.add(thread)
+  thread.start()
+ def work(
+  self,
+ ) -> Any:
+  finished_channels = [0]
+  stopped_by_error = True
+  def finish_channel(
+   url: str,
+   result: ChannelResult,
+  ) -> None:
+   finished_channels[0] += 1
+   self.finish_channel(url, result)
+  try:
+   worker_result = self.run_worker(finish_channel)
+   stopped_by_error = False
+   return worker_result
+  except Exception as error_message:
+   with self.lock:
+    if self.error is None: self.error = error_message
+   return None
+  finally:
+   self.finish_worker(threading.current_thread(), refill=finished_channels[0] > int(stopped_by_error))
+ def finish_worker(
+  self,
+  thread: threading.Thread,
+  refill: bool,
+ ) -> None:
+  with self.lock:
+   self.workers.discard(thread)
+   if refill and self.urls and len(self.workers) < self.number_of_threads:
+    self.start_worker()
+   elif not self.workers:
+    self.finish()
+ def finish(
+  self,
+ ) -> None:
+  self.finished.set()
+  self.completed.put(None)
+ def finish_channel(
+  self,
+  url: str,
+  result: ChannelResult,
+ ) -> None:
+  with self.lock:
+   if self.pending_jobs.get(url):
+    index = self.pending_jobs[url].popleft()
+   else:
+    index = len(self.futures)
+    self.futures.append(Future())
+  self.futures[index].set_result(result)
+  self.completed.put(index)
+ def as_completed(
+  self,
+  logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+  log_every_s: float = 10,
+ ) -> Generator[Tuple[int, ChannelResult], None, None]:
+  while True:
+   try:
+    index = self.completed.get(timeout=log_every_s)
+   except queue.Empty:
+    with self.lock:
+     running_threads = [thread.name for thread in self.workers]
+    log(f'Still running {running_threads} ...', logging_locations)
+    continue
+   if index is None:
+    break
+   yield index, self.futures[index].result()
+  error = self.error if self.error is not None else RuntimeError('every thread stopped before scraping the channel')
+  for url, indexes in self.pending_jobs.items():
+   for index in indexes:
+    self.futures[index].set_result(ChannelResult(url, None, None, None, error, attempts=0))
+    yield index, self.futures[index].result()
+  if self.error is not None:
+   raise self.error
+ def wait(
+  self,
+  logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
+  log_every_s: float = 10,
+ ) -> List[ChannelResult]:
+  for _ in self.as_completed(logging_locations, log_every_s):
+   pass
+  return [future.result() for future in self.futures]
+def merge_streams(
+ *streams: Iterator[T],
+) -> Generator[T, None, None]:
+ if len(streams) == 1:
+  yield from streams[0]
+  return
+ items: queue.Queue[Optional[Tuple[bool, Any]]] = queue.Queue()
+ def consume(
+  stream: Iterator[T],
+ ) -> None:
+  try:
+   for item in stream:
+    items.put((True, item))
+  except Exception as error_message:
+   items.put((False, error_message))
+  finally:
+   items.put(None)
+ for stream in streams:
+  threading.Thread(target=consume, args=(stream,)).start()
+ running_streams = len(streams)
+ error = None
+ while running_streams:
+  item = items.get()
+  if item is None:
+   running_streams -= 1
+   continue
+  succeeded, value = item
+  if succeeded:
+   yield value
+  elif error is None:
+   error = value
+ if error is not None:
+  raise error
@@ -2,7 +2,6 @@ from io import (
  TextIOWrapper,
 )
 from typing import (
- Callable,
  List,
  Set,
  TextIO,
@@ -12,8 +11,71 @@ import csv
 import re
 import time
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
 from .custom_logger import log, log_time_taken
+from .snapshot import save_page_source as save_page_source_to_file
+from .segments import load_segment_index
+EXTRACT_VIDEO_INFORMATION_FUNCTION = '''
+function extract_video_information(videos) {
+ var durations = new Map();
+ document.querySelectorAll("ytd-rich-grid-media ytd-thumbnail-overlay-time-status-renderer span.ytd-thumbnail-overlay-time-status-renderer").forEach(function (duration) {
+  var video = duration.closest("ytd-rich-grid-media");
+  if (!durations.has(video)) durations.set(video, duration.textContent.trim().split(/\\s+/)[0] || "N/A");
+ });
+ return videos.map(function (video) {
+  var link = video.querySelector("a#video-title-link");
+  if (link === null) return null;
+  return [link.getAttribute("title"), link.href, durations.has(video) ? durations.get(video) : "N/A"];
+ }).filter(function (video_information) { return video_information !== null; });
+}
+'''
+EXTRACT_VIDEO_DATA_SCRIPT = EXTRACT_VIDEO_INFORMATION_FUNCTION + '''
+return extract_video_information(Array.from(document.querySelectorAll("ytd-rich-grid-media")));
+'''
+HARVEST_AND_PRUNE_VIDEOS_SCRIPT = EXTRACT_VIDEO_INFORMATION_FUNCTION + '''
+var videos_to_keep = arguments[0];
+var new_videos = Array.from(document.querySelectorAll("ytd-rich-grid-media:not([yt-videos-list-harvested])"));
+new_videos.forEach(function (video) { video.setAttribute("yt-videos-list-harvested", ""); });
+var harvested = extract_video_information(new_videos);
+var loaded_items = document.querySelectorAll("ytd-rich-item-renderer");
+for (var index = 0; index < loaded_items.length - videos_to_keep; index++) {
+ loaded_items[index].remove();
+}
+return [harvested, document.getElementsByTagName("ytd-rich-grid-media").length];
+'''
+VIDEOS_TO_KEEP_ON_PAGE = 30
+STORE_VISITED_VIDEOS_SCRIPT = 'window.yt_videos_list_visited_videos = new Set(arguments[0]);'
+FOUND_VISITED_VIDEO_SCRIPT = '''
+var checked_videos = arguments[0];
+var videos = document.getElementsByTagName("ytd-rich-grid-media");
+for (var index = checked_videos; index < videos.length; index++) {
+ var link = videos[index].querySelector("a#video-title-link");
+ if (link !== null && window.yt_videos_list_visited_videos.has(link.href.replace("shorts/", "watch?v=").split("&pp")[0])) return true;
+}
+return false;
+'''
+WAIT_FOR_NEW_VIDEOS_SCRIPT = '''
+var current_count = arguments[0];
+var timeout = arguments[1];
+var callback = arguments[arguments.length - 1];
+var videos = document.getElementsByTagName("ytd-rich-grid-media");
+var continuations = (document.querySelector("ytd-rich-grid-renderer") || document).getElementsByTagName("ytd-continuation-item-renderer");
+var observer = null;
+var timer = null;
+function finish() {
+ if (observer !== null) observer.disconnect();
+ if (timer !== null) clearTimeout(timer);
+ callback([videos.length, continuations.length > 0]);
+}
+function finished_loading() { return videos.length > current_count; }
+window.scrollBy(0, 50000);
+if (finished_loading()) {
+ finish();
+} else {
+ observer = new MutationObserver(function () { if (finished_loading()) finish(); });
+ observer.observe(document.querySelector("ytd-app") || document.body, {childList: true, subtree: true});
+ timer = setTimeout(finish, continuations.length > 0 ? timeout : timeout / 4);
+}
+'''
 def scroll_until_break(
  url: str,
  driver: WebDriver,
@@ -25,7 +87,9 @@ def scroll_until_break(
  txt_exists: bool,
  csv_exists: bool,
  md_exists: bool,
-) -> Tuple[List[WebElement], Set[str], Set[str], Set[str], Set[str]]:
+ prune_loaded_videos: bool,
+ save_page_source: bool,
+) -> Tuple[List[List[str]], Set[str], Set[str], Set[str], Set[str]]:
  visited_videos, stored_in_txt, stored_in_csv, stored_in_md = determine_common_visited_videos(file_name, txt_exists, csv_exists, md_exists)
  if force_to_page_bottom: visited_videos.clear()
  else: verify_page_bottom_n_times *= 3
@@ -35,17 +99,33 @@ def scroll_until_break(
  new_elements_count = count_videos_on_page(driver)
  num_times_elements_count_same = -1
  found_old_videos = False
- url_of_last_loaded_video_on_page: Callable[[], str] = lambda: driver.find_elements_by_xpath('//*[@class="style-scope ytd-rich-grid-media"]/a[@id="video-title-link"]')[-1].get_attribute('href').replace('shorts/', 'watch?v=').split('&pp')[0]
+ harvested_videos: List[List[str]] = []
+ videos_on_page = new_elements_count
+ checked_videos = 0
+ driver.set_script_timeout(scroll_pause_time + 10)
+ if visited_videos and not prune_loaded_videos:
+  driver.execute_script(STORE_VISITED_VIDEOS_SCRIPT, list(visited_videos))
  if new_elements_count != 0:
   while found_old_videos is False and num_times_elements_count_same < verify_page_bottom_n_times:
    current_elements_count = new_elements_count
-   scroll_down(driver, scroll_pause_time, logging_locations)
-   new_elements_count = count_videos_on_page(driver)
-   num_times_elements_count_same = verify_reached_page_bottom(new_elements_count, current_elements_count, num_times_elements_count_same, verify_page_bottom_n_times, logging_locations)
-   if url_of_last_loaded_video_on_page() in visited_videos:
-    found_old_videos = True
- found_elements = save_elements_to_list(driver, scrolling_cpu_start_time, scrolling_real_start_time, url, logging_locations)
- return found_elements, stored_in_txt, stored_in_csv, stored_in_md, visited_videos
+   videos_on_page, has_continuation = scroll_down(driver, scroll_pause_time, logging_locations, videos_on_page)
+   if prune_loaded_videos:
+    new_videos, videos_on_page = harvest_and_prune_videos(driver)
+    harvested_videos.extend(new_videos)
+    new_elements_count = len(harvested_videos)
+    found_old_videos = any(format_video_url(video_url) in visited_videos for _, video_url, _ in new_videos)
+   else:
+    new_elements_count = videos_on_page
+    found_old_videos = bool(visited_videos) and driver.execute_script(FOUND_VISITED_VIDEO_SCRIPT, checked_videos)
+    checked_videos = new_elements_count
+   num_times_elements_count_same = verify_reached_page_bottom(new_elements_count, current_elements_count, num_times_elements_count_same, verify_page_bottom_n_times, has_continuation, logging_locations)
+ if prune_loaded_videos: found_videos = harvested_videos + harvest_and_prune_videos(driver)[0]
+ else: found_videos = save_elements_to_list(driver)
+ log_time_taken(scrolling_cpu_start_time, scrolling_real_start_time, 'It took ', f' to find {len(found_videos)} videos from {url}\n', logging_locations)
+ if save_page_source and file_name:
+  page_source_file_name = save_page_source_to_file(driver.page_source, file_name)
+  log(f'Saved the page source to {page_source_file_name}', logging_locations)
+ return found_videos, stored_in_txt, stored_in_csv, stored_in_md, visited_videos
 def determine_common_visited_videos(
  file_name: str,
  txt_exists: bool,
@@ -81,6 +161,7 @@ def store_already_written_videos(
     row[3]
     for row in file_content
    )
+  seen_videos.update(load_segment_index(file_name, file_type))
   if seen_videos:
    random_video = seen_videos.pop()
    if 'https://www.youtube.com/watch?v=' not in random_video:
@@ -95,6 +176,10 @@ def store_already_written_videos(
    else:
     seen_videos.add(random_video)
   return seen_videos
+def format_video_url(
+ video_url: str,
+) -> str:
+ return video_url.replace('shorts/', 'watch?v=').split('&pp')[0]
 def count_videos_on_page(
  driver: WebDriver,
 ) -> int:
@@ -103,22 +188,24 @@ def scroll_down(
  driver: WebDriver,
  scroll_pause_time: float,
  logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
-) -> None:
- driver.execute_script('window.scrollBy(0, 50000);')
- time.sleep(scroll_pause_time)
- new_elements_count = count_videos_on_page(driver)
+ current_elements_count: int,
+) -> Tuple[int, bool]:
+ new_elements_count, has_continuation = driver.execute_async_script(WAIT_FOR_NEW_VIDEOS_SCRIPT, current_elements_count, int(scroll_pause_time * 1000))
  log(f'Found {new_elements_count} videos...', logging_locations)
+ return new_elements_count, has_continuation
 def verify_reached_page_bottom(
  new_elements_count: int,
  current_elements_count: int,
  num_times_elements_count_same: int,
  verify_page_bottom_n_times: int,
+ has_continuation: bool,
  logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO]
 ) -> int:
  if new_elements_count == current_elements_count:
   num_times_elements_count_same += 1
   times = 'time' if num_times_elements_count_same == 1 else 'times'
-  log(f'Found {new_elements_count} videos. Verified this is the page bottom {num_times_elements_count_same} {times}. Need to verify {verify_page_bottom_n_times} {times} before writing to file...', logging_locations)
+  hint = ' (no more videos to load)' if has_continuation is False else ''
+  log(f'Found {new_elements_count} videos{hint}. Verified this is the page bottom {num_times_elements_count_same} {times}. Need to verify {verify_page_bottom_n_times} {times} before writing to file...', logging_locations)
   if num_times_elements_count_same == verify_page_bottom_n_times:
    log('Reached end of page!', logging_locations)
  else:
@@ -126,11 +213,10 @@ def verify_reached_page_bottom(
  return num_times_elements_count_same
 def save_elements_to_list(
  driver: WebDriver,
- scrolling_cpu_start_time: float,
- scrolling_real_start_time: float,
- url: str,
- logging_locations: Tuple[TextIOWrapper] | Tuple[TextIOWrapper, TextIO],
-) -> List[WebElement]:
- elements = driver.find_elements_by_xpath('//*[@class="style-scope ytd-rich-grid-media"]/a[@id="video-title-link"]')
- log_time_taken(scrolling_cpu_start_time, scrolling_real_start_time, 'It took ', f' to find {len(elements)} videos from {url}\n', logging_locations)
- return elements
+) -> List[List[str]]:
+ return driver.execute_script(EXTRACT_VIDEO_DATA_SCRIPT)
+def harvest_and_prune_videos(
+ driver: WebDriver,
+) -> Tuple[List[List[str]], int]:
+ new_videos, videos_on_page = driver.execute_script(HARVEST_AND_PRUNE_VIDEOS_SCRIPT, VIDEOS_TO_KEEP_ON_PAGE)
+ return new_videos, videos_on_page
@@ -0,0 +1,32 @@
+import os
+from typing import (
+ List,
+ Set,
+)
+def determine_segments_directory(
+ file_name: str,
+) -> str:
+ return f'{file_name}.segments'
+def determine_index_file(
+ file_name: str,
+ file_type: str,
+) -> str:
+ return os.path.join(determine_segments_directory(file_name), f'index.{file_type}.txt')
+def list_segments(
+ file_name: str,
+ file_type: str,
+) -> List[str]:
+ segments_directory = determine_segments_directory(file_name)
+ if not os.path.isdir(segments_directory):
+  return []
+ segments = sorted((segment for segment in os.listdir(segments_directory) if segment.endswith(f'.{file_type}') and segment.split('.')[0].isdigit()), reverse=True)
+ return [os.path.join(segments_directory, segment) for segment in segments]
+def load_segment_index(
+ file_name: str,
+ file_type: str,
+) -> Set[str]:
+ index_file_name = determine_index_file(file_name, file_type)
+ if not os.path.exists(index_file_name):
+  return set()
+ with open(index_file_name, mode='r', encoding='utf-8') as index_file:
+  return {line.strip() for line in index_file if line.strip()}
@@ -0,0 +1,32 @@
+import hashlib
+from collections import (
+ deque,
+)
+from typing import (
+ Iterable,
+)
+from .logic import parse_url
+def normalize_url(
+ url: str,
+) -> str:
+ try:
+  _, channel_type, channel_id = parse_url(url.strip())
+ except IndexError:
+  return url.strip()
+ if channel_type.startswith('@'):
+  return channel_type.lower()
+ if channel_id in ('videos', ''):
+  return channel_type
+ return f'{channel_type.lower()}/{channel_id}'
+def determine_shard(
+ url: str,
+ shard_count: int,
+) -> int:
+ digest = hashlib.sha256(normalize_url(url).encode('utf-8')).digest()
+ return int.from_bytes(digest[:8], 'big') % shard_count
+def select_shard(
+ urls: Iterable[str],
+ shard_index: int,
+ shard_count: int,
+) -> deque[str]:
+ return deque(url for url in urls if determine_shard(url, shard_count) == shard_index)
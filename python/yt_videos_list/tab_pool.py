@@ -0,0 +1,272 @@
+import time
+import threading
+import contextlib
+from typing import (
+ Any,
+ Callable,
+ Dict,
+ Hashable,
+ List,
+ Optional,
+)
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+START_ASYNC_SCRIPT = '''
+var args = Array.prototype.slice.call(arguments);
+window.yt_videos_list_async_result = undefined;
+args.push(function (result) { window.yt_videos_list_async_result = [result]; });
+(function () {
+ASYNC_SCRIPT
+}).apply(null, args);
+'''
+POLL_ASYNC_SCRIPT = 'return window.yt_videos_list_async_result === undefined ? null : window.yt_videos_list_async_result;'
+START_NAVIGATION_SCRIPT = 'window.yt_videos_list_navigating = true; window.location.href = arguments[0];'
+POLL_NAVIGATION_SCRIPT = 'return window.yt_videos_list_navigating === undefined && document.readyState === "complete";'
+OPEN_WINDOW_SCRIPT = 'window.open("about:blank", "_blank", "width=780,height=800");'
+POLL_INTERVAL = 0.05
+PAGE_LOAD_TIMEOUT = 60.0
+class Browser:
+ '''
+ A browser session shared by several tabs. Only one command can run in a browser session at a time
+ (and every command runs in the currently selected window), so every tab holds the lock while it selects its window and sends a command.
+ '''
+ def __init__(
+  self,
+  driver: WebDriver,
+ ) -> None:
+  self.driver = driver
+  self.lock = threading.RLock()
+  self.tabs: List['Tab'] = []
+  self.reserved = 0
+  self.current_handle: Optional[str] = driver.current_window_handle
+  self.handles: List[str] = [self.current_handle]
+  self.spare_handles: List[str] = [self.current_handle]
+ def open_window(
+  self,
+ ) -> str:
+  with self.lock:
+   if self.spare_handles:
+    return self.spare_handles.pop()
+   self.select(self.handles[0])
+   handles = set(self.driver.window_handles)
+   self.driver.execute_script(OPEN_WINDOW_SCRIPT)
+   handle = next(handle for handle in self.driver.window_handles if handle not in handles)
+   self.select(handle)
+   self.handles.append(handle)
+   return handle
+ def select(
+  self,
+  handle: str,
+ ) -> None:
+  if self.current_handle != handle:
+   self.driver.switch_to.window(handle)
+   self.current_handle = handle
+class Tab:
+ '''
+ Acts like a WebDriver for ONE window of a shared browser, so the scraper can use it like a normal driver.
+ Every command selects the window of this tab first, and waits for a page (page loads and async scripts)
+ are polled instead of blocking the browser session, so the other tabs keep scraping while this tab waits for YouTube.
+ '''
+ def __init__(
+  self,
+  browser: Browser,
+  handle: str,
+ ) -> None:
+  self.browser = browser
+  self.handle = handle
+  self.script_timeout = 30.0
+ def __getattr__(
+  self,
+  name: str,
+ ) -> Any:
+  with self.browser.lock:
+   self.browser.select(self.handle)
+   value = getattr(self.browser.driver, name)
+  if callable(value):
+   return self.in_window(value)
+  return self.wrap(value)
+ def in_window(
+  self,
+  method: Callable[..., Any],
+ ) -> Callable[..., Any]:
+  def run_in_window(*args: Any, **kwargs: Any) -> Any:
+   with self.browser.lock:
+    self.browser.select(self.handle)
+    return self.wrap(method(*args, **kwargs))
+  return run_in_window
+ def wrap(
+  self,
+  value: Any,
+ ) -> Any:
+  if isinstance(value, WebElement): return TabElement(self, value)
+  if isinstance(value, list) and value and isinstance(value[0], WebElement): return [TabElement(self, element) for element in value]
+  return value
+ def set_script_timeout(
+  self,
+  time_to_wait: float,
+ ) -> None:
+  self.script_timeout = time_to_wait
+ def get(
+  self,
+  url: str,
+ ) -> None:
+  self.execute_script(START_NAVIGATION_SCRIPT, url)
+  self.poll(POLL_NAVIGATION_SCRIPT, PAGE_LOAD_TIMEOUT, f'Timed out loading {url}', ignore_errors=True)
+ def execute_async_script(
+  self,
+  script: str,
+  *args: Any,
+ ) -> Any:
+  self.execute_script(START_ASYNC_SCRIPT.replace('ASYNC_SCRIPT', script, 1), *args)
+  return self.poll(POLL_ASYNC_SCRIPT, self.script_timeout, 'Timed out waiting for the async script to finish')[0]
+ def poll(
+  self,
+  script: str,
+  timeout: float,
+  timeout_message: str,
+  ignore_errors: bool = False,
+ ) -> Any:
+  deadline = time.monotonic() + timeout
+  while True:
+   try:
+    result = self.execute_script(script)
+   except WebDriverException:
+    if not ignore_errors: raise
+    result = None
+   if result:
+    return result
+   if time.monotonic() > deadline:
+    raise TimeoutException(timeout_message)
+   time.sleep(POLL_INTERVAL)
+ def quit(
+  self,
+ ) -> None:
+  raise RuntimeError('A tab cannot quit the browser it shares with other tabs, so release the tab to the TabPool instead')
+class TabElement:
+ '''
+ Acts like a WebElement found in a Tab, so every command for the element also selects the window of the tab first.
+ '''
+ def __init__(
+  self,
+  tab: Tab,
+  element: WebElement,
+ ) -> None:
+  self.tab = tab
+  self.element = element
+ def __getattr__(
+  self,
+  name: str,
+ ) -> Any:
+  with self.tab.browser.lock:
+   self.tab.browser.select(self.tab.handle)
+   value = getattr(self.element, name)
+  if callable(value):
+   return self.tab.in_window(value)
+  return self.tab.wrap(value)
+class BrowserLaunch:
+ '''
+ A browser one thread is launching for the TabPool, and the tabs other threads reserved in it while it launches.
+ '''
+ def __init__(
+  self,
+ ) -> None:
+  self.reserved = 0
+  self.finished = threading.Event()
+  self.browser: Optional[Browser] = None
+class TabPool:
+ '''
+ Lets several channels share ONE browser session by scraping each channel in its own window of the browser,
+ so the program only pays for one browser process (and its memory and startup time) for every `tabs_per_driver` channels.
+ A new browser is only opened once every open browser (with the same configuration) already has `tabs_per_driver` tabs,
+ and a browser is closed (or handed back with `close_browser`) when its last tab is released.
+ The pool is thread safe, so the threads started by create_list_from() can share the same pool.
+ '''
+ def __init__(
+  self,
+  tabs_per_driver: int = 4,
+ ) -> None:
+  self.tabs_per_driver = max(1, int(tabs_per_driver))
+  self.lock = threading.Lock()
+  self.browsers: Dict[Hashable, List[Browser]] = {}
+  self.launches: Dict[Hashable, List[BrowserLaunch]] = {}
+ def acquire(
+  self,
+  key: Hashable,
+  open_driver: Callable[[], WebDriver],
+ ) -> Tab:
+  launching = False
+  with self.lock:
+   browser = next((browser for browser in self.browsers.get(key, []) if len(browser.tabs) + browser.reserved < self.tabs_per_driver), None)
+   if browser is not None:
+    browser.reserved += 1
+   else:
+    launch = next((launch for launch in self.launches.get(key, []) if launch.reserved < self.tabs_per_driver), None)
+    if launch is None:
+     launch = BrowserLaunch()
+     launching = True
+     self.launches.setdefault(key, []).append(launch)
+    launch.reserved += 1
+  if browser is None:
+   if launching:
+    try:
+     launch.browser = Browser(open_driver())
+    finally:
+     with self.lock:
+      self.launches[key].remove(launch)
+      if launch.browser is not None:
+       launch.browser.reserved = launch.reserved
+       self.browsers.setdefault(key, []).append(launch.browser)
+     launch.finished.set()
+   else:
+    launch.finished.wait()
+    if launch.browser is None:
+     raise RuntimeError('Unable to launch the browser for the tab (the thread launching the browser logged the error)')
+   browser = launch.browser
+  try:
+   tab = Tab(browser, browser.open_window())
+  except BaseException:
+   self.release_reservation(key, browser)
+   raise
+  with self.lock:
+   browser.reserved -= 1
+   browser.tabs.append(tab)
+  return tab
+ def release_reservation(
+  self,
+  key: Hashable,
+  browser: Browser,
+ ) -> None:
+  with self.lock:
+   browser.reserved -= 1
+   unused = not browser.tabs and not browser.reserved
+   if unused: self.browsers[key].remove(browser)
+  if unused:
+   with contextlib.suppress(Exception):
+    browser.driver.quit()
+ def release(
+  self,
+  key: Hashable,
+  tab: Tab,
+  close_browser: Callable[[WebDriver], None],
+ ) -> None:
+  browser = tab.browser
+  with self.lock:
+   browser.tabs.remove(tab)
+   last_tab = not browser.tabs and not browser.reserved
+   keep_window = not browser.tabs
+   if last_tab: self.browsers[key].remove(browser)
+  if last_tab:
+   close_browser(browser.driver)
+   return
+  with browser.lock:
+   if keep_window:
+    browser.spare_handles.append(tab.handle)
+    return
+   browser.handles.remove(tab.handle)
+   try:
+    browser.select(tab.handle)
+    browser.driver.close()
+   except Exception:
+    pass
+   browser.current_handle = None